@@ -4,14 +4,16 @@ from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
+from alembic.script import ScriptDirectory
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.database import Base
-from app.models import User, ImageText
+from app.models import User, ImageText, ImagePage, Image, OCRResultCache
 from app.config import settings
+from app.core.migration_utils import forget_unknown_revisions
 
 config = context.config
 
@@ -35,6 +37,8 @@ def run_migrations_offline():
 
 
 def do_run_migrations(connection: Connection):
+    known_revisions = {script.revision for script in ScriptDirectory.from_config(config).walk_revisions()}
+    forget_unknown_revisions(connection, known_revisions)
     context.configure(connection=connection, target_metadata=target_metadata)
     with context.begin_transaction():
         context.run_migrations()
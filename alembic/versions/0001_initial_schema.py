@@ -0,0 +1,73 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+Базы, созданные до появления миграций в репозитории, уже содержат эти
+таблицы: ревизия создает только отсутствующие. Автосгенерированную ревизию
+таких баз сбрасывает app.core.migration_utils.forget_unknown_revisions.
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("users"):
+        _create_users()
+    if not inspector.has_table("image_text"):
+        _create_image_text()
+
+
+def _create_users():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=200), nullable=False),
+        sa.Column("is_active", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
+    op.create_index(op.f("ix_users_id"), "users", ["id"], unique=False)
+
+
+def _create_image_text():
+    op.create_table(
+        "image_text",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("image_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("image_id", name="uq_image_text_image_id"),
+    )
+    op.create_index(op.f("ix_image_text_id"), "image_text", ["id"], unique=False)
+    op.create_index(op.f("ix_image_text_image_id"), "image_text", ["image_id"], unique=False)
+    op.create_index(op.f("ix_image_text_user_id"), "image_text", ["user_id"], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_image_text_user_id"), table_name="image_text")
+    op.drop_index(op.f("ix_image_text_image_id"), table_name="image_text")
+    op.drop_index(op.f("ix_image_text_id"), table_name="image_text")
+    op.drop_table("image_text")
+    op.drop_index(op.f("ix_users_id"), table_name="users")
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,37 @@
+"""ocr result cache
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "ocr_result_cache",
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("lang", sa.String(length=50), nullable=False),
+        sa.Column("options", sa.Text(), nullable=True),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+    op.create_index(
+        op.f("ix_ocr_result_cache_content_hash"), "ocr_result_cache", ["content_hash"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_ocr_result_cache_content_hash"), table_name="ocr_result_cache")
+    op.drop_table("ocr_result_cache")
@@ -0,0 +1,44 @@
+"""images metadata
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "images",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("image_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("storage_key", sa.String(length=255), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_images_id"), "images", ["id"], unique=False)
+    op.create_index(op.f("ix_images_image_id"), "images", ["image_id"], unique=True)
+    op.create_index(op.f("ix_images_user_id"), "images", ["user_id"], unique=False)
+    op.create_index(op.f("ix_images_content_hash"), "images", ["content_hash"], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_images_content_hash"), table_name="images")
+    op.drop_index(op.f("ix_images_user_id"), table_name="images")
+    op.drop_index(op.f("ix_images_image_id"), table_name="images")
+    op.drop_index(op.f("ix_images_id"), table_name="images")
+    op.drop_table("images")
@@ -0,0 +1,26 @@
+"""image_text batch_id
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("image_text", sa.Column("batch_id", sa.String(length=36), nullable=True))
+    op.create_index(op.f("ix_image_text_batch_id"), "image_text", ["batch_id"], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_image_text_batch_id"), table_name="image_text")
+    op.drop_column("image_text", "batch_id")
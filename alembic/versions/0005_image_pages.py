@@ -0,0 +1,44 @@
+"""multi-page documents
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("image_text", sa.Column("page_count", sa.Integer(), nullable=True))
+    op.add_column("image_text", sa.Column("pages_done", sa.Integer(), nullable=True))
+    op.create_table(
+        "image_pages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("image_id", sa.Integer(), nullable=False),
+        sa.Column("page_no", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["image_id"], ["image_text.image_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("image_id", "page_no", name="uq_image_pages_image_id_page_no"),
+    )
+    op.create_index(op.f("ix_image_pages_id"), "image_pages", ["id"], unique=False)
+    op.create_index(op.f("ix_image_pages_image_id"), "image_pages", ["image_id"], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_image_pages_image_id"), table_name="image_pages")
+    op.drop_index(op.f("ix_image_pages_id"), table_name="image_pages")
+    op.drop_table("image_pages")
+    op.drop_column("image_text", "pages_done")
+    op.drop_column("image_text", "page_count")
@@ -0,0 +1,34 @@
+"""task state on image_text
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("image_text", sa.Column("task_id", sa.String(length=36), nullable=True))
+    op.add_column("image_text", sa.Column("task_result", sa.JSON(), nullable=True))
+    op.add_column("image_text", sa.Column("queued_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("image_text", sa.Column("started_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("image_text", sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f("ix_image_text_task_id"), "image_text", ["task_id"], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_image_text_task_id"), table_name="image_text")
+    op.drop_column("image_text", "finished_at")
+    op.drop_column("image_text", "started_at")
+    op.drop_column("image_text", "queued_at")
+    op.drop_column("image_text", "task_result")
+    op.drop_column("image_text", "task_id")
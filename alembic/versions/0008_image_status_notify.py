@@ -0,0 +1,53 @@
+"""notify image_status on image_text changes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_image_status() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT'
+               OR NEW.status IS DISTINCT FROM OLD.status
+               OR NEW.task_id IS DISTINCT FROM OLD.task_id
+               OR NEW.pages_done IS DISTINCT FROM OLD.pages_done THEN
+                PERFORM pg_notify('image_status', json_build_object(
+                    'image_id', NEW.image_id,
+                    'user_id', NEW.user_id,
+                    'status', NEW.status,
+                    'task_id', NEW.task_id,
+                    'batch_id', NEW.batch_id,
+                    'page_count', NEW.page_count,
+                    'pages_done', NEW.pages_done
+                )::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER image_text_notify_status
+        AFTER INSERT OR UPDATE ON image_text
+        FOR EACH ROW EXECUTE FUNCTION notify_image_status()
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS image_text_notify_status ON image_text")
+    op.execute("DROP FUNCTION IF EXISTS notify_image_status()")
@@ -0,0 +1,89 @@
+"""full-text search vector on image_text
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 15:20:00.000000
+
+Колонка search_vector заполняется триггером, а не объявлена GENERATED STORED:
+добавление генерируемой колонки переписывает всю таблицу под ACCESS EXCLUSIVE
+и блокирует запись на все время перезаписи. Здесь колонка добавляется без
+перезаписи, существующие строки заполняются пачками по BACKFILL_BATCH в
+отдельных транзакциях, а индекс GIN строится CONCURRENTLY.
+
+Набор конфигураций зафиксирован в TS_CONFIGS (TESSERACT_LANG=rus+eng на момент
+миграции) и не читается из настроек: иначе триггер зависел бы от окружения, в
+котором запускали upgrade. При смене набора языков нужна новая миграция,
+переопределяющая image_text_search_vector() и пересчитывающая search_vector.
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 5000
+TS_CONFIGS = ("russian", "english")
+
+
+def _tsvector(column: str) -> str:
+    return " || ".join(f"to_tsvector('{config}'::regconfig, coalesce({column}, ''))" for config in TS_CONFIGS)
+
+
+def upgrade():
+    op.add_column("image_text", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION image_text_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {_tsvector("NEW.text")};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER image_text_search_vector_update
+        BEFORE INSERT OR UPDATE OF text ON image_text
+        FOR EACH ROW EXECUTE FUNCTION image_text_search_vector()
+        """
+    )
+
+    backfill = sa.text(
+        f"""
+        WITH batch AS (
+            SELECT id FROM image_text WHERE id > :after_id ORDER BY id LIMIT :limit
+        ), updated AS (
+            UPDATE image_text SET search_vector = {_tsvector("text")}
+            FROM batch WHERE image_text.id = batch.id
+            RETURNING image_text.id
+        )
+        SELECT max(id) FROM updated
+        """
+    )
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        after_id = 0
+        while after_id is not None:
+            after_id = bind.execute(backfill, {"after_id": after_id, "limit": BACKFILL_BATCH}).scalar()
+        op.create_index(
+            "ix_image_text_search_vector",
+            "image_text",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_image_text_search_vector", table_name="image_text")
+    op.execute("DROP TRIGGER IF EXISTS image_text_search_vector_update ON image_text")
+    op.execute("DROP FUNCTION IF EXISTS image_text_search_vector()")
+    op.drop_column("image_text", "search_vector")
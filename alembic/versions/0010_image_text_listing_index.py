@@ -0,0 +1,34 @@
+"""keyset listing index on image_text
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # CONCURRENTLY не блокирует запись в image_text на время построения индекса.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_image_text_user_id_created_at_id",
+            "image_text",
+            ["user_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_image_text_user_id_created_at_id", table_name="image_text", postgresql_concurrently=True
+        )
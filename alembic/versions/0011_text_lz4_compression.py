@@ -0,0 +1,26 @@
+"""lz4 TOAST compression for OCR texts
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Новые и перезаписанные значения сжимаются lz4; старые остаются в pglz до перезаписи.
+    op.execute("ALTER TABLE image_text ALTER COLUMN text SET COMPRESSION lz4")
+    op.execute("ALTER TABLE image_pages ALTER COLUMN text SET COMPRESSION lz4")
+
+
+def downgrade():
+    op.execute("ALTER TABLE image_pages ALTER COLUMN text SET COMPRESSION pglz")
+    op.execute("ALTER TABLE image_text ALTER COLUMN text SET COMPRESSION pglz")
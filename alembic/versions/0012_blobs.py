@@ -0,0 +1,33 @@
+"""content-addressed blobs with reference counts
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "blobs",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("storage_key", sa.String(length=255), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("content_hash"),
+        sa.UniqueConstraint("storage_key", name="uq_blobs_storage_key"),
+    )
+
+
+def downgrade():
+    op.drop_table("blobs")
@@ -0,0 +1,47 @@
+"""images mime and dimensions, notify image_deleted
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("images", sa.Column("mime", sa.String(length=100), nullable=True))
+    op.add_column("images", sa.Column("width", sa.Integer(), nullable=True))
+    op.add_column("images", sa.Column("height", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_image_deleted() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('image_deleted', OLD.image_id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER images_notify_deleted
+        AFTER DELETE ON images
+        FOR EACH ROW EXECUTE FUNCTION notify_image_deleted()
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS images_notify_deleted ON images")
+    op.execute("DROP FUNCTION IF EXISTS notify_image_deleted()")
+    op.drop_column("images", "height")
+    op.drop_column("images", "width")
+    op.drop_column("images", "mime")
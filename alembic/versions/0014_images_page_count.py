@@ -0,0 +1,24 @@
+"""images page count
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0014"
+down_revision: Union[str, None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("images", sa.Column("page_count", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("images", "page_count")
@@ -0,0 +1,59 @@
+"""notify image_changed on images storage key updates and deletes
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0015"
+down_revision: Union[str, None] = "0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute("DROP TRIGGER IF EXISTS images_notify_deleted ON images")
+    op.execute("DROP FUNCTION IF EXISTS notify_image_deleted()")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_image_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('image_changed', OLD.image_id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER images_notify_changed
+        AFTER UPDATE OF storage_key OR DELETE ON images
+        FOR EACH ROW EXECUTE FUNCTION notify_image_changed()
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS images_notify_changed ON images")
+    op.execute("DROP FUNCTION IF EXISTS notify_image_changed()")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_image_deleted() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('image_deleted', OLD.image_id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER images_notify_deleted
+        AFTER DELETE ON images
+        FOR EACH ROW EXECUTE FUNCTION notify_image_deleted()
+        """
+    )
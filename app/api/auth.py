@@ -4,15 +4,25 @@ from fastapi import APIRouter, Depends, HTTPException, status, Form
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
+from app.config import settings
 from app import schemas
-from app.crud import get_user_by_email, create_user
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.crud import get_user_by_email, create_user, update_user_password
+from app.core.security import create_access_token, password_hasher, PasswordHasherBusy
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _busy_exception() -> HTTPException:
+    """Ответ при переполненной очереди хеширования паролей."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, try again later",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     email: str = Form(..., description="Email пользователя"),
@@ -30,7 +40,11 @@ async def register(
         logger.warning(f"Email уже зарегистрирован: {email}")
         raise HTTPException(400, "Email already registered")
 
-    hashed_password = get_password_hash(password)
+    try:
+        hashed_password = await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        logger.warning(f"Очередь хеширования паролей переполнена - регистрация: {email}")
+        raise _busy_exception()
     user = await create_user(db, email, hashed_password)
 
     logger.info(f"Пользователь зарегистрирован: {email}")
@@ -45,7 +59,15 @@ async def login(
     logger.info(f"Вход пользователя: {form_data.username}")
 
     user = await get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    try:
+        password_valid = user is not None and await password_hasher.verify(
+            form_data.password, user.hashed_password
+        )
+    except PasswordHasherBusy:
+        logger.warning(f"Очередь хеширования паролей переполнена - вход: {form_data.username}")
+        raise _busy_exception()
+
+    if not password_valid:
         logger.warning(f"Неудачная попытка входа: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,6 +79,13 @@ async def login(
         logger.warning(f"Попытка входа неактивного пользователя: {form_data.username}")
         raise HTTPException(403, "User is deactivated")
 
+    if password_hasher.needs_rehash(user.hashed_password) and settings.PASSWORD_REHASH_ENABLED:
+        try:
+            await update_user_password(db, user.id, await password_hasher.hash(form_data.password))
+            logger.info(f"Хеш пароля обновлен до стоимости {settings.PASSWORD_HASH_ROUNDS}: {user.email}")
+        except PasswordHasherBusy:
+            logger.info(f"Обновление хеша пароля отложено - очередь переполнена: {user.email}")
+
     access_token = create_access_token(data={"user_id": user.id, "email": user.email})
     logger.info(f"Пользователь вошел: {user.email}")
     return schemas.TokenResponse(access_token=access_token)
\ No newline at end of file
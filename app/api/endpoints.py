@@ -1,15 +1,26 @@
 """Асинхронные эндпоинты API для OCR сервиса."""
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import (
+    APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Header, Response, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from typing import Optional, List
+from datetime import datetime
+from app.database import get_db, AsyncSessionLocal
+from app.config import settings
 from app import schemas
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, authenticate_token
+from app.core.status_events import RESYNC
 from app.services.upload_service import UploadService
 from app.services.analyse_service import AnalyseService
 from app.services.delete_service import DeleteService
 from app.services.text_service import TextService
 from app.services.status_service import StatusService
+from app.services.events_service import EventsService
+from app.services.search_service import SearchService
+from app.services.documents_service import DocumentsService
+import json
 import logging
 
 router = APIRouter()
@@ -30,12 +41,26 @@ async def upload_document(
 @router.post("/doc_analyse")
 async def doc_analyse(
     image_id: int = Form(...),
+    profile: Optional[str] = Form(None, description="Профиль предобработки изображения"),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """Запуск OCR анализа для загруженного изображения."""
     service = AnalyseService()
-    return await service.process_analyse(image_id, current_user["user_id"], db)
+    return await service.process_analyse(image_id, current_user["user_id"], db, profile=profile)
+
+
+@router.post("/doc_analyse_batch")
+async def doc_analyse_batch(
+    request: schemas.BatchAnalyseRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Пакетный запуск OCR анализа для загруженных изображений."""
+    service = AnalyseService()
+    return await service.process_analyse_batch(
+        request.image_ids, current_user["user_id"], db, profile=request.profile
+    )
 
 
 @router.delete("/doc_delete/{image_id}")
@@ -52,16 +77,136 @@ async def delete_doc(
 @router.get("/get_text/{image_id}")
 async def get_text(
     image_id: int,
+    response: Response,
+    wait: float = Query(
+        0, ge=0, description=f"Ждать конечного статуса до wait секунд (не более {settings.GET_TEXT_MAX_WAIT:g})"
+    ),
+    offset: Optional[int] = Query(None, ge=0, description="Смещение фрагмента текста в символах"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.GET_TEXT_MAX_SLICE, description="Длина фрагмента"),
+    page_from: Optional[int] = Query(None, ge=1, description="Первая страница диапазона"),
+    page_to: Optional[int] = Query(None, ge=1, description="Последняя страница диапазона"),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """Получение результата OCR анализа."""
     service = TextService()
-    return await service.get_text(image_id, current_user["user_id"], db)
+    return await service.get_text(
+        image_id, current_user["user_id"], db, wait=wait, if_none_match=if_none_match, response=response,
+        offset=offset, limit=limit, page_from=page_from, page_to=page_to,
+    )
+
+
+@router.get("/get_text/{image_id}/stream")
+async def stream_text(
+    image_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Потоковая выдача результата OCR в виде text/plain."""
+    service = TextService()
+    chunks = await service.stream_text(image_id, current_user["user_id"], db)
+    return StreamingResponse(chunks, media_type="text/plain; charset=utf-8")
 
 
 @router.get("/status/{task_id}")
-async def get_status(task_id: str, current_user: dict = Depends(get_current_user)):
+async def get_status(
+    task_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
     """Получение статуса задачи OCR."""
     service = StatusService()
-    return await service.get_status(task_id, current_user["user_id"])
\ No newline at end of file
+    return await service.get_status(task_id, current_user["user_id"], db)
+
+
+@router.get("/documents")
+async def list_documents(
+    status: Optional[str] = Query(None, description="Фильтр по статусу"),
+    created_from: Optional[datetime] = Query(None, description="Созданы не раньше"),
+    created_to: Optional[datetime] = Query(None, description="Созданы раньше"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Список документов текущего пользователя с пагинацией по курсору."""
+    service = DocumentsService()
+    return await service.list_documents(
+        current_user["user_id"], db, limit=limit, status=status,
+        created_from=created_from, created_to=created_to, cursor=cursor,
+    )
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=500, description="Поисковый запрос"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Полнотекстовый поиск по результатам OCR текущего пользователя."""
+    service = SearchService()
+    return await service.search(current_user["user_id"], db, q, limit=limit, cursor=cursor)
+
+
+@router.get("/events")
+async def status_events(
+    image_ids: Optional[List[int]] = Query(None, description="ID изображений для подписки"),
+    batch_id: Optional[str] = Query(None, description="ID пакета для подписки"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Поток изменений статуса OCR (Server-Sent Events)."""
+    service = EventsService()
+    events = await service.subscribe(current_user["user_id"], db, image_ids=image_ids, batch_id=batch_id)
+
+    async def event_stream():
+        async for event in events:
+            if event is None:
+                yield ": ping\n\n"
+            elif event is RESYNC:
+                yield "event: resync\ndata: {}\n\n"
+            else:
+                yield f"event: status\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws/events")
+async def status_events_ws(
+    websocket: WebSocket,
+    token: str = Query(..., description="JWT токен доступа"),
+    image_ids: Optional[List[int]] = Query(None),
+    batch_id: Optional[str] = Query(None),
+):
+    """Поток изменений статуса OCR через WebSocket; токен передается в параметре token."""
+    async with AsyncSessionLocal() as db:
+        try:
+            current_user = await authenticate_token(token, db)
+            events = await EventsService().subscribe(
+                current_user["user_id"], db, image_ids=image_ids, batch_id=batch_id
+            )
+        except HTTPException as e:
+            await websocket.close(code=1008, reason=str(e.detail))
+            return
+
+        await websocket.accept()
+        try:
+            async for event in events:
+                if event is None:
+                    await websocket.send_json({"event": "ping"})
+                elif event is RESYNC:
+                    await websocket.send_json(RESYNC)
+                else:
+                    await websocket.send_json({"event": "status", **event})
+            await websocket.close()
+        except WebSocketDisconnect:
+            logger.info(f"WebSocket отключен - user_id: {current_user['user_id']}")
+        finally:
+            await events.aclose()
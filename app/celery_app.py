@@ -1,7 +1,9 @@
 """Конфигурация Celery."""
 
 from celery import Celery
+from kombu import Queue
 from app.config import settings
+from app.core.routing import QUEUES, FAST_QUEUE
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,9 +26,11 @@ celery_app.conf.update(
     broker_connection_max_retries=3,
     task_time_limit=60,
     task_soft_time_limit=50,
-    task_default_queue="celery",
-    result_expires=3600,
-    task_track_started=True,
+    # "celery" остается объявленной, чтобы дочитать задачи, поставленные до разделения очередей.
+    task_queues=[Queue(name) for name in QUEUES] + [Queue("celery")],
+    task_default_queue=FAST_QUEUE,
+    task_ignore_result=True,
+    worker_prefetch_multiplier=1,
 )
 
 logger.info("Celery app создан")
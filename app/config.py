@@ -1,7 +1,7 @@
 """Конфигурация приложения."""
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, Any, List
 
 
 class Settings(BaseSettings):
@@ -18,6 +18,45 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: Optional[str] = None
 
     TESSERACT_LANG: str = "rus+eng"
+    TESSERACT_CONFIG: str = ""
+    TESSDATA_PATH: Optional[str] = None
+    OCR_ENGINE: str = "subprocess"
+    OCR_ENGINE_POOL_SIZE: int = 1
+    OCR_PDF_DPI: int = 300
+    OCR_PREPROCESS_PROFILE: str = "none"
+    OCR_PREPROCESS_PROFILES: Dict[str, Optional[Dict[str, Any]]] = {}
+    OCR_TILE_THRESHOLD_PIXELS: int = 40_000_000
+    OCR_TILE_HEIGHT: int = 2000
+    OCR_TILE_OVERLAP: int = 200
+    OCR_TILE_WORKERS: int = 0
+    OCR_STATUS_WRITE_BEHIND: bool = False
+    OCR_STATUS_FLUSH_INTERVAL_MS: int = 200
+    OCR_STATUS_FLUSH_MAX_ROWS: int = 100
+    OCR_ROUTE_HEAVY_MEGAPIXELS: float = 30.0
+    OCR_ROUTE_BYTES_PER_MEGAPIXEL: int = 250_000
+    OCR_QUEUE_TIME_LIMITS: Dict[str, List[int]] = {
+        "ocr.fast": [60, 50],
+        "ocr.heavy": [600, 570],
+        "ocr.bulk": [300, 280],
+    }
+
+    ANALYSE_BATCH_MAX_SIZE: int = 500
+
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_MEMORY_SIZE: int = 1024
+
+    EVENTS_HEARTBEAT_INTERVAL: float = 15.0
+    EVENTS_QUEUE_SIZE: int = 100
+    GET_TEXT_MAX_WAIT: float = 60.0
+    GET_TEXT_CACHE_MAX_AGE: int = 60
+    GET_TEXT_MAX_SLICE: int = 1_000_000
+    OCR_TEXT_STREAM_CHUNK: int = 65536
+
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: float = 30.0
+    IMAGE_CACHE_SIZE: int = 10000
+    IMAGE_CACHE_TTL: float = 300.0
+
     API_V1_PREFIX: str = "/api/v1"
     HOST: str = "0.0.0.0"
     PORT: int = 8001
@@ -27,7 +66,24 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_REHASH_ENABLED: bool = False
+
     UPLOAD_DIR: str = "/app/uploads"
+    UPLOAD_MAX_SIZE: int = 20 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+    STORAGE_BACKEND: str = "local"
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_BUCKET: str = "ocr-uploads"
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_MAX_POOL_CONNECTIONS: int = 32
+    S3_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+    S3_TRANSFER_CONCURRENCY: int = 4
 
     class Config:
         env_file = ".env"
@@ -1,13 +1,11 @@
 """Бизнес-логика для OCR сервиса."""
 
-import os
-import tempfile
-from typing import Dict, Any
-from PIL import Image
-import pytesseract
+from typing import Dict, Any, Optional
 from app.config import settings
+from app.core import documents, tiling
+from app.core.ocr_engines import get_engine
+from app.core.preprocessing import resolve_profile, preprocess
 import logging
-from celery.result import AsyncResult
 
 logger = logging.getLogger(__name__)
 
@@ -16,45 +14,77 @@ class OCRProcessor:
     """Класс для обработки OCR операций."""
 
     @staticmethod
-    def process_image(image_data, filename: str, user_id: int = None) -> str:
-        """Обрабатывает изображение и извлекает текст."""
-        if hasattr(image_data, "read"):
-            image_data = image_data.read()
+    def get_options(profile: Optional[str] = None) -> Dict[str, Any]:
+        """Возвращает параметры распознавания, влияющие на результат OCR."""
+        options = {"config": settings.TESSERACT_CONFIG}
+        preprocess_options = resolve_profile(profile)
+        if preprocess_options is not None:
+            options["preprocess"] = preprocess_options.model_dump()
+        return options
 
-        file_ext = os.path.splitext(filename)[1]
-        with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as tmp_file:
-            tmp_file.write(image_data)
-            tmp_path = tmp_file.name
+    @staticmethod
+    def process_image(
+        image_data, filename: str, user_id: int = None, profile: Optional[str] = None, page_no: int = 0
+    ) -> str:
+        """Обрабатывает изображение и извлекает текст.
+
+        image_data может быть bytes, memoryview, mmap или файловым объектом:
+        изображение декодируется прямо из буфера, без копирования и временных файлов.
+        profile задает профиль предобработки (по умолчанию OCR_PREPROCESS_PROFILE),
+        page_no — страницу многостраничного документа (PDF, TIFF).
+        Изображения больше OCR_TILE_THRESHOLD_PIXELS распознаются полосами параллельно.
+        """
+        preprocess_options = resolve_profile(profile)
+        source = image_data if hasattr(image_data, "read") else documents.BufferReader(image_data)
 
         try:
-            image = Image.open(tmp_path)
-            text = pytesseract.image_to_string(image, lang=settings.TESSERACT_LANG)
-            logger.info(f"OCR выполнен - user_id: {user_id}, длина текста: {len(text)}")
+            with documents.open_page(source, filename, page_no) as image:
+                prepared = preprocess(image, preprocess_options) if preprocess_options else image
+                if tiling.should_tile(prepared):
+                    text = tiling.recognize_tiled(
+                        prepared, get_engine(), lang=settings.TESSERACT_LANG, config=settings.TESSERACT_CONFIG
+                    )
+                else:
+                    text = get_engine().recognize(
+                        prepared, lang=settings.TESSERACT_LANG, config=settings.TESSERACT_CONFIG
+                    )
+            logger.info(f"OCR выполнен - user_id: {user_id}, страница: {page_no}, длина текста: {len(text)}")
             return text.strip()
         except Exception as e:
             logger.error(f"Ошибка OCR: {e}")
             raise
         finally:
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+            if source is not image_data:
+                source.close()
 
 
 class TaskManager:
-    """Класс для управления задачами Celery."""
+    """Класс для представления состояния задач OCR."""
 
-    @staticmethod
-    def get_task_status(task_id: str) -> Dict[str, Any]:
-        """Получает статус задачи Celery."""
-        from app.tasks import process_ocr_task
-        task = AsyncResult(task_id, app=process_ocr_task.app)
+    states = {
+        "pending": "PENDING",
+        "processing": "STARTED",
+        "completed": "SUCCESS",
+        "failed": "FAILURE",
+    }
 
-        response = {"task_id": task_id, "status": task.state, "ready": task.ready()}
+    @staticmethod
+    def get_task_status(image_text) -> Dict[str, Any]:
+        """Формирует статус задачи по записи ImageText, которую ведет воркер."""
+        state = TaskManager.states.get(image_text.status, "PENDING")
+        response = {
+            "task_id": image_text.task_id,
+            "status": state,
+            "ready": state in ("SUCCESS", "FAILURE"),
+            "image_id": image_text.image_id,
+        }
 
-        if task.state == "SUCCESS":
-            response["result"] = task.result
-        elif task.state == "FAILURE":
-            response["error"] = str(task.info) if task.info else "Unknown error"
+        if state == "SUCCESS":
+            response["result"] = image_text.task_result
+        elif state == "FAILURE":
+            response["error"] = image_text.error_message or "Unknown error"
 
-        return response
\ No newline at end of file
+        for field in ("queued_at", "started_at", "finished_at"):
+            value = getattr(image_text, field)
+            response[field] = value.isoformat() if value else None
+        return response
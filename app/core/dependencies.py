@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.crud import get_user
 from app.core.security import decode_token
+from app.core.user_cache import user_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,11 +14,12 @@ logger = logging.getLogger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> dict:
-    """Получает данные текущего пользователя из JWT токена."""
+async def authenticate_token(token: str, db: AsyncSession) -> dict:
+    """Проверяет JWT токен и активность пользователя.
+
+    Статус пользователя берется из user_cache, поэтому частые запросы
+    (/status, /get_text) не обращаются к БД за пользователем.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -36,10 +38,26 @@ async def get_current_user(
         logger.warning("JWT токен не содержит user_id или email")
         raise credentials_exception
 
-    user = await get_user(db, user_id)
-    if user is None or not user.is_active:
+    cached = user_cache.get(user_id)
+    if cached is None:
+        user = await get_user(db, user_id)
+        if user is None:
+            logger.warning(f"Пользователь {user_id} не найден или не активен")
+            raise credentials_exception
+        cached = {"is_active": user.is_active, "email": user.email}
+        user_cache.put(user_id, user.is_active, user.email)
+
+    if not cached["is_active"]:
         logger.warning(f"Пользователь {user_id} не найден или не активен")
         raise credentials_exception
 
     logger.info(f"Пользователь аутентифицирован: {email}")
-    return {"user_id": user_id, "email": email, "token_payload": payload}
\ No newline at end of file
+    return {"user_id": user_id, "email": email, "token_payload": payload}
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """Получает данные текущего пользователя из JWT токена."""
+    return await authenticate_token(token, db)
@@ -0,0 +1,144 @@
+"""Многостраничные документы (PDF, TIFF): подсчет и ленивая растеризация страниц."""
+
+import io
+import mimetypes
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Tuple
+from PIL import Image
+import pypdfium2 as pdfium
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+PDF_EXTENSIONS = {".pdf"}
+MULTIPAGE_EXTENSIONS = {".pdf", ".tif", ".tiff"}
+
+
+class BufferReader(io.RawIOBase):
+    """Файловый объект поверх буфера (bytes, mmap) без копирования содержимого."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._view[self._pos:self._pos + len(b)]
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+def is_pdf(filename: str) -> bool:
+    """Проверяет, является ли файл PDF-документом."""
+    return Path(filename).suffix.lower() in PDF_EXTENSIONS
+
+
+def is_multipage(filename: str) -> bool:
+    """Проверяет, может ли файл содержать несколько страниц."""
+    return Path(filename).suffix.lower() in MULTIPAGE_EXTENSIONS
+
+
+@contextmanager
+def _as_file(source):
+    """Отдает файловый объект с начала; буфер (bytes, mmap, memoryview из S3) читается без копирования."""
+    if hasattr(source, "readinto"):
+        source.seek(0)
+        yield source
+        return
+
+    reader = BufferReader(source)
+    try:
+        yield reader
+    finally:
+        reader.close()
+
+
+@contextmanager
+def _open_pdf(source):
+    """Открывает PDF из файлового объекта или буфера без копирования."""
+    with _as_file(source) as f:
+        pdf = pdfium.PdfDocument(f)
+        try:
+            yield pdf
+        finally:
+            pdf.close()
+
+
+def count_pages(source, filename: str) -> int:
+    """Возвращает число страниц документа, не растеризуя их."""
+    if not is_multipage(filename):
+        return 1
+
+    if is_pdf(filename):
+        with _open_pdf(source) as pdf:
+            return len(pdf)
+
+    with _as_file(source) as f, Image.open(f) as image:
+        return getattr(image, "n_frames", 1)
+
+
+@contextmanager
+def open_page(source, filename: str, page_no: int = 0):
+    """Открывает одну страницу документа как изображение PIL.
+
+    Растеризуется только запрошенная страница: PDF рендерится pdfium
+    с разрешением OCR_PDF_DPI, у TIFF выбирается нужный кадр.
+    """
+    if is_pdf(filename):
+        with _open_pdf(source) as pdf:
+            page = pdf[page_no]
+            try:
+                image = page.render(scale=settings.OCR_PDF_DPI / 72, grayscale=True).to_pil()
+            finally:
+                page.close()
+        yield image
+        return
+
+    with _as_file(source) as f, Image.open(f) as image:
+        if page_no:
+            image.seek(page_no)
+        yield image
+
+
+def probe(path: str, filename: str) -> Tuple[Optional[str], Optional[int], Optional[int], Optional[int]]:
+    """Определяет MIME-тип, размер в пикселях и число страниц, не растеризуя страницы.
+
+    Для PDF возвращается размер первой страницы при растеризации с OCR_PDF_DPI.
+    Если файл не удается разобрать, размеры и число страниц равны None.
+    """
+    mime = mimetypes.guess_type(filename)[0]
+    try:
+        with open(path, "rb") as f:
+            if is_pdf(filename):
+                with _open_pdf(f) as pdf:
+                    width, height = pdf.get_page_size(0)
+                    page_count = len(pdf)
+                scale = settings.OCR_PDF_DPI / 72
+                return mime, round(width * scale), round(height * scale), page_count
+
+            with Image.open(f) as image:
+                page_count = getattr(image, "n_frames", 1)
+                return Image.MIME.get(image.format, mime), image.width, image.height, page_count
+    except Exception as e:
+        logger.warning(f"Не удалось определить размер изображения {filename}: {e}")
+        return mime, None, None, None
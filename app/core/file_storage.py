@@ -1,33 +1,48 @@
 """Управление файловым хранилищем для загруженных изображений."""
 
-import os
+import asyncio
 import hashlib
 import time
+import uuid
 from typing import Optional, Dict, Any
 from pathlib import Path
 from app.config import settings
+from app.core.storage_backends import LocalBackend, create_backend
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class FileTooLargeError(Exception):
+    """Размер загружаемого файла превышает допустимый."""
+
+
 class FileStorage:
-    """Класс для управления файловым хранилищем."""
+    """Класс для управления файловым хранилищем.
+
+    Блобы хранятся в бэкенде STORAGE_BACKEND (локальный диск или S3),
+    временные файлы загрузок и файлы старой раскладки — в UPLOAD_DIR.
+    Ключи старой раскладки всегда читаются с локального диска, поэтому
+    переключение на S3 не требует предварительной миграции хранилища.
+    """
+
+    BLOB_DIR = "blobs"
+    TMP_DIR = "tmp"
 
     def __init__(self):
         self.upload_dir = Path(settings.UPLOAD_DIR)
-        self.allowed_extensions = {'.jpg', '.jpeg', '.png'}
+        self.allowed_extensions = {'.jpg', '.jpeg', '.png', '.tif', '.tiff', '.pdf'}
         self._ensure_upload_dir()
+        self.backend = create_backend(settings.STORAGE_BACKEND, self.upload_dir)
+        self.legacy_backend = LocalBackend(self.upload_dir)
 
     def _ensure_upload_dir(self):
         """Создает директорию для загрузок."""
         self.upload_dir.mkdir(parents=True, exist_ok=True)
 
     def _get_user_dir(self, user_id: int) -> Path:
-        """Возвращает путь к директории пользователя."""
-        user_dir = self.upload_dir / str(user_id)
-        user_dir.mkdir(exist_ok=True)
-        return user_dir
+        """Возвращает путь к директории пользователя в старой раскладке (до блобов)."""
+        return self.upload_dir / str(user_id)
 
     def _generate_image_id(self, filename: str, user_id: int) -> int:
         """Генерирует уникальный ID для изображения."""
@@ -40,18 +55,105 @@ class FileStorage:
         ext = Path(filename).suffix.lower()
         return ext in self.allowed_extensions
 
-    async def save_file(self, file_data: bytes, filename: str, user_id: int) -> int:
-        """Сохраняет файл на диск."""
+    def get_blob_key(self, content_hash: str, filename: str) -> str:
+        """Возвращает ключ блоба: файлы раскладываются по двум уровням каталогов по префиксу хеша."""
+        ext = Path(filename).suffix.lower()
+        return f"{self.BLOB_DIR}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{ext}"
+
+    async def save_stream(
+        self, stream, filename: str, user_id: int, max_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Потоково сохраняет файл во временный файл, считая размер и SHA-256 по ходу записи.
+
+        Файл пишется частями вне event loop. Ключ блоба известен только после
+        подсчета хеша, поэтому в хранилище файл кладет commit_blob, а не этот
+        метод. При превышении max_size запись прерывается и выбрасывается
+        FileTooLargeError.
+        """
         image_id = self._generate_image_id(filename, user_id)
-        ext = Path(filename).suffix
-        safe_filename = f"{image_id}{ext}"
-        file_path = self._get_user_dir(user_id) / safe_filename
-
-        with open(file_path, 'wb') as f:
-            f.write(file_data)
-
-        logger.info(f"Файл сохранен: {file_path}, image_id: {image_id}")
-        return image_id
+        tmp_dir = self.upload_dir / self.TMP_DIR
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / f"{uuid.uuid4().hex}.part"
+
+        hasher = hashlib.sha256()
+        size = 0
+        f = await asyncio.to_thread(open, tmp_path, 'wb')
+        try:
+            while True:
+                chunk = await stream.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise FileTooLargeError(f"File exceeds {max_size} bytes")
+                await asyncio.to_thread(self._write_chunk, f, hasher, chunk)
+            await asyncio.to_thread(f.close)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        content_hash = hasher.hexdigest()
+        logger.info(f"Файл принят: image_id: {image_id}, размер: {size}, sha256: {content_hash}")
+        return {
+            "image_id": image_id,
+            "storage_key": self.get_blob_key(content_hash, filename),
+            "size": size,
+            "content_hash": content_hash,
+            "tmp_path": str(tmp_path),
+        }
+
+    def commit_blob(self, tmp_path: str, storage_key: str) -> bool:
+        """Кладет временный файл в хранилище под ключом блоба и удаляет его.
+
+        Если блоб с таким содержимым уже есть, файл в хранилище не передается.
+        Возвращает True, если записан новый блоб.
+        """
+        try:
+            if self.backend.exists(storage_key):
+                logger.info(f"Дубликат содержимого, используется существующий блоб: {storage_key}")
+                return False
+            self.backend.put_file(storage_key, tmp_path)
+            logger.info(f"Блоб сохранен: {storage_key}")
+            return True
+        finally:
+            self.discard(tmp_path)
+
+    def link_blob(self, source_key: str, storage_key: str) -> bool:
+        """Помещает файл старой раскладки в блоб, не удаляя исходный.
+
+        Локальный бэкенд использует жесткую ссылку. Возвращает True, если блоб создан.
+        """
+        if self.backend.exists(storage_key):
+            return False
+        self.backend.put_file(storage_key, str(self._resolve_key(source_key)))
+        return True
+
+    @staticmethod
+    def discard(tmp_path: str):
+        """Удаляет временный файл незавершенной загрузки."""
+        Path(tmp_path).unlink(missing_ok=True)
+
+    def delete_blob(self, storage_key: str) -> bool:
+        """Удаляет блоб (или файл старой раскладки), когда на него не осталось ссылок."""
+        deleted = self._backend_for(storage_key).delete(storage_key)
+        if deleted:
+            logger.info(f"Файл удален: {storage_key}")
+        return deleted
+
+    def delete_legacy(self, storage_key: str) -> bool:
+        """Удаляет файл старой раскладки из UPLOAD_DIR."""
+        file_path = self._resolve_key(storage_key)
+        if not file_path.exists():
+            return False
+        file_path.unlink()
+        return True
+
+    @staticmethod
+    def _write_chunk(f, hasher, chunk: bytes):
+        """Записывает часть файла и обновляет хеш."""
+        hasher.update(chunk)
+        f.write(chunk)
 
     def get_file_path(self, image_id: int, filename: str, user_id: int) -> str:
         """Возвращает путь к файлу."""
@@ -59,8 +161,39 @@ class FileStorage:
         safe_filename = f"{image_id}{ext}"
         return str(self._get_user_dir(user_id) / safe_filename)
 
+    def get_storage_key(self, image_id: int, filename: str, user_id: int) -> str:
+        """Возвращает ключ файла относительно директории загрузок."""
+        ext = Path(filename).suffix
+        return f"{user_id}/{image_id}{ext}"
+
+    def _resolve_key(self, storage_key: str) -> Path:
+        """Преобразует ключ старой раскладки в путь, не выходящий за директорию загрузок."""
+        file_path = (self.upload_dir / storage_key).resolve()
+        if self.upload_dir.resolve() not in file_path.parents:
+            raise ValueError(f"Invalid storage key: {storage_key}")
+        return file_path
+
+    def _backend_for(self, storage_key: str):
+        """Возвращает бэкенд для ключа: блобы — STORAGE_BACKEND, старая раскладка — UPLOAD_DIR."""
+        if storage_key.startswith(f"{self.BLOB_DIR}/"):
+            return self.backend
+        return self.legacy_backend
+
+    def read_file(self, storage_key: str) -> bytes:
+        """Читает содержимое файла по ключу хранилища."""
+        with self._backend_for(storage_key).get_stream(storage_key) as f:
+            return f.read()
+
+    def open_buffer(self, storage_key: str):
+        """Открывает файл как буфер в памяти: mmap на локальном диске, загрузка из S3."""
+        return self._backend_for(storage_key).open_buffer(storage_key)
+
     def get_file_info(self, image_id: int, user_id: int) -> Optional[Dict[str, Any]]:
-        """Получает информацию о файле."""
+        """Ищет на диске файл, загруженный до появления таблицы images.
+
+        Перебирает возможные расширения, поэтому вызывается только для
+        изображений без метаданных в БД.
+        """
         user_dir = self._get_user_dir(user_id)
 
         for ext in self.allowed_extensions:
@@ -70,11 +203,13 @@ class FileStorage:
                     "image_id": image_id,
                     "file_path": str(file_path),
                     "filename": f"{image_id}{ext}",
+                    "storage_key": self.get_storage_key(image_id, file_path.name, user_id),
+                    "size": file_path.stat().st_size,
                 }
         return None
 
     def delete_file(self, image_id: int, user_id: int) -> bool:
-        """Удаляет файл."""
+        """Удаляет файл, загруженный до появления таблицы images."""
         user_dir = self._get_user_dir(user_id)
 
         for ext in self.allowed_extensions:
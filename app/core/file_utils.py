@@ -3,7 +3,7 @@
 import os
 from typing import Set
 
-ALLOWED_EXTENSIONS: Set[str] = {'.jpg', '.jpeg', '.png'}
+ALLOWED_EXTENSIONS: Set[str] = {'.jpg', '.jpeg', '.png', '.tif', '.tiff', '.pdf'}
 
 
 def is_image_file(filename: str) -> bool:
@@ -0,0 +1,47 @@
+"""Кэш метаданных изображений для запросов analyse и delete."""
+
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, schemas
+from app.config import settings
+from app.core.ttl_cache import TTLCache
+
+IMAGE_CHANNEL = "image_changed"
+
+
+class ImageCache(TTLCache):
+    """Ограниченный LRU-кэш image_id -> ImageMeta поверх таблицы images.
+
+    Запись инвалидируется при удалении изображения и при смене storage_key
+    миграцией хранилища: локально и по уведомлению image_changed, которое
+    триггер на images рассылает всем процессам. TTL страхует от потерянных
+    уведомлений; воркер, получивший устаревший ключ, перечитывает его из images.
+    """
+
+    channel = IMAGE_CHANNEL
+
+    def get_memory(self, image_id: int) -> Optional[schemas.ImageMeta]:
+        """Возвращает метаданные из памяти процесса, если запись есть и не устарела."""
+        return self._get(image_id)
+
+    def put(self, meta: schemas.ImageMeta):
+        """Сохраняет метаданные, вытесняя самые старые записи."""
+        self._put(meta.image_id, meta)
+
+    async def get(self, db: AsyncSession, image_id: int) -> Optional[schemas.ImageMeta]:
+        """Ищет метаданные сначала в памяти, затем одним запросом по индексу image_id."""
+        meta = self.get_memory(image_id)
+        if meta is not None:
+            self.hits += 1
+            return meta
+
+        self.misses += 1
+        image = await crud.get_image(db, image_id)
+        if image is None:
+            return None
+        meta = schemas.ImageMeta.model_validate(image)
+        self.put(meta)
+        return meta
+
+
+image_cache = ImageCache(settings.IMAGE_CACHE_SIZE, settings.IMAGE_CACHE_TTL)
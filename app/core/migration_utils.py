@@ -0,0 +1,31 @@
+"""Подготовка баз данных, созданных до появления миграций в репозитории."""
+
+from typing import Iterable, List
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def forget_unknown_revisions(connection: Connection, known_revisions: Iterable[str]) -> List[str]:
+    """Удаляет из alembic_version ревизии, которых нет в alembic/versions.
+
+    Раньше миграция генерировалась при старте контейнера (alembic revision
+    --autogenerate), и в базе осталась ревизия со случайным ID, неизвестная
+    репозиторию. Без нее alembic upgrade head начинает с 0001, которая
+    пропускает уже существующие таблицы. Транзакция фиксируется, чтобы
+    миграции выполнялись в собственной.
+    """
+    forgotten: List[str] = []
+    if sa.inspect(connection).has_table("alembic_version"):
+        known = set(known_revisions)
+        versions = connection.execute(sa.text("SELECT version_num FROM alembic_version")).scalars().all()
+        forgotten = [version for version in versions if version not in known]
+        for version in forgotten:
+            connection.execute(
+                sa.text("DELETE FROM alembic_version WHERE version_num = :version"), {"version": version}
+            )
+            logger.warning(f"Неизвестная ревизия Alembic удалена из alembic_version: {version}")
+    connection.commit()
+    return forgotten
@@ -0,0 +1,117 @@
+"""Кэш результатов OCR, адресуемый по содержимому изображения."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OCRResultCache:
+    """Двухуровневый кэш: LRU в памяти процесса поверх таблицы в Postgres."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_content(data) -> str:
+        """Возвращает SHA-256 содержимого изображения."""
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def make_key(content_hash: str, lang: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Строит ключ кэша из хеша изображения, языка и параметров OCR."""
+        options_part = json.dumps(options or {}, sort_keys=True)
+        return hashlib.sha256(f"{content_hash}:{lang}:{options_part}".encode()).hexdigest()
+
+    def get_memory(self, key: str) -> Optional[str]:
+        """Ищет результат в памяти процесса."""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def put_memory(self, key: str, text: str):
+        """Сохраняет результат в памяти процесса, вытесняя самые старые записи."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[str]:
+        """Ищет результат сначала в памяти, затем в Postgres."""
+        text = self.get_memory(key)
+        if text is not None:
+            self.memory_hits += 1
+            return text
+
+        entry = await crud.get_ocr_cache(db, key)
+        if entry is not None and entry.text is not None:
+            self.db_hits += 1
+            self.put_memory(key, entry.text)
+            return entry.text
+
+        self.misses += 1
+        return None
+
+    async def get_many(self, db: AsyncSession, keys: List[str]) -> Dict[str, str]:
+        """Ищет пачку результатов: промахи в памяти добираются из Postgres одним запросом."""
+        found: Dict[str, str] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            text = self.get_memory(key)
+            if text is not None:
+                self.memory_hits += 1
+                found[key] = text
+            else:
+                missing.append(key)
+
+        for entry in await crud.get_ocr_cache_many(db, missing):
+            if entry.text is not None:
+                self.db_hits += 1
+                self.put_memory(entry.cache_key, entry.text)
+                found[entry.cache_key] = entry.text
+
+        self.misses += len(set(missing) - found.keys())
+        return found
+
+    def clear(self):
+        """Очищает кэш в памяти и сбрасывает счетчики."""
+        with self._lock:
+            self._entries.clear()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает счетчики попаданий и промахов."""
+        hits = self.memory_hits + self.db_hits
+        total = hits + self.misses
+        return {
+            "enabled": settings.OCR_CACHE_ENABLED,
+            "memory_entries": len(self._entries),
+            "memory_max_size": self.max_size,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "hits": hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+        }
+
+
+ocr_cache = OCRResultCache(settings.OCR_CACHE_MEMORY_SIZE)
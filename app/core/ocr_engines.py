@@ -0,0 +1,190 @@
+"""Движки распознавания текста для OCRProcessor."""
+
+import io
+import os
+import queue
+import shlex
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+import pytesseract
+from app.config import settings
+from app.core import tiling
+import logging
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(__name__)
+
+
+class SubprocessEngine:
+    """Движок через бинарник tesseract: отдельный процесс на каждое изображение.
+
+    Пиксели передаются через stdin в несжатом PNM, а текст читается из stdout,
+    поэтому ни изображение, ни результат не попадают во временные файлы.
+    """
+
+    name = "subprocess"
+    pnm_modes = {"1", "L", "RGB"}
+
+    def recognize(self, image, lang: str, config: str = "") -> str:
+        """Распознает текст на изображении."""
+        if image.mode not in self.pnm_modes:
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PPM")
+
+        cmd = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", "-l", lang]
+        cmd.extend(shlex.split(config or ""))
+        result = subprocess.run(cmd, input=buffer.getbuffer(), capture_output=True)
+        if result.returncode != 0:
+            raise pytesseract.TesseractError(result.returncode, result.stderr.decode("utf-8", "replace"))
+        return result.stdout.decode("utf-8")
+
+    def close(self):
+        """Освобождает ресурсы движка."""
+
+
+class TesserocrEngine:
+    """Движок на долгоживущих хендлах libtesseract (tesserocr).
+
+    Хендлы создаются лениво и переиспользуются: для каждого языка держится
+    пул из не более чем pool_size экземпляров PyTessBaseAPI, так что
+    traineddata загружается один раз на процесс, а не на каждое изображение.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, pool_size: int = 1, tessdata_path: Optional[str] = None):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        self.pool_size = pool_size
+        self.tessdata_path = tessdata_path
+        self._pools: Dict[str, queue.Queue] = {}
+        self._created: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _create_api(self, lang: str):
+        """Создает и инициализирует хендл tesseract для языка."""
+        kwargs = {"lang": lang}
+        if self.tessdata_path:
+            kwargs["path"] = self.tessdata_path
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        logger.info(f"Инициализирован хендл tesseract - lang: {lang}, pid: {os.getpid()}")
+        return api
+
+    @contextmanager
+    def _acquire(self, lang: str):
+        """Выдает свободный хендл для языка, создавая новый при необходимости."""
+        with self._lock:
+            pool = self._pools.setdefault(lang, queue.Queue())
+            create = pool.empty() and self._created.get(lang, 0) < self.pool_size
+            if create:
+                self._created[lang] = self._created.get(lang, 0) + 1
+
+        if create:
+            try:
+                api = self._create_api(lang)
+            except Exception:
+                with self._lock:
+                    self._created[lang] -= 1
+                raise
+        else:
+            api = pool.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            pool.put(api)
+
+    def preload(self, lang: str):
+        """Заранее загружает хендл для языка."""
+        with self._acquire(lang):
+            pass
+
+    @staticmethod
+    def _apply_config(api, config: str):
+        """Применяет параметры в формате командной строки tesseract (--psm, -c)."""
+        args = shlex.split(config or "")
+        i = 0
+        while i < len(args):
+            if args[i] == "--psm" and i + 1 < len(args):
+                api.SetPageSegMode(int(args[i + 1]))
+                i += 2
+            elif args[i] == "-c" and i + 1 < len(args):
+                name, _, value = args[i + 1].partition("=")
+                api.SetVariable(name, value)
+                i += 2
+            else:
+                i += 1
+
+    def recognize(self, image, lang: str, config: str = "") -> str:
+        """Распознает текст на изображении, не запуская внешний процесс."""
+        with self._acquire(lang) as api:
+            self._apply_config(api, config)
+            api.SetImage(image)
+            return api.GetUTF8Text()
+
+    def close(self):
+        """Освобождает все хендлы tesseract."""
+        with self._lock:
+            for pool in self._pools.values():
+                while not pool.empty():
+                    pool.get_nowait().End()
+            self._pools.clear()
+            self._created.clear()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_engine(name: str):
+    """Создает движок по имени, откатываясь на subprocess при недоступности tesserocr.
+
+    Пул хендлов tesserocr не меньше числа потоков распознавания полос, иначе
+    большие изображения распознавались бы полосами последовательно. Хендлы
+    создаются лениво, поэтому лишние появляются только при распознавании полосами.
+    """
+    if name == TesserocrEngine.name:
+        pool_size = max(settings.OCR_ENGINE_POOL_SIZE, tiling.tile_workers())
+        try:
+            return TesserocrEngine(pool_size=pool_size, tessdata_path=settings.TESSDATA_PATH)
+        except Exception as e:
+            logger.warning(f"Движок tesserocr недоступен, используется subprocess: {e}")
+    return SubprocessEngine()
+
+
+def get_engine():
+    """Возвращает движок OCR текущего процесса."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(settings.OCR_ENGINE)
+    return _engine
+
+
+def init_engine():
+    """Создает движок и прогревает хендл для языка по умолчанию."""
+    engine = get_engine()
+    if isinstance(engine, TesserocrEngine):
+        try:
+            engine.preload(settings.TESSERACT_LANG)
+        except Exception as e:
+            logger.error(f"Не удалось загрузить tesseract, используется subprocess: {e}")
+            reset_engine(SubprocessEngine())
+    logger.info(f"Движок OCR: {get_engine().name}")
+
+
+def reset_engine(engine=None):
+    """Закрывает текущий движок и при необходимости заменяет его."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+        _engine = engine
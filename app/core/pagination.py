@@ -0,0 +1,22 @@
+"""Курсоры для keyset-пагинации."""
+
+import base64
+import json
+from typing import Dict, Any
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Кодирует позицию последней строки страницы в непрозрачный курсор."""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Декодирует курсор; ValueError, если курсор поврежден."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,103 @@
+"""Общий слушатель уведомлений Postgres (LISTEN/NOTIFY) для процесса API."""
+
+import asyncio
+from typing import Callable, Dict, List
+import asyncpg
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PGListener:
+    """Одно выделенное соединение asyncpg, раздающее уведомления подписчикам.
+
+    Обработчики вызываются в цикле событий и должны быть быстрыми.
+    После переподключения вызываются обработчики on_reconnect: уведомления,
+    отправленные пока соединения не было, потеряны, и подписчики должны
+    сбросить состояние, которое они поддерживали по уведомлениям.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 5.0):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._reconnect_handlers: List[Callable[[], None]] = []
+        self._connection = None
+        self._task = None
+        self._closed = asyncio.Event()
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]):
+        """Подписывает обработчик на канал; подписка действует и после переподключения."""
+        self._handlers.setdefault(channel, []).append(handler)
+        if self._connection is not None and len(self._handlers[channel]) == 1:
+            asyncio.ensure_future(self._connection.add_listener(channel, self._dispatch))
+
+    def on_reconnect(self, handler: Callable[[], None]):
+        """Регистрирует обработчик, вызываемый после восстановления соединения."""
+        self._reconnect_handlers.append(handler)
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str):
+        """Передает уведомление всем подписчикам канала."""
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Ошибка обработчика уведомления {channel}: {e}", exc_info=True)
+
+    async def _connect(self):
+        """Открывает соединение и подписывается на все каналы."""
+        connection = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        for channel in self._handlers:
+            await connection.add_listener(channel, self._dispatch)
+        self._connection = connection
+        return lost
+
+    async def _run(self):
+        """Держит соединение открытым, переподключаясь при обрыве."""
+        first = True
+        while not self._closed.is_set():
+            try:
+                lost = await self._connect()
+                logger.info(f"Подписка на уведомления Postgres: {', '.join(self._handlers) or '-'}")
+                if not first:
+                    for handler in self._reconnect_handlers:
+                        handler()
+                first = False
+                await lost.wait()
+                logger.warning("Соединение для уведомлений Postgres потеряно")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось подключиться для уведомлений Postgres: {e}")
+            self._connection = None
+            first = False
+            try:
+                await asyncio.wait_for(self._closed.wait(), timeout=self.reconnect_delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        """Запускает фоновую задачу слушателя."""
+        if self._task is None:
+            self._closed.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Останавливает слушатель и закрывает соединение."""
+        self._closed.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+pg_listener = PGListener(settings.DATABASE_URL)
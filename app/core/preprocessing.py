@@ -0,0 +1,124 @@
+"""Предобработка изображений перед OCR."""
+
+from typing import Optional, Dict, Any
+import numpy as np
+from PIL import Image
+from app.config import settings
+from app.schemas import PreprocessOptions
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILES: Dict[str, Optional[Dict[str, Any]]] = {
+    "none": None,
+    "scan": {"grayscale": True, "max_side": 4000},
+    "photo": {
+        "grayscale": True,
+        "max_side": 4000,
+        "target_text_height": 32,
+        "binarize": True,
+        "crop_borders": True,
+    },
+    "fast": {"grayscale": True, "max_side": 2000, "target_text_height": 24},
+}
+
+
+def resolve_profile(name: Optional[str] = None) -> Optional[PreprocessOptions]:
+    """Возвращает параметры предобработки для профиля или None, если она отключена."""
+    name = name or settings.OCR_PREPROCESS_PROFILE
+    profiles = {**PROFILES, **settings.OCR_PREPROCESS_PROFILES}
+    if name not in profiles:
+        raise ValueError(f"Unknown preprocessing profile: {name}")
+    options = profiles[name]
+    return PreprocessOptions(**options) if options is not None else None
+
+
+def estimate_text_height(gray: np.ndarray) -> Optional[float]:
+    """Оценивает высоту строки текста по горизонтальной проекции темных пикселей.
+
+    Из проекции вычитается фон (нижний дециль), чтобы темные поля и тени,
+    занимающие все строки, не сливались в одну «строку» на всю высоту.
+    """
+    ink = gray < gray.mean() - gray.std() / 2
+    profile = ink.mean(axis=1)
+    rows = profile > np.percentile(profile, 10) + 0.005
+    if not rows.any():
+        return None
+
+    edges = np.diff(np.concatenate(([0], rows.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    heights = ends - starts
+    heights = heights[(heights >= 4) & (heights <= gray.shape[0] // 4)]
+    return float(np.median(heights)) if heights.size else None
+
+
+def _box_sum(values: np.ndarray, half: int, axis: int):
+    """Сумма по скользящему окну вдоль оси через кумулятивную сумму."""
+    n = values.shape[axis]
+    cumsum = np.cumsum(values, axis=axis, dtype=np.int32)
+    pad = [(0, 0), (0, 0)]
+    pad[axis] = (1, 0)
+    cumsum = np.pad(cumsum, pad)
+    positions = np.arange(n)
+    lo = np.clip(positions - half, 0, n)
+    hi = np.clip(positions + half + 1, 0, n)
+    return np.take(cumsum, hi, axis=axis) - np.take(cumsum, lo, axis=axis), hi - lo
+
+
+def adaptive_threshold(gray: np.ndarray, window: int, offset: float) -> np.ndarray:
+    """Адаптивная бинаризация по среднему в окне (метод Брэдли).
+
+    Оконные суммы считаются раздельно по строкам и столбцам в int32,
+    поэтому память растет линейно от числа пикселей.
+    """
+    half = max(1, window // 2)
+    row_sums, row_counts = _box_sum(gray, half, axis=1)
+    sums, col_counts = _box_sum(row_sums, half, axis=0)
+    counts = (col_counts[:, None] * row_counts[None, :]).astype(np.float32)
+    local_mean = sums.astype(np.float32) / counts
+    return np.where(gray > local_mean * (1 - offset), 255, 0).astype(np.uint8)
+
+
+def crop_borders(gray: np.ndarray, margin: int, binarized: bool = False) -> np.ndarray:
+    """Обрезает однотонные поля вокруг содержимого."""
+    ink = gray == 0 if binarized else gray < gray.mean() - gray.std()
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0 or cols.size == 0:
+        return gray
+
+    top = max(0, rows[0] - margin)
+    bottom = min(gray.shape[0], rows[-1] + margin + 1)
+    left = max(0, cols[0] - margin)
+    right = min(gray.shape[1], cols[-1] + margin + 1)
+    return gray[top:bottom, left:right]
+
+
+def preprocess(image: Image.Image, options: PreprocessOptions) -> Image.Image:
+    """Готовит изображение к распознаванию: оттенки серого, масштаб, бинаризация, обрезка."""
+    if options.grayscale and image.mode != "L":
+        image = image.convert("L")
+
+    scale = 1.0
+    if options.max_side and max(image.size) > options.max_side:
+        scale = options.max_side / max(image.size)
+
+    if options.target_text_height and image.mode == "L":
+        text_height = estimate_text_height(np.asarray(image))
+        if text_height and text_height * scale > options.target_text_height:
+            scale = options.target_text_height / text_height
+
+    if scale < 1.0:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.Resampling.BOX)
+
+    if image.mode != "L" or not (options.binarize or options.crop_borders):
+        return image
+
+    gray = np.asarray(image)
+    if options.binarize:
+        gray = adaptive_threshold(gray, options.binarize_window, options.binarize_offset)
+    if options.crop_borders:
+        gray = crop_borders(gray, options.crop_margin, binarized=options.binarize)
+    return Image.fromarray(gray, mode="L")
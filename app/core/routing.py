@@ -0,0 +1,61 @@
+"""Выбор очереди Celery для задачи OCR по оценке ее стоимости."""
+
+from typing import Dict, Any
+from app.config import settings
+
+FAST_QUEUE = "ocr.fast"
+HEAVY_QUEUE = "ocr.heavy"
+BULK_QUEUE = "ocr.bulk"
+QUEUES = (FAST_QUEUE, HEAVY_QUEUE, BULK_QUEUE)
+
+
+def page_megapixels(image) -> float:
+    """Оценивает размер страницы в мегапикселях.
+
+    Если размеры неизвестны (файлы до появления метаданных), они оцениваются
+    по размеру файла.
+    """
+    width = _field(image, "width")
+    height = _field(image, "height")
+    if width and height:
+        return width * height / 1_000_000
+    pages = _field(image, "page_count") or 1
+    return (_field(image, "size") or 0) / pages / settings.OCR_ROUTE_BYTES_PER_MEGAPIXEL
+
+
+def estimate_cost(image) -> float:
+    """Оценивает стоимость OCR документа в мегапикселях по всем страницам."""
+    return page_megapixels(image) * (_field(image, "page_count") or 1)
+
+
+def task_options(queue: str) -> Dict[str, Any]:
+    """Параметры apply_async для очереди: имя и лимиты времени."""
+    time_limit, soft_time_limit = settings.OCR_QUEUE_TIME_LIMITS[queue]
+    return {"queue": queue, "time_limit": time_limit, "soft_time_limit": soft_time_limit}
+
+
+def route(image, bulk: bool = False) -> Dict[str, Any]:
+    """Выбирает очередь для задачи документа.
+
+    Дорогие документы уходят в ocr.heavy, пакетные — в ocr.bulk, остальные —
+    в ocr.fast, чтобы мелкие документы не ждали за крупными сканами.
+    """
+    if estimate_cost(image) >= settings.OCR_ROUTE_HEAVY_MEGAPIXELS:
+        return task_options(HEAVY_QUEUE)
+    return task_options(BULK_QUEUE if bulk else FAST_QUEUE)
+
+
+def route_page(image) -> Dict[str, Any]:
+    """Выбирает очередь для задачи страницы многостраничного документа.
+
+    Страницы идут в ocr.bulk (крупные — в ocr.heavy), чтобы разбиение
+    большого PDF не заполняло ocr.fast.
+    """
+    if page_megapixels(image) >= settings.OCR_ROUTE_HEAVY_MEGAPIXELS:
+        return task_options(HEAVY_QUEUE)
+    return task_options(BULK_QUEUE)
+
+
+def _field(image, name: str):
+    """Читает поле из метаданных изображения или из ссылки на изображение (dict)."""
+    return image.get(name) if isinstance(image, dict) else getattr(image, name, None)
@@ -1,5 +1,8 @@
 """Функции для безопасности: хеширование паролей, создание и проверка JWT."""
 
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
@@ -25,7 +28,7 @@ def get_password_hash(password: str) -> str:
     """Создает хеш пароля используя bcrypt напрямую."""
     try:
         password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt(rounds=12)
+        salt = bcrypt.gensalt(rounds=settings.PASSWORD_HASH_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
     except Exception as e:
@@ -33,6 +36,68 @@ def get_password_hash(password: str) -> str:
         raise
 
 
+class PasswordHasherBusy(Exception):
+    """Очередь хеширования паролей переполнена."""
+
+
+class PasswordHasher:
+    """Хеширование и проверка паролей bcrypt вне цикла событий.
+
+    Вызовы bcrypt выполняются в отдельном пуле из workers потоков, поэтому
+    всплеск входов не блокирует остальные запросы. Одновременно принимается
+    не больше workers + queue_size операций, остальные сразу получают
+    PasswordHasherBusy вместо бесконечного ожидания в очереди.
+    """
+
+    cost_pattern = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = max(1, workers)
+        self.max_pending = self.workers + max(0, queue_size)
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Создает пул потоков при первом обращении."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func, *args):
+        """Выполняет функцию в пуле, отклоняя вызов при переполненной очереди."""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Создает хеш пароля."""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Проверяет пароль по хешу."""
+        return await self._run(verify_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Проверяет, отличается ли стоимость хеша от PASSWORD_HASH_ROUNDS."""
+        match = self.cost_pattern.match(hashed_password or "")
+        return match is not None and int(match.group(1)) != settings.PASSWORD_HASH_ROUNDS
+
+    def shutdown(self):
+        """Останавливает пул потоков."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Создает JWT токен доступа."""
     to_encode = data.copy()
@@ -0,0 +1,135 @@
+"""Рассылка изменений статуса OCR подписчикам процесса API."""
+
+import asyncio
+import json
+from typing import Optional, Dict, Any, Set, Iterable
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANNEL = "image_status"
+TERMINAL_STATUSES = {"completed", "failed"}
+RESYNC = {"event": "resync"}
+
+
+class Subscription:
+    """Подписка клиента на изменения статуса своих изображений или пакета."""
+
+    def __init__(self, user_id: int, image_ids: Optional[Iterable[int]], batch_id: Optional[str], queue_size: int):
+        self.user_id = user_id
+        self.image_ids: Optional[Set[int]] = set(image_ids) if image_ids else None
+        self.batch_id = batch_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        """Проверяет, относится ли событие к подписке."""
+        if self.image_ids is None and self.batch_id is None:
+            return True
+        return (self.image_ids is not None and event.get("image_id") in self.image_ids) or (
+            self.batch_id is not None and event.get("batch_id") == self.batch_id
+        )
+
+    def push(self, event: Dict[str, Any]):
+        """Кладет событие в очередь; при переполнении заменяет очередь на запрос пересинхронизации."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class StatusEventBroker:
+    """Раздает уведомления канала image_status подписчикам по user_id.
+
+    Все подписчики процесса получают события от одного соединения
+    pg_listener, поэтому число подписчиков не влияет на нагрузку на БД.
+    Здесь же хранится реестр ожиданий long-poll /get_text по image_id.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._waiters: Dict[int, Set[asyncio.Future]] = {}
+
+    def subscribe(
+        self, user_id: int, image_ids: Optional[Iterable[int]] = None, batch_id: Optional[str] = None
+    ) -> Subscription:
+        """Создает подписку пользователя."""
+        subscription = Subscription(user_id, image_ids, batch_id, self.queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Удаляет подписку."""
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def add_waiter(self, image_id: int) -> asyncio.Future:
+        """Регистрирует ожидание конечного статуса изображения."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(image_id, set()).add(waiter)
+        return waiter
+
+    def remove_waiter(self, image_id: int, waiter: asyncio.Future):
+        """Снимает ожидание."""
+        waiters = self._waiters.get(image_id)
+        if waiters is not None:
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[image_id]
+
+    @staticmethod
+    async def wait(waiter: asyncio.Future, timeout: float) -> bool:
+        """Ждет срабатывания ожидания; возвращает False по истечении таймаута."""
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _wake(self, image_id: int):
+        """Будит все ожидания изображения."""
+        for waiter in self._waiters.pop(image_id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def publish(self, event: Dict[str, Any]):
+        """Передает событие подпискам его владельца и будит ожидания конечного статуса."""
+        for subscription in list(self._subscriptions.get(event.get("user_id"), ())):
+            if subscription.matches(event):
+                subscription.push(event)
+        if event.get("status") in TERMINAL_STATUSES:
+            self._wake(event.get("image_id"))
+
+    def on_notify(self, payload: str):
+        """Обработчик уведомления канала image_status: payload — JSON строки image_text."""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Некорректное уведомление {STATUS_CHANNEL}: {payload!r}")
+            return
+        self.publish(event)
+
+    def resync(self):
+        """Просит всех подписчиков и ожидающих перечитать состояние после потери уведомлений."""
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.push(RESYNC)
+        for image_id in list(self._waiters):
+            self._wake(image_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает число подписок и ожиданий."""
+        return {
+            "users": len(self._subscriptions),
+            "subscriptions": sum(len(s) for s in self._subscriptions.values()),
+            "waiters": sum(len(w) for w in self._waiters.values()),
+        }
+
+
+status_broker = StatusEventBroker(settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,131 @@
+"""Отложенная запись статусов OCR в воркере (write-behind)."""
+
+import threading
+from typing import Callable, Dict, Any, Optional
+from app import crud, schemas
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    """Накопленные изменения до следующего сброса."""
+
+    def __init__(self):
+        self.updates: Dict[int, Dict[str, Any]] = {}
+        self.durable = False
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class StatusWriteBuffer:
+    """Объединяет изменения статусов задач процесса и пишет их пакетами.
+
+    Изменения одной записи сливаются (последнее значение поля побеждает),
+    пакет сбрасывается одним bulk UPDATE раз в interval секунд или при
+    накоплении max_rows записей. Запись с durable=True (конечные статусы)
+    сразу будит поток сброса и возвращает управление после COMMIT пакета,
+    в который она попала: задача не ждет interval и не завершится раньше,
+    чем результат сохранен в БД. Промежуточные статусы уходят тем же пакетом.
+    """
+
+    def __init__(self, session_factory: Callable, interval: float, max_rows: int):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.max_rows = max(1, max_rows)
+        self._batch = _Batch()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.flushes = 0
+        self.rows_written = 0
+
+    def start(self):
+        """Запускает поток сброса."""
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="status-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Сбрасывает накопленное и останавливает поток."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
+
+    def write(self, image_id: int, update_data: schemas.ImageTextUpdate, durable: bool = False):
+        """Добавляет изменение записи; при durable=True ждет его фиксации в БД."""
+        with self._cond:
+            batch = self._batch
+            batch.updates.setdefault(image_id, {}).update(update_data.model_dump(exclude_unset=True))
+            if durable:
+                batch.durable = True
+            if durable or len(batch.updates) >= self.max_rows:
+                self._cond.notify()
+        if durable:
+            self._wait(batch)
+
+    def barrier(self):
+        """Ждет фиксации всех изменений, добавленных до вызова."""
+        with self._cond:
+            batch = self._batch
+            if not batch.updates:
+                return
+            batch.durable = True
+            self._cond.notify()
+        self._wait(batch)
+
+    def _wait(self, batch: _Batch):
+        """Ждет сброса пакета; без потока сброса пишет пакет сам."""
+        if self._thread is None:
+            self._flush_current()
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    def _run(self):
+        """Цикл потока сброса."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopped or self._batch.durable or len(self._batch.updates) >= self.max_rows,
+                    timeout=self.interval,
+                )
+                stopped = self._stopped
+            self._flush_current()
+            if stopped:
+                return
+
+    def _flush_current(self):
+        """Забирает текущий пакет и пишет его одной транзакцией."""
+        with self._cond:
+            batch, self._batch = self._batch, _Batch()
+        if batch.updates:
+            self._flush(batch)
+        batch.done.set()
+
+    def _flush(self, batch: _Batch):
+        """Выполняет bulk UPDATE пакета; при ошибке недолговечные изменения возвращаются в очередь."""
+        db = self.session_factory()
+        try:
+            crud.update_image_texts_sync(
+                db, {image_id: schemas.ImageTextUpdate(**values) for image_id, values in batch.updates.items()}
+            )
+            db.commit()
+            self.flushes += 1
+            self.rows_written += len(batch.updates)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Ошибка записи пакета статусов ({len(batch.updates)} записей): {e}", exc_info=True)
+            batch.error = e
+            if not batch.durable:
+                with self._cond:
+                    for image_id, values in batch.updates.items():
+                        newer = self._batch.updates.get(image_id, {})
+                        self._batch.updates[image_id] = {**values, **newer}
+        finally:
+            db.close()
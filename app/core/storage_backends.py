@@ -0,0 +1,233 @@
+"""Бэкенды хранилища файлов для FileStorage: локальный диск и S3-совместимое хранилище."""
+
+import io
+import mmap
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from app.config import settings
+import logging
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+except ImportError:
+    boto3 = None
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBackend:
+    """Файлы в локальной директории (общий volume между API и воркерами)."""
+
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        """Преобразует ключ в путь, не выходящий за корень хранилища."""
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put_stream(self, key: str, stream) -> None:
+        """Записывает поток под ключом через временный файл и атомарное переименование."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(stream, f, settings.UPLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def put_file(self, key: str, file_path: str) -> None:
+        """Помещает локальный файл под ключом: жесткой ссылкой, между файловыми системами — копией."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(file_path, path)
+        except FileExistsError:
+            return
+        except OSError:
+            with open(file_path, "rb") as f:
+                self.put_stream(key, f)
+
+    @contextmanager
+    def get_stream(self, key: str):
+        """Открывает файл для последовательного чтения."""
+        with open(self._path(key), "rb") as f:
+            yield f
+
+    def get_range(self, key: str, start: int, end: int) -> bytes:
+        """Читает байты [start, end)."""
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            return f.read(max(0, end - start))
+
+    @contextmanager
+    def open_buffer(self, key: str):
+        """Отображает файл в память только для чтения, не копируя его содержимое."""
+        with open(self._path(key), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"Empty file: {key}")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+    def exists(self, key: str) -> bool:
+        """Проверяет наличие файла."""
+        return self._path(key).exists()
+
+    def delete(self, key: str) -> bool:
+        """Удаляет файл; возвращает False, если его не было."""
+        path = self._path(key)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+
+_s3_client = None
+_s3_client_pid = None
+_s3_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Возвращает общий для процесса клиент S3 с пулом соединений.
+
+    Клиент создается лениво и пересоздается после fork, чтобы дочерние
+    процессы воркера не делили сокеты пула с родителем.
+    """
+    global _s3_client, _s3_client_pid
+    if _s3_client is None or _s3_client_pid != os.getpid():
+        with _s3_lock:
+            if _s3_client is None or _s3_client_pid != os.getpid():
+                _s3_client = boto3.session.Session().client(
+                    "s3",
+                    endpoint_url=settings.S3_ENDPOINT_URL,
+                    aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+                    region_name=settings.S3_REGION,
+                    config=BotoConfig(
+                        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                        s3={"addressing_style": "path"},
+                    ),
+                )
+                _s3_client_pid = os.getpid()
+    return _s3_client
+
+
+class S3Backend:
+    """Объекты в бакете S3-совместимого хранилища (AWS S3, MinIO).
+
+    Загрузка и скачивание идут через менеджер передач boto3: большие файлы
+    передаются частями параллельно, соединения берутся из общего пула клиента.
+    """
+
+    name = "s3"
+
+    def __init__(self, bucket: str, client=None):
+        if boto3 is None:
+            raise RuntimeError("boto3 is not installed")
+        self.bucket = bucket
+        self._client = client
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+            max_concurrency=settings.S3_TRANSFER_CONCURRENCY,
+        )
+
+    @property
+    def client(self):
+        """Клиент S3: переданный явно или общий для процесса."""
+        return self._client or get_s3_client()
+
+    @staticmethod
+    def _is_missing(error) -> bool:
+        """Проверяет, что ошибка S3 означает отсутствие объекта."""
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def put_stream(self, key: str, stream) -> None:
+        """Загружает поток в объект (multipart для больших файлов)."""
+        self.client.upload_fileobj(stream, self.bucket, key, Config=self.transfer_config)
+
+    def put_file(self, key: str, file_path: str) -> None:
+        """Загружает локальный файл в объект."""
+        self.client.upload_file(file_path, self.bucket, key, Config=self.transfer_config)
+
+    def _get_object(self, key: str, **kwargs):
+        """Выполняет GetObject, превращая отсутствие объекта в FileNotFoundError."""
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key, **kwargs)
+        except ClientError as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+
+    @contextmanager
+    def get_stream(self, key: str):
+        """Открывает тело объекта для последовательного чтения без загрузки целиком."""
+        body = self._get_object(key)["Body"]
+        try:
+            yield body
+        finally:
+            body.close()
+
+    def get_range(self, key: str, start: int, end: int) -> bytes:
+        """Читает байты [start, end) одним ranged GET."""
+        if end <= start:
+            return b""
+        body = self._get_object(key, Range=f"bytes={start}-{end - 1}")["Body"]
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    @contextmanager
+    def open_buffer(self, key: str):
+        """Скачивает объект в память частями параллельно и отдает буфер."""
+        buffer = io.BytesIO()
+        try:
+            self.client.download_fileobj(self.bucket, key, buffer, Config=self.transfer_config)
+        except ClientError as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+        if buffer.tell() == 0:
+            raise ValueError(f"Empty file: {key}")
+        yield buffer.getbuffer()
+
+    def exists(self, key: str) -> bool:
+        """Проверяет наличие объекта запросом HEAD."""
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if self._is_missing(e):
+                return False
+            raise
+
+    def delete(self, key: str) -> bool:
+        """Удаляет объект; возвращает False, если его не было."""
+        if not self.exists(key):
+            return False
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+
+def create_backend(name: str, root: Path):
+    """Создает бэкенд хранилища по имени."""
+    if name == S3Backend.name:
+        return S3Backend(settings.S3_BUCKET)
+    if name == LocalBackend.name:
+        return LocalBackend(root)
+    raise ValueError(f"Unknown storage backend: {name}")
@@ -0,0 +1,180 @@
+"""Перенос файлов из старой раскладки UPLOAD_DIR/<user_id>/<image_id><ext> в блобы.
+
+Миграция выполняется без остановки сервиса и может быть прервана в любой момент:
+
+    python -m app.core.storage_migration --batch-size 500 --pause 0.1
+
+Каждый файл переносится отдельной транзакцией: файл связывается с блобом,
+запись images переключается на ключ блоба, и только после commit старый
+файл удаляется. До этого момента запись указывает на старый файл, поэтому
+чтение работает с любой раскладкой; воркер, получивший устаревший ключ,
+перечитывает его из images. Повторный запуск продолжает с оставшихся файлов.
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Callable
+from sqlalchemy.orm import Session
+from app import crud
+from app.config import settings
+from app.core import documents
+from app.core.file_storage import FileStorage
+from app.core.file_utils import is_image_file
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StorageMigrator:
+    """Переносит файлы старой раскладки в блобы пачками."""
+
+    def __init__(
+        self,
+        storage: FileStorage,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        pause: float = 0.0,
+    ):
+        self.storage = storage
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause = pause
+        self.stats: Dict[str, int] = {"moved": 0, "adopted": 0, "skipped": 0, "failed": 0}
+
+    def run(self) -> Dict[str, int]:
+        """Переносит файлы с метаданными, затем файлы, загруженные до появления таблицы images."""
+        self.migrate_rows()
+        self.adopt_files()
+        logger.info(f"Миграция хранилища завершена: {self.stats}")
+        return self.stats
+
+    def migrate_rows(self):
+        """Переносит файлы изображений, у которых в images еще старый ключ."""
+        after_id = 0
+        while True:
+            with self.session_factory() as db:
+                images = crud.get_legacy_images_sync(db, after_id, self.batch_size)
+                if not images:
+                    return
+                for row_id, image_id, storage_key, content_hash, size in images:
+                    after_id = row_id
+                    self._migrate_file(db, image_id, storage_key, content_hash, size)
+            time.sleep(self.pause)
+
+    def adopt_files(self):
+        """Переносит файлы без метаданных в images, создавая для них записи."""
+        for user_dir in sorted(self.storage.upload_dir.iterdir()):
+            if not user_dir.is_dir() or not user_dir.name.isdigit():
+                continue
+            user_id = int(user_dir.name)
+            batch = []
+            with os.scandir(user_dir) as entries:
+                for entry in entries:
+                    image_id = self._parse_image_id(entry.name)
+                    if image_id is not None and entry.is_file():
+                        batch.append((image_id, entry.name))
+                    if len(batch) >= self.batch_size:
+                        self._adopt_batch(user_id, batch)
+                        batch = []
+            if batch:
+                self._adopt_batch(user_id, batch)
+            try:
+                user_dir.rmdir()
+            except OSError:
+                pass
+
+    def _adopt_batch(self, user_id: int, batch):
+        """Создает метаданные и переносит пачку файлов одного пользователя."""
+        with self.session_factory() as db:
+            existing = crud.get_existing_image_ids_sync(db, [image_id for image_id, _ in batch])
+            for image_id, name in batch:
+                legacy_key = f"{user_id}/{name}"
+                if image_id in existing:
+                    # Запись уже есть: файл перенесет migrate_rows, если она указывает на него.
+                    self.stats["skipped"] += 1
+                    continue
+                path = str(self.storage.upload_dir / legacy_key)
+                content_hash, size = self._hash_file(path)
+                mime, width, height, page_count = documents.probe(path, name)
+                self._migrate_file(
+                    db, image_id, legacy_key, content_hash, size,
+                    new_row={
+                        "image_id": image_id, "user_id": user_id, "filename": name,
+                        "size": size, "content_hash": content_hash,
+                        "mime": mime, "width": width, "height": height, "page_count": page_count,
+                    },
+                )
+        time.sleep(self.pause)
+
+    def _migrate_file(
+        self,
+        db: Session,
+        image_id: int,
+        legacy_key: str,
+        content_hash: str,
+        size: int,
+        new_row: Optional[dict] = None,
+    ):
+        """Переносит один файл: блоб и запись images фиксируются вместе, старый файл удаляется после."""
+        try:
+            blob_key = crud.acquire_blob_sync(
+                db, content_hash, self.storage.get_blob_key(content_hash, legacy_key), size
+            )
+            self.storage.link_blob(legacy_key, blob_key)
+            if new_row is not None:
+                switched = crud.create_image_sync(db, storage_key=blob_key, **new_row)
+            else:
+                switched = crud.move_image_to_blob_sync(db, image_id, legacy_key, blob_key)
+            if not switched:
+                db.rollback()
+                self.stats["skipped"] += 1
+                return
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.stats["failed"] += 1
+            logger.error(f"Не удалось перенести файл {legacy_key}: {e}")
+            return
+
+        self.storage.delete_legacy(legacy_key)
+        self.stats["adopted" if new_row is not None else "moved"] += 1
+        logger.info(f"Файл перенесен: {legacy_key} -> {blob_key}")
+
+    @staticmethod
+    def _parse_image_id(name: str) -> Optional[int]:
+        """Извлекает image_id из имени файла старой раскладки."""
+        stem = Path(name).stem
+        if not is_image_file(name) or not stem.isdigit():
+            return None
+        return int(stem)
+
+    @staticmethod
+    def _hash_file(path: str):
+        """Считает SHA-256 и размер файла."""
+        hasher = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(settings.UPLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                size += len(chunk)
+        return hasher.hexdigest(), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.0, help="Пауза между пачками, секунды")
+    args = parser.parse_args()
+
+    from app.database import SyncSessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    migrator = StorageMigrator(FileStorage(), SyncSessionLocal, batch_size=args.batch_size, pause=args.pause)
+    print(migrator.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Полнотекстовый поиск по результатам OCR (Postgres tsvector)."""
+
+from typing import List
+from app.config import settings
+
+TESSERACT_TS_CONFIGS = {
+    "rus": "russian",
+    "eng": "english",
+    "deu": "german",
+    "fra": "french",
+    "spa": "spanish",
+    "ita": "italian",
+    "por": "portuguese",
+    "nld": "dutch",
+    "ukr": "simple",
+}
+
+
+def ts_configs(lang: str = None) -> List[str]:
+    """Возвращает конфигурации текстового поиска Postgres для языков tesseract (rus+eng).
+
+    Триггер search_vector использует набор из миграции 0009; при смене
+    TESSERACT_LANG нужна миграция, переопределяющая триггер.
+    """
+    configs = []
+    for code in (lang or settings.TESSERACT_LANG).split("+"):
+        config = TESSERACT_TS_CONFIGS.get(code.strip(), "simple")
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+def tsvector_sql(column: str, configs: List[str]) -> str:
+    """SQL-выражение search_vector: объединение tsvector по всем конфигурациям."""
+    return " || ".join(f"to_tsvector('{config}'::regconfig, coalesce({column}, ''))" for config in configs)
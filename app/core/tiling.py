@@ -0,0 +1,106 @@
+"""Распознавание очень больших изображений по перекрывающимся полосам."""
+
+import difflib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+import numpy as np
+from PIL import Image
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def should_tile(image: Image.Image) -> bool:
+    """Проверяет, превышает ли изображение порог для распознавания полосами."""
+    threshold = settings.OCR_TILE_THRESHOLD_PIXELS
+    return bool(threshold) and image.width * image.height > threshold
+
+
+def tile_workers() -> int:
+    """Возвращает число потоков распознавания полос (OCR_TILE_WORKERS или число CPU)."""
+    return settings.OCR_TILE_WORKERS or os.cpu_count() or 1
+
+
+def _find_cut(ink: np.ndarray, start: int, end: int) -> int:
+    """Ищет строку пикселей с наименьшим количеством «чернил» в диапазоне."""
+    if ink is None or end <= start:
+        return end
+    return start + int(np.argmin(ink[start:end]))
+
+
+def split_strips(image: Image.Image, strip_height: int, overlap: int) -> List[Tuple[int, int]]:
+    """Делит высоту изображения на горизонтальные полосы с перекрытием.
+
+    Нижняя граница полосы сдвигается на самую светлую строку в зоне перекрытия,
+    чтобы реже разрезать строки текста; перекрытие гарантирует, что строка,
+    попавшая на границу, целиком видна хотя бы в одной из соседних полос.
+    """
+    height = image.height
+    if height <= strip_height:
+        return [(0, height)]
+
+    ink = None
+    if image.mode == "L":
+        ink = 255 - np.asarray(image).mean(axis=1)
+
+    strips = []
+    top = 0
+    while top < height:
+        bottom = top + strip_height
+        if bottom >= height:
+            strips.append((top, height))
+            break
+        bottom = _find_cut(ink, bottom - overlap, bottom)
+        strips.append((top, min(height, bottom + overlap)))
+        top = max(top + 1, bottom - overlap)
+    return strips
+
+
+def _same_line(a: str, b: str) -> bool:
+    """Сравнивает строки с допуском на расхождения OCR у края полосы."""
+    a, b = " ".join(a.split()), " ".join(b.split())
+    if a == b:
+        return True
+    return min(len(a), len(b)) >= 8 and difflib.SequenceMatcher(None, a, b).ratio() >= 0.9
+
+
+def merge_texts(texts: List[str]) -> str:
+    """Склеивает текст полос, удаляя строки, распознанные дважды в зоне перекрытия."""
+    merged: List[str] = []
+    for text in texts:
+        lines = [line for line in text.splitlines() if line.strip()]
+        skip = 0
+        for k in range(min(len(merged), len(lines)), 0, -1):
+            if all(_same_line(a, b) for a, b in zip(merged[-k:], lines[:k])):
+                skip = k
+                break
+        merged.extend(lines[skip:])
+    return "\n".join(merged)
+
+
+def recognize_tiled(image: Image.Image, engine, lang: str, config: str = "") -> str:
+    """Распознает изображение полосами параллельно и собирает текст в порядке чтения.
+
+    Потоков достаточно: и subprocess, и tesserocr отпускают GIL на время
+    распознавания. Для tesserocr параллелизм ограничен размером пула хендлов,
+    который create_engine увеличивает до числа потоков полос.
+    """
+    # Лениво открытое изображение декодируется при первом crop: без load() потоки
+    # одновременно читали бы один файловый объект.
+    image.load()
+    overlap = settings.OCR_TILE_OVERLAP
+    strips = split_strips(image, settings.OCR_TILE_HEIGHT, overlap)
+    workers = tile_workers()
+    workers = max(1, min(workers, len(strips), getattr(engine, "pool_size", workers)))
+
+    def recognize_strip(bounds: Tuple[int, int]) -> str:
+        top, bottom = bounds
+        return engine.recognize(image.crop((0, top, image.width, bottom)), lang=lang, config=config)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        texts = list(executor.map(recognize_strip, strips))
+
+    logger.info(f"Изображение {image.width}x{image.height} распознано полосами: {len(strips)}, потоков: {workers}")
+    return merge_texts(texts) if overlap else "\n".join(text.strip() for text in texts)
@@ -0,0 +1,80 @@
+"""Ограниченный LRU-кэш с TTL, общий для кэшей процесса."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Hashable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Потокобезопасный LRU-кэш с ограничением размера и временем жизни записей.
+
+    Подклассы задают channel — канал уведомлений, payload которого содержит
+    целочисленный ключ инвалидируемой записи, — и считают hits/misses там,
+    где запрос к кэшу заменяет запрос к БД.
+    """
+
+    channel: str = ""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: Hashable) -> Optional[Any]:
+        """Возвращает значение, если запись есть и не устарела; устаревшая запись удаляется."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _put(self, key: Hashable, value: Any):
+        """Сохраняет значение, вытесняя самые старые записи."""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Удаляет запись по ключу."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Очищает кэш и сбрасывает счетчики."""
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def on_notify(self, payload: str):
+        """Обработчик уведомления канала channel: payload — ключ записи."""
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            logger.warning(f"Некорректное уведомление {self.channel}: {payload!r}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает счетчики попаданий и промахов."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,63 @@
+"""Ограничение размера тела запроса загрузки до его разбора."""
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Receive, Scope, Send
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Запас на заголовки частей и разделители multipart поверх UPLOAD_MAX_SIZE.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Отклоняет слишком большие загрузки, не принимая тело целиком.
+
+    UploadFile получает файл только после того, как Starlette разобрал и
+    сохранил все тело запроса, поэтому проверка размера в save_stream
+    срабатывает слишком поздно. Middleware отвечает 413 сразу по
+    Content-Length, а для тела без длины (chunked) прерывает чтение, как
+    только принято больше лимита.
+    """
+
+    def __init__(self, app: ASGIApp, path: str, max_size: int):
+        self.app = app
+        self.path = path
+        self.max_body = max_size + MULTIPART_OVERHEAD
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body:
+            logger.warning(f"Загрузка отклонена по Content-Length: {int(content_length)} байт")
+            await self._reject(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    logger.warning(f"Загрузка прервана: принято больше {self.max_body} байт")
+                    raise HTTPException(413, f"File too large, limit is {self.max_size} bytes")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send: Send):
+        """Отправляет ответ 413, не читая тело запроса."""
+        body = f'{{"detail":"File too large, limit is {self.max_size} bytes"}}'.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
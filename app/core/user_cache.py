@@ -0,0 +1,33 @@
+"""Кэш пользователей для аутентификации запросов."""
+
+from typing import Optional, Dict, Any
+from app.config import settings
+from app.core.ttl_cache import TTLCache
+
+USER_CHANNEL = "user_changed"
+
+
+class UserCache(TTLCache):
+    """Ограниченный LRU-кэш user_id -> (is_active, email) с коротким TTL.
+
+    TTL ограничивает время жизни устаревшей записи, если уведомление
+    об изменении пользователя не дошло до процесса.
+    """
+
+    channel = USER_CHANNEL
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Возвращает данные пользователя, если запись есть и не устарела."""
+        entry = self._get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, user_id: int, is_active: bool, email: str):
+        """Сохраняет данные пользователя, вытесняя самые старые записи."""
+        self._put(user_id, {"is_active": is_active, "email": email})
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
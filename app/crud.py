@@ -1,10 +1,12 @@
 """Асинхронные и синхронные CRUD операции."""
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import select, func, update, delete, or_, and_, tuple_, bindparam, literal_column, REAL
+from sqlalchemy.dialects.postgresql import insert
 from app import models, schemas
-from typing import Optional
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,50 +33,415 @@ async def create_user(db: AsyncSession, email: str, hashed_password: str) -> mod
     return user
 
 
-async def get_image_text(db: AsyncSession, image_id: int) -> Optional[models.ImageText]:
-    """Получает запись о тексте изображения по ID изображения."""
-    result = await db.execute(select(models.ImageText).where(models.ImageText.image_id == image_id))
+async def update_user_password(db: AsyncSession, user_id: int, hashed_password: str):
+    """Обновляет хеш пароля пользователя."""
+    await db.execute(
+        update(models.User).where(models.User.id == user_id).values(hashed_password=hashed_password)
+    )
+    await db.commit()
+
+
+async def get_image_text(db: AsyncSession, image_id: int, with_text: bool = True) -> Optional[models.ImageText]:
+    """Получает запись о тексте изображения по ID изображения.
+
+    При with_text=False колонка text не загружается (см. get_image_text_content).
+    """
+    stmt = select(models.ImageText).where(models.ImageText.image_id == image_id)
+    if not with_text:
+        stmt = stmt.options(defer(models.ImageText.text))
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def get_image_text_content(db: AsyncSession, image_id: int) -> Optional[str]:
+    """Получает только распознанный текст записи."""
+    result = await db.execute(select(models.ImageText.text).where(models.ImageText.image_id == image_id))
     return result.scalar_one_or_none()
 
 
-async def create_image_text(db: AsyncSession, image_text: schemas.ImageTextCreate) -> models.ImageText:
-    """Создает новую запись о тексте изображения."""
-    existing = await get_image_text(db, image_text.image_id)
-    if existing:
-        for key, value in image_text.model_dump().items():
-            setattr(existing, key, value)
-        await db.commit()
-        await db.refresh(existing)
-        return existing
+async def get_image_text_slice(db: AsyncSession, image_id: int, offset: int, limit: int) -> Optional[str]:
+    """Получает фрагмент текста длиной до limit символов начиная с offset.
+
+    Фрагмент вырезается в Postgres: из TOAST распаковывается только префикс
+    до конца фрагмента, полный текст в процесс API не передается.
+    """
+    result = await db.execute(
+        select(func.substr(models.ImageText.text, offset + 1, limit))
+        .where(models.ImageText.image_id == image_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_image_text_by_task_id(db: AsyncSession, task_id: str) -> Optional[models.ImageText]:
+    """Получает запись о тексте изображения по ID задачи OCR без колонки text."""
+    result = await db.execute(
+        select(models.ImageText)
+        .where(models.ImageText.task_id == task_id)
+        .options(defer(models.ImageText.text))
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_image_texts_for_user(
+    db: AsyncSession, user_id: int, image_ids: Optional[List[int]] = None, batch_id: Optional[str] = None
+) -> List[models.ImageText]:
+    """Получает записи пользователя по списку изображений и/или ID пакета."""
+    conditions = []
+    if image_ids:
+        conditions.append(models.ImageText.image_id.in_(image_ids))
+    if batch_id:
+        conditions.append(models.ImageText.batch_id == batch_id)
+    if not conditions:
+        return []
+    result = await db.execute(
+        select(models.ImageText).where(models.ImageText.user_id == user_id, or_(*conditions))
+    )
+    return list(result.scalars().all())
+
+
+async def get_active_image_texts_for_user(db: AsyncSession, user_id: int) -> List[models.ImageText]:
+    """Получает записи пользователя в неконечном статусе без колонки text."""
+    result = await db.execute(
+        select(models.ImageText)
+        .where(models.ImageText.user_id == user_id, models.ImageText.status.notin_(["completed", "failed"]))
+        .options(defer(models.ImageText.text))
+        .order_by(models.ImageText.id)
+    )
+    return list(result.scalars().all())
+
+
+def _upsert_image_texts_stmt(rows: List[Dict[str, Any]]):
+    """INSERT ... ON CONFLICT (image_id) DO UPDATE по полям первой строки."""
+    stmt = insert(models.ImageText).values(rows)
+    set_ = {key: stmt.excluded[key] for key in rows[0] if key not in ("image_id", "user_id")}
+    set_["user_id"] = stmt.excluded.user_id
+    return stmt.on_conflict_do_update(index_elements=["image_id"], set_={**set_, "updated_at": func.now()})
+
+
+def _update_image_text_stmt(image_id: int, update_data: schemas.ImageTextUpdate):
+    """UPDATE ... RETURNING записи о тексте изображения."""
+    return (
+        update(models.ImageText)
+        .where(models.ImageText.image_id == image_id)
+        .values(**update_data.model_dump(exclude_unset=True))
+        .returning(models.ImageText)
+        .execution_options(populate_existing=True)
+    )
+
+
+def _bulk_update_image_texts_stmts(updates: Dict[int, schemas.ImageTextUpdate]):
+    """Группирует обновления по набору полей: каждая группа — один UPDATE с executemany."""
+    table = models.ImageText.__table__
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for image_id, update_data in updates.items():
+        values = update_data.model_dump(exclude_unset=True)
+        params = {"b_image_id": image_id, **{f"v_{key}": value for key, value in values.items()}}
+        groups.setdefault(tuple(sorted(values)), []).append(params)
+
+    for keys, params in groups.items():
+        stmt = (
+            update(table)
+            .where(table.c.image_id == bindparam("b_image_id"))
+            .values({key: bindparam(f"v_{key}", type_=table.c[key].type) for key in keys})
+        )
+        yield stmt, params
+
+
+async def list_image_texts(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> List[tuple]:
+    """Получает страницу записей пользователя, от новых к старым.
 
-    db_image_text = models.ImageText(**image_text.model_dump())
-    db.add(db_image_text)
+    Выбираются только сводные колонки без текста; пагинация по ключу
+    (created_at, id) идет по индексу ix_image_text_user_id_created_at_id,
+    поэтому стоимость страницы не зависит от ее номера.
+    """
+    stmt = (
+        select(
+            models.ImageText.id,
+            models.ImageText.image_id,
+            models.ImageText.status,
+            models.ImageText.batch_id,
+            models.ImageText.page_count,
+            models.ImageText.pages_done,
+            models.ImageText.created_at,
+            models.ImageText.updated_at,
+        )
+        .where(models.ImageText.user_id == user_id)
+        .order_by(models.ImageText.created_at.desc(), models.ImageText.id.desc())
+        .limit(limit)
+    )
+    if status:
+        stmt = stmt.where(models.ImageText.status == status)
+    if created_from:
+        stmt = stmt.where(models.ImageText.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(models.ImageText.created_at < created_to)
+    if after is not None:
+        stmt = stmt.where(tuple_(models.ImageText.created_at, models.ImageText.id) < tuple_(*after))
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def search_image_texts(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    configs: List[str],
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[tuple]:
+    """Ищет записи пользователя по тексту, упорядочивая по релевантности.
+
+    Пагинация по ключу (rank, id): after — позиция последней строки
+    предыдущей страницы. Фрагменты ts_headline строятся только для строк страницы.
+    """
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{configs[0]}'::regconfig"), query)
+    for config in configs[1:]:
+        tsquery = tsquery.op("||")(func.websearch_to_tsquery(literal_column(f"'{config}'::regconfig"), query))
+
+    rank = func.ts_rank_cd(models.ImageText.search_vector, tsquery).label("rank")
+    page = (
+        select(models.ImageText.id, rank)
+        .where(models.ImageText.user_id == user_id, models.ImageText.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), models.ImageText.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        after_rank = bindparam("after_rank", after[0], type_=REAL)
+        page = page.where(
+            or_(rank < after_rank, and_(rank == after_rank, models.ImageText.id < after[1]))
+        )
+    page = page.subquery()
+
+    snippet = func.ts_headline(
+        literal_column(f"'{configs[0]}'::regconfig"),
+        models.ImageText.text,
+        tsquery,
+        "StartSel=<b>, StopSel=</b>, MaxFragments=2, MaxWords=25, MinWords=8",
+    ).label("snippet")
+    result = await db.execute(
+        select(
+            models.ImageText.id,
+            models.ImageText.image_id,
+            models.ImageText.status,
+            models.ImageText.created_at,
+            page.c.rank,
+            snippet,
+        )
+        .join(page, page.c.id == models.ImageText.id)
+        .order_by(page.c.rank.desc(), models.ImageText.id.desc())
+    )
+    return result.all()
+
+
+async def create_image_text(
+    db: AsyncSession, image_text: schemas.ImageTextCreate, update_data: Optional[schemas.ImageTextUpdate] = None
+) -> models.ImageText:
+    """Создает или перезаписывает запись о тексте изображения одним запросом."""
+    row = {**image_text.model_dump(), **(update_data.model_dump(exclude_unset=True) if update_data else {})}
+    result = await db.execute(
+        _upsert_image_texts_stmt([row]).returning(models.ImageText).execution_options(populate_existing=True)
+    )
+    db_image_text = result.scalar_one()
     await db.commit()
-    await db.refresh(db_image_text)
     return db_image_text
 
 
+async def upsert_image_texts(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Создает или обновляет записи о тексте изображений одним запросом."""
+    if not rows:
+        return
+    await db.execute(_upsert_image_texts_stmt(rows))
+    await db.commit()
+
+
 async def update_image_text(
     db: AsyncSession, image_id: int, update_data: schemas.ImageTextUpdate
 ) -> Optional[models.ImageText]:
-    """Обновляет запись о тексте изображения."""
-    db_image_text = await get_image_text(db, image_id)
-    if db_image_text:
-        for key, value in update_data.model_dump(exclude_unset=True).items():
-            setattr(db_image_text, key, value)
-        await db.commit()
-        await db.refresh(db_image_text)
+    """Обновляет запись о тексте изображения одним UPDATE ... RETURNING."""
+    result = await db.execute(_update_image_text_stmt(image_id, update_data))
+    db_image_text = result.scalar_one_or_none()
+    await db.commit()
     return db_image_text
 
 
 async def delete_image_text(db: AsyncSession, image_id: int) -> bool:
     """Удаляет запись о тексте изображения."""
-    db_image_text = await get_image_text(db, image_id)
-    if db_image_text:
-        await db.delete(db_image_text)
-        await db.commit()
-        return True
-    return False
+    result = await db.execute(delete(models.ImageText).where(models.ImageText.image_id == image_id))
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def create_image(
+    db: AsyncSession,
+    image_id: int,
+    user_id: int,
+    storage_key: str,
+    filename: str,
+    size: int,
+    content_hash: str,
+    mime: Optional[str] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    page_count: Optional[int] = None,
+) -> models.Image:
+    """Сохраняет метаданные загруженного изображения."""
+    image = models.Image(
+        image_id=image_id,
+        user_id=user_id,
+        storage_key=storage_key,
+        filename=filename,
+        size=size,
+        content_hash=content_hash,
+        mime=mime,
+        width=width,
+        height=height,
+        page_count=page_count,
+    )
+    db.add(image)
+    await db.commit()
+    return image
+
+
+async def acquire_blob(db: AsyncSession, content_hash: str, storage_key: str, size: int) -> str:
+    """Добавляет ссылку на блоб, создавая запись при первой ссылке; транзакция не фиксируется.
+
+    Строка и ключ блоба остаются заблокированными до commit, поэтому параллельное
+    освобождение последней ссылки не удалит файл, который сейчас кладется
+    в хранилище. Возвращает ключ блоба (ключ первой загрузки этого содержимого).
+    """
+    result = await db.execute(_acquire_blob_stmt(content_hash, storage_key, size))
+    blob_key = result.scalar_one()
+    await db.execute(_lock_blob_key_stmt(blob_key))
+    return blob_key
+
+
+async def claim_orphan_blob(db: AsyncSession, storage_key: str) -> bool:
+    """Блокирует ключ блоба до конца транзакции; True, если на него снова никто не ссылается.
+
+    Вызывается после commit release_image: файл удаляется под этой блокировкой,
+    а загрузка того же содержимого дождется ее снятия и положит файл заново.
+    """
+    await db.execute(_lock_blob_key_stmt(storage_key))
+    result = await db.execute(select(models.Blob.storage_key).where(models.Blob.storage_key == storage_key))
+    return result.scalar_one_or_none() is None
+
+
+def _lock_blob_key_stmt(storage_key: str):
+    """Транзакционная advisory-блокировка ключа блоба."""
+    return select(func.pg_advisory_xact_lock(func.hashtext(storage_key)))
+
+
+def _acquire_blob_stmt(content_hash: str, storage_key: str, size: int):
+    """Upsert блоба с увеличением счетчика ссылок, возвращающий ключ блоба."""
+    return (
+        insert(models.Blob)
+        .values(content_hash=content_hash, storage_key=storage_key, size=size, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=[models.Blob.content_hash],
+            set_={"ref_count": models.Blob.ref_count + 1},
+        )
+        .returning(models.Blob.storage_key)
+    )
+
+
+async def release_image(db: AsyncSession, image_id: int) -> Tuple[bool, Optional[str]]:
+    """Удаляет метаданные изображения и его ссылку на блоб; транзакция не фиксируется.
+
+    Возвращает (удалена ли запись, ключ файла, который больше никем не используется).
+    Для изображений, загруженных до появления блобов, возвращается их собственный ключ.
+    """
+    result = await db.execute(
+        delete(models.Image).where(models.Image.image_id == image_id).returning(models.Image.storage_key)
+    )
+    storage_key = result.scalar_one_or_none()
+    if storage_key is None:
+        return False, None
+
+    result = await db.execute(
+        update(models.Blob)
+        .where(models.Blob.storage_key == storage_key)
+        .values(ref_count=models.Blob.ref_count - 1)
+        .returning(models.Blob.ref_count)
+    )
+    ref_count = result.scalar_one_or_none()
+    if ref_count is None:
+        return True, storage_key
+    if ref_count > 0:
+        return True, None
+
+    await db.execute(delete(models.Blob).where(models.Blob.storage_key == storage_key))
+    return True, storage_key
+
+
+async def get_image(db: AsyncSession, image_id: int) -> Optional[models.Image]:
+    """Получает метаданные изображения по ID изображения."""
+    result = await db.execute(select(models.Image).where(models.Image.image_id == image_id))
+    return result.scalar_one_or_none()
+
+
+async def get_images_for_analyse(db: AsyncSession, image_ids: List[int]) -> List[tuple]:
+    """Получает метаданные изображений и владельцев их результатов OCR одним запросом."""
+    result = await db.execute(
+        select(models.Image, models.ImageText.user_id)
+        .outerjoin(models.ImageText, models.ImageText.image_id == models.Image.image_id)
+        .where(models.Image.image_id.in_(image_ids))
+    )
+    return result.all()
+
+
+async def get_image_pages(
+    db: AsyncSession, image_id: int, page_from: Optional[int] = None, page_to: Optional[int] = None
+) -> List[models.ImagePage]:
+    """Получает результаты OCR страниц документа по порядку (page_from/page_to — номера с нуля, включительно)."""
+    stmt = select(models.ImagePage).where(models.ImagePage.image_id == image_id)
+    if page_from is not None:
+        stmt = stmt.where(models.ImagePage.page_no >= page_from)
+    if page_to is not None:
+        stmt = stmt.where(models.ImagePage.page_no <= page_to)
+    result = await db.execute(stmt.order_by(models.ImagePage.page_no))
+    return list(result.scalars().all())
+
+
+async def stream_image_page_texts(db: AsyncSession, image_id: int) -> AsyncIterator[str]:
+    """Построчно отдает тексты готовых страниц через серверный курсор."""
+    result = await db.stream_scalars(
+        select(models.ImagePage.text)
+        .where(
+            models.ImagePage.image_id == image_id,
+            models.ImagePage.status == "completed",
+            models.ImagePage.text.isnot(None),
+        )
+        .order_by(models.ImagePage.page_no)
+        .execution_options(yield_per=16)
+    )
+    async for text in result:
+        yield text
+
+
+async def get_ocr_cache(db: AsyncSession, cache_key: str) -> Optional[models.OCRResultCache]:
+    """Получает закэшированный результат OCR по ключу."""
+    result = await db.execute(
+        select(models.OCRResultCache).where(models.OCRResultCache.cache_key == cache_key)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_ocr_cache_many(db: AsyncSession, cache_keys: List[str]) -> List[models.OCRResultCache]:
+    """Получает закэшированные результаты OCR по списку ключей."""
+    if not cache_keys:
+        return []
+    result = await db.execute(
+        select(models.OCRResultCache).where(models.OCRResultCache.cache_key.in_(cache_keys))
+    )
+    return list(result.scalars().all())
 
 
 def get_image_text_sync(db: Session, image_id: int) -> Optional[models.ImageText]:
@@ -85,11 +452,159 @@ def get_image_text_sync(db: Session, image_id: int) -> Optional[models.ImageText
 def update_image_text_sync(
     db: Session, image_id: int, update_data: schemas.ImageTextUpdate
 ) -> Optional[models.ImageText]:
-    """Синхронная версия обновления записи о тексте изображения."""
-    db_image_text = get_image_text_sync(db, image_id)
-    if db_image_text:
-        for key, value in update_data.model_dump(exclude_unset=True).items():
-            setattr(db_image_text, key, value)
-        db.commit()
-        db.refresh(db_image_text)
-    return db_image_text
\ No newline at end of file
+    """Синхронная версия обновления записи о тексте изображения.
+
+    Выполняет один UPDATE ... RETURNING; фиксирует транзакцию вызывающий код.
+    """
+    return db.execute(_update_image_text_stmt(image_id, update_data)).scalar_one_or_none()
+
+
+def update_image_texts_sync(db: Session, updates: Dict[int, schemas.ImageTextUpdate]) -> None:
+    """Синхронная версия пакетного обновления записей; фиксирует транзакцию вызывающий код."""
+    for stmt, params in _bulk_update_image_texts_stmts(updates):
+        db.execute(stmt, params)
+
+
+def save_ocr_cache_sync(
+    db: Session, cache_key: str, content_hash: str, lang: str, options: str, text: str
+) -> None:
+    """Синхронно сохраняет результат OCR в кэш, не перезаписывая существующую запись."""
+    stmt = insert(models.OCRResultCache).values(
+        cache_key=cache_key, content_hash=content_hash, lang=lang, options=options, text=text
+    ).on_conflict_do_nothing(index_elements=["cache_key"])
+    db.execute(stmt)
+
+
+def start_document_sync(db: Session, image_id: int, page_count: int, run_id: str) -> bool:
+    """Готовит запись к постраничной обработке документа, удаляя старые результаты страниц.
+
+    run_id — ID задачи, разбившей документ на страницы. Если запись уже
+    поставлена в очередь заново другой задачей, возвращает False и ничего не меняет.
+    """
+    started = db.execute(
+        update(models.ImageText)
+        .where(models.ImageText.image_id == image_id, models.ImageText.task_id == run_id)
+        .values(page_count=page_count, pages_done=0, text=None, error_message=None)
+        .returning(models.ImageText.id)
+    ).scalar_one_or_none()
+    if started is None:
+        return False
+    db.execute(delete(models.ImagePage).where(models.ImagePage.image_id == image_id))
+    return True
+
+
+def save_page_sync(
+    db: Session, image_id: int, page_no: int, text: Optional[str], status: str, error_message: Optional[str]
+) -> None:
+    """Синхронно сохраняет результат OCR страницы документа."""
+    stmt = insert(models.ImagePage).values(
+        image_id=image_id, page_no=page_no, text=text, status=status, error_message=error_message
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["image_id", "page_no"],
+        set_={
+            "text": stmt.excluded.text,
+            "status": stmt.excluded.status,
+            "error_message": stmt.excluded.error_message,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def save_failed_page_sync(db: Session, image_id: int, page_no: int, error_message: str) -> bool:
+    """Сохраняет страницу как неудачную, если для нее еще нет результата; возвращает True при вставке."""
+    stmt = insert(models.ImagePage).values(
+        image_id=image_id, page_no=page_no, text=None, status="failed", error_message=error_message
+    ).on_conflict_do_nothing(index_elements=["image_id", "page_no"]).returning(models.ImagePage.id)
+    return db.execute(stmt).scalar_one_or_none() is not None
+
+
+def increment_pages_done_sync(db: Session, image_id: int, run_id: Optional[str] = None) -> Optional[tuple]:
+    """Атомарно увеличивает счетчик готовых страниц и возвращает (pages_done, page_count).
+
+    Если передан run_id, счетчик меняется, только пока документ обрабатывает
+    эта задача; для страниц устаревшего запуска возвращается None.
+    """
+    stmt = (
+        update(models.ImageText)
+        .where(models.ImageText.image_id == image_id)
+        .values(pages_done=models.ImageText.pages_done + 1)
+        .returning(models.ImageText.pages_done, models.ImageText.page_count)
+    )
+    if run_id is not None:
+        stmt = stmt.where(models.ImageText.task_id == run_id)
+    return db.execute(stmt).one_or_none()
+
+
+def get_image_pages_sync(db: Session, image_id: int) -> List[models.ImagePage]:
+    """Синхронная версия получения результатов OCR страниц документа."""
+    return (
+        db.query(models.ImagePage)
+        .filter(models.ImagePage.image_id == image_id)
+        .order_by(models.ImagePage.page_no)
+        .all()
+    )
+
+
+def get_image_storage_key_sync(db: Session, image_id: int) -> Optional[str]:
+    """Получает текущий ключ файла изображения."""
+    return db.execute(
+        select(models.Image.storage_key).where(models.Image.image_id == image_id)
+    ).scalar_one_or_none()
+
+
+def get_legacy_images_sync(db: Session, after_id: int, limit: int) -> List[tuple]:
+    """Получает пачку изображений, файлы которых еще лежат в старой раскладке (keyset по id).
+
+    Возвращает кортежи (id, image_id, storage_key, content_hash, size), а не объекты
+    ORM: они не истекают при rollback и не перечитываются из БД по одному.
+    """
+    return list(
+        db.execute(
+            select(
+                models.Image.id,
+                models.Image.image_id,
+                models.Image.storage_key,
+                models.Image.content_hash,
+                models.Image.size,
+            )
+            .where(models.Image.id > after_id, ~models.Image.storage_key.startswith("blobs/"))
+            .order_by(models.Image.id)
+            .limit(limit)
+        ).all()
+    )
+
+
+def get_existing_image_ids_sync(db: Session, image_ids: List[int]) -> set:
+    """Возвращает ID изображений из списка, для которых уже есть метаданные."""
+    if not image_ids:
+        return set()
+    return set(
+        db.execute(select(models.Image.image_id).where(models.Image.image_id.in_(image_ids))).scalars().all()
+    )
+
+
+def acquire_blob_sync(db: Session, content_hash: str, storage_key: str, size: int) -> str:
+    """Синхронная версия acquire_blob; транзакция не фиксируется."""
+    blob_key = db.execute(_acquire_blob_stmt(content_hash, storage_key, size)).scalar_one()
+    db.execute(_lock_blob_key_stmt(blob_key))
+    return blob_key
+
+
+def move_image_to_blob_sync(db: Session, image_id: int, old_key: str, blob_key: str) -> bool:
+    """Переключает изображение со старого ключа на блоб; не срабатывает, если запись изменилась."""
+    result = db.execute(
+        update(models.Image)
+        .where(models.Image.image_id == image_id, models.Image.storage_key == old_key)
+        .values(storage_key=blob_key)
+    )
+    return result.rowcount > 0
+
+
+def create_image_sync(db: Session, **fields) -> bool:
+    """Создает метаданные изображения, если их еще нет; транзакция не фиксируется."""
+    result = db.execute(
+        insert(models.Image).values(**fields).on_conflict_do_nothing(index_elements=["image_id"])
+    )
+    return result.rowcount > 0
@@ -6,6 +6,13 @@ from app.config import settings
 from app.api.endpoints import router as api_router
 from app.api.auth import router as auth_router
 from app.core.logging_config import setup_logging
+from app.core.ocr_cache import ocr_cache
+from app.core.pg_listener import pg_listener
+from app.core.security import password_hasher
+from app.core.user_cache import user_cache, USER_CHANNEL
+from app.core.image_cache import image_cache, IMAGE_CHANNEL
+from app.core.status_events import status_broker, STATUS_CHANNEL
+from app.core.upload_limit import UploadSizeLimitMiddleware
 import logging
 import os
 import subprocess
@@ -30,6 +37,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path=f"{settings.API_V1_PREFIX}/upload",
+    max_size=settings.UPLOAD_MAX_SIZE,
+)
+
 app.include_router(auth_router, prefix="/auth", tags=["Аутентификация"])
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -46,9 +59,18 @@ async def root():
             "login": "POST /auth/login - Вход по email и паролю (получение токена)",
             "upload": f"POST {settings.API_V1_PREFIX}/upload - Загрузить изображение",
             "doc_analyse": f"POST {settings.API_V1_PREFIX}/doc_analyse - Запустить OCR анализ",
+            "doc_analyse_batch": f"POST {settings.API_V1_PREFIX}/doc_analyse_batch - Пакетный запуск OCR анализа",
             "get_text": f"GET {settings.API_V1_PREFIX}/get_text/{{image_id}} - Получить результат OCR",
+            "get_text_stream": f"GET {settings.API_V1_PREFIX}/get_text/{{image_id}}/stream - Потоковая выдача текста OCR",
             "delete": f"DELETE {settings.API_V1_PREFIX}/doc_delete/{{image_id}} - Удалить изображение",
             "status": f"GET {settings.API_V1_PREFIX}/status/{{task_id}} - Статус задачи OCR",
+            "documents": f"GET {settings.API_V1_PREFIX}/documents - Список документов",
+            "search": f"GET {settings.API_V1_PREFIX}/search?q=... - Поиск по тексту документов",
+            "events": f"GET {settings.API_V1_PREFIX}/events - Поток изменений статуса (SSE)",
+            "ws_events": f"WS {settings.API_V1_PREFIX}/ws/events?token=... - Поток изменений статуса (WebSocket)",
+            "ocr_cache": "GET /metrics/ocr_cache - Статистика кэша результатов OCR",
+            "user_cache": "GET /metrics/user_cache - Статистика кэша пользователей",
+            "image_cache": "GET /metrics/image_cache - Статистика кэша метаданных изображений",
         },
     }
 
@@ -59,6 +81,24 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics/ocr_cache")
+async def ocr_cache_metrics():
+    """Счетчики попаданий и промахов кэша результатов OCR."""
+    return ocr_cache.stats()
+
+
+@app.get("/metrics/user_cache")
+async def user_cache_metrics():
+    """Счетчики попаданий и промахов кэша пользователей."""
+    return user_cache.stats()
+
+
+@app.get("/metrics/image_cache")
+async def image_cache_metrics():
+    """Счетчики попаданий и промахов кэша метаданных изображений."""
+    return image_cache.stats()
+
+
 async def run_migrations():
     """Запускает миграции Alembic при старте приложения."""
     try:
@@ -122,6 +162,13 @@ async def startup_event():
     logger.info("Запуск OCR сервиса")
     await run_migrations()
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    pg_listener.subscribe(USER_CHANNEL, user_cache.on_notify)
+    pg_listener.on_reconnect(user_cache.clear)
+    pg_listener.subscribe(IMAGE_CHANNEL, image_cache.on_notify)
+    pg_listener.on_reconnect(image_cache.clear)
+    pg_listener.subscribe(STATUS_CHANNEL, status_broker.on_notify)
+    pg_listener.on_reconnect(status_broker.resync)
+    await pg_listener.start()
     logger.info(f"Директория загрузок: {settings.UPLOAD_DIR}")
     logger.info(f"Документация: http://localhost:{settings.PORT}/docs")
 
@@ -130,6 +177,8 @@ async def startup_event():
 async def shutdown_event():
     """Действия при остановке приложения."""
     logger.info("Остановка OCR сервиса")
+    await pg_listener.stop()
+    password_hasher.shutdown()
     from app.database import async_engine
     await async_engine.dispose()
     logger.info("Соединения с БД закрыты")
\ No newline at end of file
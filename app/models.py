@@ -1,8 +1,11 @@
 """Модели SQLAlchemy для базы данных."""
 
-from sqlalchemy import Column, Integer, Text, String, DateTime, UniqueConstraint, ForeignKey
+from sqlalchemy import (
+    Column, Integer, BigInteger, Text, String, DateTime, JSON, Index, UniqueConstraint, ForeignKey
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 
 
@@ -19,6 +22,7 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     image_texts = relationship("ImageText", back_populates="user", cascade="all, delete-orphan")
+    images = relationship("Image", back_populates="user", cascade="all, delete-orphan")
 
 
 class ImageText(Base):
@@ -32,9 +36,87 @@ class ImageText(Base):
     text = Column(Text)
     status = Column(String(20), default="pending")
     error_message = Column(Text)
+    batch_id = Column(String(36), index=True)
+    page_count = Column(Integer)
+    pages_done = Column(Integer)
+    task_id = Column(String(36), unique=True, index=True)
+    task_result = Column(JSON)
+    queued_at = Column(DateTime(timezone=True))
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    # Заполняется триггером image_text_search_vector_update при записи text (миграция 0009).
+    search_vector = deferred(Column(TSVECTOR))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship("User", back_populates="image_texts")
 
-    __table_args__ = (UniqueConstraint("image_id", name="uq_image_text_image_id"),)
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint("image_id", name="uq_image_text_image_id"),
+        Index("ix_image_text_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_image_text_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
+
+class ImagePage(Base):
+    """Модель для хранения результатов OCR отдельных страниц документа."""
+
+    __tablename__ = "image_pages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    image_id = Column(
+        Integer, ForeignKey("image_text.image_id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    page_no = Column(Integer, nullable=False)
+    text = Column(Text)
+    status = Column(String(20), default="pending")
+    error_message = Column(Text)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (UniqueConstraint("image_id", "page_no", name="uq_image_pages_image_id_page_no"),)
+
+
+class Image(Base):
+    """Модель метаданных загруженного изображения."""
+
+    __tablename__ = "images"
+
+    id = Column(Integer, primary_key=True, index=True)
+    image_id = Column(Integer, nullable=False, unique=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    storage_key = Column(String(255), nullable=False)
+    filename = Column(String(255))
+    size = Column(BigInteger, nullable=False)
+    content_hash = Column(String(64), nullable=False, index=True)
+    mime = Column(String(100))
+    width = Column(Integer)
+    height = Column(Integer)
+    page_count = Column(Integer)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User", back_populates="images")
+
+
+class Blob(Base):
+    """Модель файла хранилища, адресуемого по содержимому, со счетчиком ссылок из images."""
+
+    __tablename__ = "blobs"
+
+    content_hash = Column(String(64), primary_key=True)
+    storage_key = Column(String(255), nullable=False, unique=True)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class OCRResultCache(Base):
+    """Модель постоянного кэша результатов OCR по содержимому изображения."""
+
+    __tablename__ = "ocr_result_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    content_hash = Column(String(64), nullable=False, index=True)
+    lang = Column(String(50), nullable=False)
+    options = Column(Text)
+    text = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
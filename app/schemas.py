@@ -1,7 +1,7 @@
 """Pydantic схемы для валидации и сериализации данных."""
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
@@ -53,6 +53,51 @@ class ImageTextUpdate(BaseModel):
     text: Optional[str] = None
     status: Optional[str] = None
     error_message: Optional[str] = None
+    page_count: Optional[int] = None
+    pages_done: Optional[int] = None
+    task_id: Optional[str] = None
+    task_result: Optional[Dict[str, Any]] = None
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class PreprocessOptions(BaseModel):
+    """Параметры предобработки изображения перед OCR."""
+
+    grayscale: bool = True
+    max_side: Optional[int] = Field(None, gt=0)
+    target_text_height: Optional[int] = Field(None, gt=0)
+    binarize: bool = False
+    binarize_window: int = Field(31, ge=3)
+    binarize_offset: float = Field(0.15, ge=0, lt=1)
+    crop_borders: bool = False
+    crop_margin: int = Field(10, ge=0)
+
+
+class BatchAnalyseRequest(BaseModel):
+    """Схема для пакетного запуска OCR анализа."""
+
+    image_ids: List[int] = Field(..., min_length=1)
+    profile: Optional[str] = None
+
+
+class ImageMeta(BaseModel):
+    """Метаданные загруженного изображения, не привязанные к сессии БД."""
+
+    image_id: int
+    user_id: int
+    storage_key: str
+    filename: Optional[str] = None
+    size: int
+    content_hash: str
+    mime: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    page_count: Optional[int] = None
+
+    class Config:
+        from_attributes = True
 
 
 class ImageTextResponse(ImageTextBase):
@@ -62,6 +107,13 @@ class ImageTextResponse(ImageTextBase):
     text: Optional[str] = None
     status: str
     error_message: Optional[str] = None
+    batch_id: Optional[str] = None
+    page_count: Optional[int] = None
+    pages_done: Optional[int] = None
+    task_id: Optional[str] = None
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -3,9 +3,21 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, schemas
+from app.core.business_logic import OCRProcessor
 from app.core.file_storage import FileStorage
+from app.core.image_cache import image_cache
+from app.core import documents, routing
+from app.core.ocr_cache import ocr_cache, OCRResultCache
+from app.config import settings
 from app.tasks import process_ocr_task
+from celery import group
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+import asyncio
+import hashlib
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 file_storage = FileStorage()
@@ -14,49 +26,227 @@ file_storage = FileStorage()
 class AnalyseService:
     """Сервис для обработки OCR анализа."""
 
-    async def process_analyse(self, image_id: int, user_id: int, db: AsyncSession) -> dict:
+    async def process_analyse(
+        self, image_id: int, user_id: int, db: AsyncSession, profile: Optional[str] = None
+    ) -> dict:
         """Запускает OCR анализ для изображения."""
         logger.info(f"Запуск OCR анализа - user_id: {user_id}, image_id: {image_id}")
+        options = self._get_options(profile)
 
-        file_info = file_storage.get_file_info(image_id, user_id)
-        if not file_info:
+        image = await image_cache.get(db, image_id)
+        file_info = file_storage.get_file_info(image_id, user_id) if image is None else None
+        if image is None and not file_info:
             logger.warning(f"Файл не найден - image_id: {image_id}")
             raise HTTPException(404, "Image not found")
 
         existing = await crud.get_image_text(db, image_id)
-        if existing and existing.user_id != user_id:
+        if (existing and existing.user_id != user_id) or (image is not None and image.user_id != user_id):
             logger.warning(f"Попытка доступа к чужому ресурсу - image_id: {image_id}")
             raise HTTPException(403, "Access denied")
 
-        if existing:
-            await crud.update_image_text(
-                db, image_id, schemas.ImageTextUpdate(status="pending", text=None, error_message=None)
-            )
+        if image is not None:
+            image_ref = self._build_image_ref(image, profile)
+            content_hash = image.content_hash
+            task_options = routing.route(image)
         else:
-            await crud.create_image_text(db, schemas.ImageTextCreate(image_id=image_id, user_id=user_id))
+            content_hash, size = await asyncio.to_thread(self._hash_file, file_info["file_path"])
+            _, width, height, page_count = await asyncio.to_thread(
+                documents.probe, file_info["file_path"], file_info["filename"]
+            )
+            image_ref = {
+                "user_id": user_id,
+                "image_id": image_id,
+                "storage_key": file_info["storage_key"],
+                "filename": file_info["filename"],
+                "size": size,
+                "checksum": content_hash,
+                "profile": profile,
+                "width": width,
+                "height": height,
+                "page_count": page_count,
+            }
+            task_options = routing.route(image_ref)
+
+        if settings.OCR_CACHE_ENABLED:
+            cache_key = OCRResultCache.make_key(content_hash, settings.TESSERACT_LANG, options)
+            cached_text = await ocr_cache.get(db, cache_key)
+            if cached_text is not None:
+                logger.info(f"Результат OCR найден в кэше - image_id: {image_id}")
+                await self._save_record(
+                    db, image_id, user_id,
+                    schemas.ImageTextUpdate(
+                        status="completed", text=cached_text, error_message=None, task_id=None,
+                        task_result={"cached": True, "text_length": len(cached_text)},
+                        queued_at=None, started_at=None, finished_at=datetime.now(timezone.utc),
+                    ),
+                )
+                return {
+                    "task_id": None,
+                    "image_id": image_id,
+                    "status": "completed",
+                    "message": "OCR result served from cache",
+                    "cached": True,
+                }
+
+        task_id = str(uuid.uuid4())
+        await self._save_record(
+            db, image_id, user_id,
+            schemas.ImageTextUpdate(status="pending", text=None, error_message=None, **self._queued(task_id)),
+        )
 
         try:
-            with open(file_info["file_path"], "rb") as f:
-                image_data = f.read()
-
-            task = process_ocr_task.apply_async(
-                args=[image_id, image_data, file_info["filename"], user_id],
-                queue="celery",
-                time_limit=60,
-                soft_time_limit=50,
-            )
+            task = process_ocr_task.apply_async(args=[image_ref], task_id=task_id, **task_options)
 
-            logger.info(f"Задача OCR отправлена - Task ID: {task.id}")
+            logger.info(f"Задача OCR отправлена - Task ID: {task.id}, очередь: {task_options['queue']}")
             return {
                 "task_id": str(task.id),
                 "image_id": image_id,
                 "status": "processing",
+                "queue": task_options["queue"],
                 "message": "OCR processing started",
             }
         except Exception as e:
             error_msg = f"Celery error: {str(e)}"
             logger.error(f"Ошибка отправки задачи: {e}")
             await crud.update_image_text(
-                db, image_id, schemas.ImageTextUpdate(status="failed", error_message=error_msg[:500])
+                db, image_id, schemas.ImageTextUpdate(
+                    status="failed", error_message=error_msg[:500], finished_at=datetime.now(timezone.utc)
+                )
+            )
+            raise HTTPException(503, f"OCR service unavailable: {str(e)}")
+
+    async def process_analyse_batch(
+        self, image_ids: List[int], user_id: int, db: AsyncSession, profile: Optional[str] = None
+    ) -> dict:
+        """Запускает OCR анализ для пачки изображений.
+
+        Владение проверяется одним запросом, записи ImageText создаются
+        одним upsert, а задачи публикуются одной Celery-группой.
+        """
+        image_ids = list(dict.fromkeys(image_ids))
+        if len(image_ids) > settings.ANALYSE_BATCH_MAX_SIZE:
+            raise HTTPException(400, f"Batch size exceeds {settings.ANALYSE_BATCH_MAX_SIZE}")
+        options = self._get_options(profile)
+
+        batch_id = str(uuid.uuid4())
+        logger.info(f"Запуск пакетного OCR анализа - user_id: {user_id}, batch_id: {batch_id}, "
+                    f"изображений: {len(image_ids)}")
+
+        images = {}
+        results = {image_id: {"image_id": image_id, "task_id": None, "status": "not_found"}
+                   for image_id in image_ids}
+        for image, text_owner_id in await crud.get_images_for_analyse(db, image_ids):
+            if image.user_id != user_id or (text_owner_id is not None and text_owner_id != user_id):
+                results[image.image_id]["status"] = "forbidden"
+            else:
+                images[image.image_id] = image
+
+        cached = {}
+        if settings.OCR_CACHE_ENABLED and images:
+            keys = {
+                image_id: OCRResultCache.make_key(image.content_hash, settings.TESSERACT_LANG, options)
+                for image_id, image in images.items()
+            }
+            found = await ocr_cache.get_many(db, list(keys.values()))
+            cached = {image_id: found[key] for image_id, key in keys.items() if key in found}
+
+        rows = []
+        signatures = []
+        for image_id, image in images.items():
+            row = {"image_id": image_id, "user_id": user_id, "error_message": None, "batch_id": batch_id}
+            if image_id in cached:
+                rows.append({
+                    **row, "status": "completed", "text": cached[image_id], "task_id": None,
+                    "task_result": {"cached": True, "text_length": len(cached[image_id])},
+                    "queued_at": None, "started_at": None, "finished_at": datetime.now(timezone.utc),
+                })
+                results[image_id]["status"] = "completed"
+                continue
+
+            task_id = str(uuid.uuid4())
+            rows.append({**row, "status": "pending", "text": None, **self._queued(task_id)})
+            results[image_id].update(task_id=task_id, status="processing")
+            signatures.append(
+                process_ocr_task.signature(
+                    args=[self._build_image_ref(image, profile)],
+                    task_id=task_id,
+                    **routing.route(image, bulk=True),
+                )
             )
-            raise HTTPException(503, f"OCR service unavailable: {str(e)}")
\ No newline at end of file
+
+        await crud.upsert_image_texts(db, rows)
+
+        if signatures:
+            try:
+                group(signatures).apply_async()
+            except Exception as e:
+                error_msg = f"Celery error: {str(e)}"
+                logger.error(f"Ошибка отправки пакета задач: {e}")
+                await crud.upsert_image_texts(db, [
+                    {**row, "status": "failed", "error_message": error_msg[:500],
+                     "finished_at": datetime.now(timezone.utc)}
+                    for row in rows if row["status"] == "pending"
+                ])
+                raise HTTPException(503, f"OCR service unavailable: {str(e)}")
+
+        logger.info(f"Пакет OCR отправлен - batch_id: {batch_id}, задач: {len(signatures)}, "
+                    f"из кэша: {len(cached)}")
+        return {
+            "batch_id": batch_id,
+            "submitted": len(signatures),
+            "cached": len(cached),
+            "items": [results[image_id] for image_id in image_ids],
+        }
+
+    @staticmethod
+    def _get_options(profile: Optional[str]) -> dict:
+        """Возвращает параметры OCR, проверяя профиль предобработки."""
+        try:
+            return OCRProcessor.get_options(profile)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+    @staticmethod
+    def _queued(task_id: str) -> dict:
+        """Поля состояния задачи для записи, поставленной в очередь."""
+        return {
+            "task_id": task_id,
+            "task_result": None,
+            "queued_at": datetime.now(timezone.utc),
+            "started_at": None,
+            "finished_at": None,
+        }
+
+    @staticmethod
+    def _build_image_ref(image, profile: Optional[str] = None) -> dict:
+        """Формирует ссылку на изображение в хранилище для задачи OCR."""
+        return {
+            "user_id": image.user_id,
+            "image_id": image.image_id,
+            "storage_key": image.storage_key,
+            "filename": Path(image.storage_key).name,
+            "size": image.size,
+            "checksum": image.content_hash,
+            "profile": profile,
+            "width": image.width,
+            "height": image.height,
+            "page_count": image.page_count,
+        }
+
+    @staticmethod
+    def _hash_file(file_path: str) -> tuple:
+        """Считает SHA-256 и размер файла, загруженного до появления метаданных."""
+        hasher = hashlib.sha256()
+        size = 0
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(settings.UPLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                size += len(chunk)
+        return hasher.hexdigest(), size
+
+    @staticmethod
+    async def _save_record(db: AsyncSession, image_id: int, user_id: int, update_data):
+        """Создает или обновляет запись о результате OCR одним upsert."""
+        await crud.create_image_text(
+            db, schemas.ImageTextCreate(image_id=image_id, user_id=user_id), update_data
+        )
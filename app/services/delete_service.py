@@ -1,9 +1,11 @@
 """Сервис для удаления файлов и записей."""
 
+import asyncio
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud
 from app.core.file_storage import FileStorage
+from app.core.image_cache import image_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +16,12 @@ class DeleteService:
     """Сервис для обработки удаления."""
 
     async def process_delete(self, image_id: int, user_id: int, db: AsyncSession) -> dict:
-        """Удаляет изображение и запись из БД."""
+        """Удаляет изображение и запись из БД.
+
+        Файл удаляется из хранилища только после commit последней ссылки на блоб
+        и под блокировкой его ключа: параллельная загрузка того же содержимого
+        либо уже сослалась на блоб (файл остается), либо дождется удаления.
+        """
         logger.info(f"Удаление - user_id: {user_id}, image_id: {image_id}")
 
         image_text = await crud.get_image_text(db, image_id)
@@ -22,8 +29,23 @@ class DeleteService:
             logger.warning(f"Попытка удаления чужого ресурса - image_id: {image_id}")
             raise HTTPException(403, "Access denied")
 
+        image = await image_cache.get(db, image_id)
+        if image and image.user_id != user_id:
+            logger.warning(f"Попытка удаления чужого ресурса - image_id: {image_id}")
+            raise HTTPException(403, "Access denied")
+
         db_deleted = await crud.delete_image_text(db, image_id)
-        file_deleted = file_storage.delete_file(image_id, user_id)
+        if image:
+            file_deleted, orphan_key = await crud.release_image(db, image_id)
+            image_cache.invalidate(image_id)
+            await db.commit()
+            blob_deleted = False
+            if orphan_key is not None:
+                if await crud.claim_orphan_blob(db, orphan_key):
+                    blob_deleted = await asyncio.to_thread(file_storage.delete_blob, orphan_key)
+                await db.commit()
+        else:
+            file_deleted = blob_deleted = file_storage.delete_file(image_id, user_id)
 
         if not db_deleted and not file_deleted:
             logger.warning(f"Запись не найдена - image_id: {image_id}")
@@ -34,4 +56,5 @@ class DeleteService:
             "image_id": image_id,
             "db_record_deleted": db_deleted,
             "file_deleted": file_deleted,
+            "blob_deleted": blob_deleted,
         }
\ No newline at end of file
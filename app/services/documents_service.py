@@ -0,0 +1,61 @@
+"""Сервис для получения списка документов пользователя."""
+
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud
+from app.core.pagination import encode_cursor, decode_cursor
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentsService:
+    """Сервис постраничного списка документов."""
+
+    async def list_documents(
+        self,
+        user_id: int,
+        db: AsyncSession,
+        limit: int = 50,
+        status: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        """Возвращает страницу документов от новых к старым и курсор следующей страницы."""
+        logger.info(f"Запрос списка документов - user_id: {user_id}, status: {status}")
+
+        after = None
+        if cursor:
+            try:
+                values = decode_cursor(cursor)
+                after = (datetime.fromisoformat(values["created_at"]), int(values["id"]))
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(400, "Invalid cursor")
+
+        rows = await crud.list_image_texts(
+            db, user_id, limit, status=status, created_from=created_from, created_to=created_to, after=after
+        )
+
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_cursor({"created_at": last.created_at.isoformat(), "id": last.id})
+
+        return {
+            "items": [
+                {
+                    "image_id": row.image_id,
+                    "status": row.status,
+                    "batch_id": row.batch_id,
+                    "page_count": row.page_count,
+                    "pages_done": row.pages_done,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
@@ -0,0 +1,109 @@
+"""Сервис потоковых уведомлений об изменении статуса OCR."""
+
+import asyncio
+from typing import AsyncIterator, Optional, List, Dict, Any
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud
+from app.config import settings
+from app.core.status_events import status_broker, Subscription, TERMINAL_STATUSES, RESYNC
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _event(image_text) -> Dict[str, Any]:
+    """Формирует событие статуса из записи ImageText."""
+    return {
+        "image_id": image_text.image_id,
+        "status": image_text.status,
+        "task_id": image_text.task_id,
+        "batch_id": image_text.batch_id,
+        "page_count": image_text.page_count,
+        "pages_done": image_text.pages_done,
+    }
+
+
+class EventsService:
+    """Сервис подписки на изменения статуса изображений пользователя."""
+
+    async def subscribe(
+        self,
+        user_id: int,
+        db: AsyncSession,
+        image_ids: Optional[List[int]] = None,
+        batch_id: Optional[str] = None,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Подписывает пользователя и возвращает поток событий.
+
+        Сначала отдается текущее состояние, затем изменения. При подписке на
+        изображения или пакет поток завершается, когда все они в конечном
+        статусе. None в потоке означает, что пора отправить heartbeat.
+
+        Если клиент не успевал читать и часть событий потеряна, подписка на
+        изображения или пакет получает заново их состояние, а подписка на все
+        изображения — событие RESYNC и состояние изображений в обработке.
+        """
+        logger.info(f"Подписка на статусы - user_id: {user_id}, image_ids: {image_ids}, batch_id: {batch_id}")
+        subscription = status_broker.subscribe(user_id, image_ids, batch_id)
+        try:
+            snapshot = await self._snapshot(subscription, db)
+        except Exception:
+            status_broker.unsubscribe(subscription)
+            raise
+
+        if (image_ids or batch_id) and not snapshot:
+            status_broker.unsubscribe(subscription)
+            raise HTTPException(404, "No images found for subscription")
+
+        return self._events(subscription, db, snapshot)
+
+    @staticmethod
+    async def _snapshot(subscription: Subscription, db: AsyncSession) -> List[Dict[str, Any]]:
+        """Читает текущее состояние подписанных изображений и освобождает соединение с БД."""
+        image_texts = await crud.get_image_texts_for_user(
+            db, subscription.user_id, list(subscription.image_ids or []), subscription.batch_id
+        )
+        await db.close()
+        return [_event(image_text) for image_text in image_texts]
+
+    @staticmethod
+    async def _active_snapshot(subscription: Subscription, db: AsyncSession) -> List[Dict[str, Any]]:
+        """Читает состояние изображений пользователя, которые еще в обработке."""
+        image_texts = await crud.get_active_image_texts_for_user(db, subscription.user_id)
+        await db.close()
+        return [_event(image_text) for image_text in image_texts]
+
+    async def _events(
+        self, subscription: Subscription, db: AsyncSession, snapshot: List[Dict[str, Any]]
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Генератор событий подписки."""
+        tracked = subscription.image_ids is not None or subscription.batch_id is not None
+        statuses: Dict[int, str] = {}
+        pending = snapshot
+        try:
+            while True:
+                for event in pending:
+                    if event is not RESYNC:
+                        statuses[event["image_id"]] = event["status"]
+                    yield event
+                if tracked and statuses and set(statuses.values()) <= TERMINAL_STATUSES:
+                    return
+
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.EVENTS_HEARTBEAT_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                    pending = []
+                    continue
+
+                if event is RESYNC and tracked:
+                    pending = await self._snapshot(subscription, db)
+                elif event is RESYNC:
+                    pending = [RESYNC] + await self._active_snapshot(subscription, db)
+                else:
+                    pending = [{key: value for key, value in event.items() if key != "user_id"}]
+        finally:
+            status_broker.unsubscribe(subscription)
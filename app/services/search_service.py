@@ -0,0 +1,50 @@
+"""Сервис полнотекстового поиска по результатам OCR."""
+
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.text_search import ts_configs
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SearchService:
+    """Сервис поиска документов пользователя по распознанному тексту."""
+
+    async def search(
+        self, user_id: int, db: AsyncSession, query: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> dict:
+        """Ищет документы по тексту с ранжированием, фрагментами и пагинацией по курсору."""
+        logger.info(f"Поиск по тексту - user_id: {user_id}, запрос: {query!r}")
+
+        after = None
+        if cursor:
+            try:
+                values = decode_cursor(cursor)
+                after = (float(values["rank"]), int(values["id"]))
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(400, "Invalid cursor")
+
+        rows = await crud.search_image_texts(db, user_id, query, ts_configs(), limit, after)
+
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_cursor({"rank": last.rank, "id": last.id})
+
+        return {
+            "items": [
+                {
+                    "image_id": row.image_id,
+                    "status": row.status,
+                    "rank": row.rank,
+                    "snippet": row.snippet,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
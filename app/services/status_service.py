@@ -1,5 +1,8 @@
 """Сервис для получения статуса задачи."""
 
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud
 from app.core.business_logic import TaskManager
 import logging
 
@@ -9,14 +12,19 @@ logger = logging.getLogger(__name__)
 class StatusService:
     """Сервис для получения статуса задачи OCR."""
 
-    async def get_status(self, task_id: str, user_id: int) -> dict:
-        """Получает статус задачи по ID."""
+    async def get_status(self, task_id: str, user_id: int, db: AsyncSession) -> dict:
+        """Получает статус задачи по ID из записи ImageText, не обращаясь к Celery."""
         logger.info(f"Запрос статуса задачи - user_id: {user_id}, task_id: {task_id}")
 
-        try:
-            response = TaskManager.get_task_status(task_id)
-            logger.info(f"Статус задачи: {response['status']}")
-            return response
-        except Exception as e:
-            logger.error(f"Ошибка проверки статуса: {e}")
-            return {"task_id": task_id, "status": "UNKNOWN", "error": str(e)}
\ No newline at end of file
+        image_text = await crud.get_image_text_by_task_id(db, task_id)
+        if not image_text:
+            logger.warning(f"Задача не найдена - task_id: {task_id}")
+            raise HTTPException(404, "Task not found")
+
+        if image_text.user_id != user_id:
+            logger.warning(f"Попытка доступа к чужой задаче - task_id: {task_id}")
+            raise HTTPException(403, "Access denied")
+
+        response = TaskManager.get_task_status(image_text)
+        logger.info(f"Статус задачи: {response['status']}")
+        return response
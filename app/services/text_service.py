@@ -1,9 +1,14 @@
 """Сервис для получения текста."""
 
-from fastapi import HTTPException
+from typing import Optional, AsyncIterator
+from fastapi import HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud
+from app.config import settings
+from app.core.status_events import status_broker, TERMINAL_STATUSES
+import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -11,11 +16,177 @@ logger = logging.getLogger(__name__)
 class TextService:
     """Сервис для получения результата OCR."""
 
-    async def get_text(self, image_id: int, user_id: int, db: AsyncSession) -> dict:
-        """Получает текст из OCR результата."""
+    async def get_text(
+        self,
+        image_id: int,
+        user_id: int,
+        db: AsyncSession,
+        wait: float = 0,
+        if_none_match: Optional[str] = None,
+        response: Optional[Response] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None,
+    ):
+        """Получает текст из OCR результата.
+
+        При wait > 0 запрос удерживается до конечного статуса записи или
+        истечения wait секунд (не более GET_TEXT_MAX_WAIT). Ожидание регистрируется в status_broker и
+        будится уведомлением от воркера, БД за это время не опрашивается.
+
+        Ответ помечается ETag; если он совпадает с If-None-Match, возвращается
+        304 без загрузки текста из БД.
+
+        offset/limit возвращают фрагмент текста в символах, page_from/page_to —
+        диапазон страниц многостраничного документа (с 1, включительно).
+        """
         logger.info(f"Запрос результата OCR - user_id: {user_id}, image_id: {image_id}")
+        sliced = offset is not None or limit is not None
+        paged = page_from is not None or page_to is not None
+        if sliced and paged:
+            raise HTTPException(400, "Use either offset/limit or page_from/page_to")
+        if page_from is not None and page_to is not None and page_from > page_to:
+            raise HTTPException(400, "page_from must not exceed page_to")
+        wait = min(wait, settings.GET_TEXT_MAX_WAIT)
+        with_text = if_none_match is None and not sliced and not paged
+
+        waiter = status_broker.add_waiter(image_id) if wait > 0 else None
+        try:
+            image_text = await self._get_owned(db, image_id, user_id, with_text)
+
+            deadline = time.monotonic() + wait
+            while waiter is not None and image_text.status not in TERMINAL_STATUSES:
+                remaining = deadline - time.monotonic()
+                await db.close()
+                if remaining <= 0 or not await status_broker.wait(waiter, remaining):
+                    break
+                status_broker.remove_waiter(image_id, waiter)
+                waiter = status_broker.add_waiter(image_id)
+                image_text = await self._get_owned(db, image_id, user_id, with_text)
+        finally:
+            if waiter is not None:
+                status_broker.remove_waiter(image_id, waiter)
+
+        etag = self.make_etag(image_text)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": (
+                f"private, max-age={settings.GET_TEXT_CACHE_MAX_AGE}"
+                if image_text.status in TERMINAL_STATUSES else "private, no-cache"
+            ),
+            "Vary": "Authorization",
+        }
+        if if_none_match is not None and self.etag_matches(if_none_match, etag):
+            logger.info(f"Результат OCR не изменился - image_id: {image_id}")
+            return Response(status_code=304, headers=headers)
+        if response is not None:
+            response.headers.update(headers)
+
+        result = {
+            "image_id": image_id,
+            "text": None,
+            "status": image_text.status,
+            "error_message": image_text.error_message,
+            "created_at": image_text.created_at.isoformat() if image_text.created_at else None,
+        }
+        if image_text.page_count:
+            result["page_count"] = image_text.page_count
+            result["pages_done"] = image_text.pages_done
+
+        if paged:
+            if not image_text.page_count:
+                raise HTTPException(400, "Page range is only supported for multi-page documents")
+            first = (page_from or 1) - 1
+            last = (page_to or image_text.page_count) - 1
+            pages = await crud.get_image_pages(db, image_id, first, last)
+            result["text"] = self._join_pages(pages)
+            result["page_from"], result["page_to"] = first + 1, last + 1
+            return result
+
+        if image_text.page_count and image_text.status in ("pending", "processing"):
+            text = self._join_pages(await crud.get_image_pages(db, image_id))
+            if sliced:
+                start = offset or 0
+                end = start + (limit or settings.GET_TEXT_MAX_SLICE)
+                text, result["has_more"] = text[start:end], len(text) > end
+        elif sliced:
+            start, size = offset or 0, limit or settings.GET_TEXT_MAX_SLICE
+            text = await crud.get_image_text_slice(db, image_id, start, size + 1)
+            if text is not None:
+                result["has_more"] = len(text) > size
+                text = text[:size]
+        elif with_text:
+            text = image_text.text
+        else:
+            text = await crud.get_image_text_content(db, image_id)
 
-        image_text = await crud.get_image_text(db, image_id)
+        result["text"] = text
+        if sliced:
+            result["offset"] = offset or 0
+        return result
+
+    async def stream_text(self, image_id: int, user_id: int, db: AsyncSession) -> AsyncIterator[str]:
+        """Проверяет доступ и возвращает генератор, отдающий текст по частям.
+
+        Готовый текст читается фрагментами по OCR_TEXT_STREAM_CHUNK символов,
+        у документа в обработке — постранично, так что процесс API не держит
+        весь текст в памяти. Сессия БД закрывается по завершении генератора.
+        """
+        logger.info(f"Потоковая выдача результата OCR - user_id: {user_id}, image_id: {image_id}")
+        image_text = await self._get_owned(db, image_id, user_id, with_text=False)
+        return self._iter_text(db, image_text)
+
+    @staticmethod
+    async def _iter_text(db: AsyncSession, image_text) -> AsyncIterator[str]:
+        """Отдает текст записи фрагментами."""
+        try:
+            if image_text.page_count and image_text.status in ("pending", "processing"):
+                separator = ""
+                async for page_text in crud.stream_image_page_texts(db, image_text.image_id):
+                    yield separator + page_text
+                    separator = "\n\n"
+                return
+
+            chunk_size = settings.OCR_TEXT_STREAM_CHUNK
+            offset = 0
+            while True:
+                chunk = await crud.get_image_text_slice(db, image_text.image_id, offset, chunk_size)
+                if chunk:
+                    yield chunk
+                if not chunk or len(chunk) < chunk_size:
+                    break
+                offset += chunk_size
+        finally:
+            await db.close()
+
+    @staticmethod
+    def _join_pages(pages) -> str:
+        """Склеивает тексты готовых страниц."""
+        return "\n\n".join(page.text for page in pages if page.status == "completed" and page.text)
+
+    @staticmethod
+    def make_etag(image_text) -> str:
+        """Строит сильный ETag по версии записи: время изменения, статус и прогресс страниц."""
+        changed_at = image_text.updated_at or image_text.created_at
+        version = (
+            f"{image_text.image_id}:{image_text.status}:{image_text.pages_done}:"
+            f"{changed_at.isoformat() if changed_at else ''}"
+        )
+        return f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: str, etag: str) -> bool:
+        """Сравнивает If-None-Match с ETag (слабое сравнение, как требует RFC 9110)."""
+        if if_none_match.strip() == "*":
+            return True
+        candidates = (value.strip() for value in if_none_match.split(","))
+        return etag in (value[2:] if value.startswith("W/") else value for value in candidates)
+
+    @staticmethod
+    async def _get_owned(db: AsyncSession, image_id: int, user_id: int, with_text: bool = True):
+        """Получает запись и проверяет владельца."""
+        image_text = await crud.get_image_text(db, image_id, with_text=with_text)
         if not image_text:
             logger.warning(f"Запись не найдена - image_id: {image_id}")
             raise HTTPException(404, "Text not found for this image")
@@ -23,11 +194,4 @@ class TextService:
         if image_text.user_id != user_id:
             logger.warning(f"Попытка доступа к чужому ресурсу - image_id: {image_id}")
             raise HTTPException(403, "Access denied")
-
-        return {
-            "image_id": image_id,
-            "text": image_text.text,
-            "status": image_text.status,
-            "error_message": image_text.error_message,
-            "created_at": image_text.created_at.isoformat() if image_text.created_at else None,
-        }
\ No newline at end of file
+        return image_text
@@ -1,8 +1,12 @@
 """Сервис для загрузки файлов."""
 
+import asyncio
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.file_storage import FileStorage
+from app import crud
+from app.config import settings
+from app.core import documents
+from app.core.file_storage import FileStorage, FileTooLargeError
 from app.core.file_utils import is_image_file
 import logging
 
@@ -19,19 +23,55 @@ class UploadService:
 
         if not is_image_file(file.filename):
             logger.warning(f"Неверный формат файла: {file.filename}")
-            raise HTTPException(400, "Only jpg, jpeg, png files allowed")
+            raise HTTPException(400, "Only jpg, jpeg, png, tif, tiff, pdf files allowed")
 
         try:
-            contents = await file.read()
-            image_id = await file_storage.save_file(contents, file.filename, user_id)
+            saved = await file_storage.save_stream(
+                file, file.filename, user_id, max_size=settings.UPLOAD_MAX_SIZE
+            )
+        except FileTooLargeError:
+            logger.warning(f"Превышен размер файла: {file.filename}")
+            raise HTTPException(413, f"File too large, limit is {settings.UPLOAD_MAX_SIZE} bytes")
+        except Exception as e:
+            logger.error(f"Ошибка загрузки: {e}")
+            raise HTTPException(500, f"Upload failed: {str(e)}")
+
+        try:
+            mime, width, height, page_count = await asyncio.to_thread(
+                documents.probe, saved["tmp_path"], file.filename
+            )
+            # Ссылка на блоб и файл на диске появляются под блокировкой строки блоба,
+            # а create_image фиксирует счетчик ссылок и метаданные одной транзакцией.
+            storage_key = await crud.acquire_blob(db, saved["content_hash"], saved["storage_key"], saved["size"])
+            await asyncio.to_thread(file_storage.commit_blob, saved["tmp_path"], storage_key)
+            await crud.create_image(
+                db,
+                image_id=saved["image_id"],
+                user_id=user_id,
+                storage_key=storage_key,
+                filename=file.filename,
+                size=saved["size"],
+                content_hash=saved["content_hash"],
+                mime=mime,
+                width=width,
+                height=height,
+                page_count=page_count,
+            )
 
-            logger.info(f"Файл обработан - image_id: {image_id}, user_id: {user_id}")
+            logger.info(f"Файл обработан - image_id: {saved['image_id']}, user_id: {user_id}")
             return {
                 "message": "File uploaded successfully",
-                "image_id": image_id,
+                "image_id": saved["image_id"],
                 "filename": file.filename,
+                "size": saved["size"],
+                "mime": mime,
+                "width": width,
+                "height": height,
+                "page_count": page_count,
                 "next_step": "Use /doc_analyse to start OCR processing",
             }
         except Exception as e:
+            await db.rollback()
+            file_storage.discard(saved["tmp_path"])
             logger.error(f"Ошибка загрузки: {e}")
             raise HTTPException(500, f"Upload failed: {str(e)}")
\ No newline at end of file
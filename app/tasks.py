@@ -1,45 +1,118 @@
 """Задачи Celery для обработки OCR."""
 
+from celery import group
+from celery.signals import worker_process_init, worker_process_shutdown
 from app.celery_app import celery_app
 from app.database import get_sync_db
 from app import crud, schemas
 from app.core.business_logic import OCRProcessor
+from app.core import documents, ocr_engines, routing
+from app.core.file_storage import FileStorage
+from app.core.ocr_cache import OCRResultCache
+from app.core.status_writer import StatusWriteBuffer
+from app.config import settings
+from contextlib import contextmanager, ExitStack
+from datetime import datetime, timezone
+from typing import Dict, Any
 import logging
-import io
+import json
 
 logger = logging.getLogger(__name__)
+file_storage = FileStorage()
+status_buffer = StatusWriteBuffer(
+    get_sync_db, settings.OCR_STATUS_FLUSH_INTERVAL_MS / 1000, settings.OCR_STATUS_FLUSH_MAX_ROWS
+)
 
 
-@celery_app.task(bind=True, name="app.tasks.process_ocr_task", time_limit=60, soft_time_limit=50)
-def process_ocr_task(self, image_id: int, image_data: bytes, filename: str, user_id: int = None):
-    """Задача OCR обработки изображения."""
+@worker_process_init.connect
+def init_ocr_engine(**kwargs):
+    """Загружает движок OCR один раз при старте процесса воркера."""
+    ocr_engines.init_engine()
+    if settings.OCR_STATUS_WRITE_BEHIND:
+        status_buffer.start()
+
+
+@worker_process_shutdown.connect
+def close_ocr_engine(**kwargs):
+    """Освобождает хендлы tesseract при остановке процесса воркера."""
+    status_buffer.stop()
+    ocr_engines.reset_engine()
+
+
+def _write_status(db, image_id: int, update_data: schemas.ImageTextUpdate, durable: bool):
+    """Записывает статус задачи сразу или через буфер write-behind.
+
+    Конечные статусы пишутся с durable=True: задача ждет их фиксации в БД.
+    """
+    if settings.OCR_STATUS_WRITE_BEHIND:
+        status_buffer.write(image_id, update_data, durable=durable)
+        return
+    crud.update_image_text_sync(db, image_id, update_data)
+    db.commit()
+
+
+@celery_app.task(bind=True, name="app.tasks.process_ocr_task", time_limit=60, soft_time_limit=50, ignore_result=True)
+def process_ocr_task(self, image_ref: Dict[str, Any], *legacy_args):
+    """Задача OCR обработки изображения.
+
+    Вместо содержимого файла задача получает ссылку на него в хранилище:
+    user_id, image_id, storage_key, filename, size и checksum (SHA-256).
+    Сообщения старого формата (image_id, image_data, filename, user_id),
+    оставшиеся в брокере после обновления, преобразуются в ссылку.
+    """
+    if legacy_args:
+        image_ref = _legacy_image_ref(image_ref, *legacy_args)
+    image_id = image_ref["image_id"]
+    user_id = image_ref.get("user_id")
+    content_hash = image_ref.get("checksum")
     db = get_sync_db()
 
     try:
         logger.info(f"Начало обработки OCR - image_id: {image_id}, user_id: {user_id}")
 
-        crud.update_image_text_sync(db, image_id, schemas.ImageTextUpdate(status="processing"))
-        db.commit()
+        _write_status(
+            db, image_id, schemas.ImageTextUpdate(
+                status="processing", task_id=self.request.id, started_at=datetime.now(timezone.utc)
+            ),
+            durable=False,
+        )
 
+        error_message = None
+        page_count = 1
         try:
-            image_bytes_io = io.BytesIO(image_data)
-            extracted_text = OCRProcessor.process_image(image_bytes_io, filename, user_id)
+            with open_image(image_ref) as image_buffer:
+                page_count = documents.count_pages(image_buffer, image_ref["filename"])
+                if page_count == 1:
+                    extracted_text = OCRProcessor.process_image(
+                        image_buffer, image_ref["filename"], user_id, profile=image_ref.get("profile")
+                    )
             status = "completed"
         except Exception as ocr_error:
             logger.error(f"Ошибка OCR: {ocr_error}", exc_info=True)
             extracted_text = None
+            error_message = str(ocr_error)[:500]
             status = "failed"
 
-        crud.update_image_text_sync(
+        if status == "completed" and page_count > 1:
+            if settings.OCR_STATUS_WRITE_BEHIND:
+                status_buffer.barrier()
+            return _start_document(db, image_ref, page_count, self.request.id)
+
+        _write_status(
             db,
             image_id,
             schemas.ImageTextUpdate(
                 text=extracted_text,
                 status=status,
-                error_message=str(ocr_error) if status == "failed" else None,
+                error_message=error_message,
+                task_result={"text_length": len(extracted_text) if extracted_text else 0},
+                finished_at=datetime.now(timezone.utc),
             ),
+            durable=True,
         )
-        db.commit()
+
+        if status == "completed" and content_hash and settings.OCR_CACHE_ENABLED:
+            _save_to_cache(db, content_hash, extracted_text, image_ref.get("profile"))
 
         return {
             "image_id": image_id,
@@ -51,12 +124,226 @@ def process_ocr_task(self, image_id: int, image_data: bytes, filename: str, user
     except Exception as e:
         logger.error(f"Критическая ошибка OCR: {e}", exc_info=True)
         try:
-            crud.update_image_text_sync(
-                db, image_id, schemas.ImageTextUpdate(status="failed", error_message=str(e)[:500])
+            db.rollback()
+            _write_status(
+                db, image_id, schemas.ImageTextUpdate(
+                    status="failed", error_message=str(e)[:500], finished_at=datetime.now(timezone.utc)
+                ),
+                durable=True,
             )
-            db.commit()
         except:
             db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+@celery_app.task(bind=True, name="app.tasks.process_page_task", time_limit=60, soft_time_limit=50, ignore_result=True)
+def process_page_task(self, image_ref: Dict[str, Any], page_no: int, run_id: str = None):
+    """Задача OCR одной страницы многостраничного документа.
+
+    Результат страницы сохраняется сразу, поэтому /get_text может отдавать
+    частичный текст. Задача, завершившая последнюю страницу, собирает документ.
+    run_id — ID задачи, разбившей документ: результаты страниц устаревшего
+    запуска отбрасываются.
+    """
+    image_id = image_ref["image_id"]
+    db = get_sync_db()
+
+    try:
+        error_message = None
+        try:
+            with open_image(image_ref, verify=False) as image_buffer:
+                text = OCRProcessor.process_image(
+                    image_buffer, image_ref["filename"], image_ref.get("user_id"),
+                    profile=image_ref.get("profile"), page_no=page_no,
+                )
+            status = "completed"
+        except Exception as ocr_error:
+            logger.error(f"Ошибка OCR страницы {page_no} - image_id: {image_id}: {ocr_error}", exc_info=True)
+            text = None
+            error_message = str(ocr_error)[:500]
+            status = "failed"
+
+        progress = crud.increment_pages_done_sync(db, image_id, run_id)
+        if progress is None:
+            db.rollback()
+            logger.info(f"Страница {page_no} устаревшего запуска пропущена - image_id: {image_id}")
+            return {"image_id": image_id, "page_no": page_no, "status": "skipped"}
+        crud.save_page_sync(db, image_id, page_no, text, status, error_message)
+        db.commit()
+
+        if progress[0] >= progress[1]:
+            _finish_document(db, image_ref)
+
+        return {"image_id": image_id, "page_no": page_no, "status": status}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.page_task_failed", ignore_result=True)
+def page_task_failed(image_ref: Dict[str, Any], page_no: int, run_id: str):
+    """Учитывает страницу, задача которой упала, превысила time_limit или потеряла воркер.
+
+    Вызывается брокером как errback задачи страницы. Страница считается
+    неудачной, только если задача не успела сохранить ее результат, поэтому
+    документ не зависает в статусе processing и страница не учитывается дважды.
+    """
+    image_id = image_ref["image_id"]
+    db = get_sync_db()
+
+    try:
+        progress = crud.increment_pages_done_sync(db, image_id, run_id)
+        if progress is None or not crud.save_failed_page_sync(db, image_id, page_no, "Page task failed"):
+            db.rollback()
+            return
+        db.commit()
+        logger.warning(f"Задача страницы {page_no} не завершилась - image_id: {image_id}")
+
+        if progress[0] >= progress[1]:
+            _finish_document(db, image_ref)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _legacy_image_ref(image_id: int, image_data, filename: str, user_id: int = None) -> Dict[str, Any]:
+    """Строит ссылку на файл для задачи старого формата с содержимым изображения в аргументах.
+
+    Файл такой задачи лежит в старой раскладке UPLOAD_DIR/<user_id>/<image_id><ext>;
+    если его уже перенесла миграция хранилища, open_image возьмет ключ из images.
+    Содержимое из сообщения не используется, поэтому размер и контрольная сумма не проверяются.
+    """
+    logger.info(f"Задача старого формата - image_id: {image_id}, user_id: {user_id}")
+    return {
+        "image_id": image_id,
+        "user_id": user_id,
+        "storage_key": f"{user_id}/{filename}",
+        "filename": filename,
+    }
+
+
+def _start_document(db, image_ref: Dict[str, Any], page_count: int, run_id: str) -> Dict[str, Any]:
+    """Запускает постраничную обработку документа отдельными задачами.
+
+    Каждой задаче страницы назначается errback page_task_failed, чтобы
+    страница была учтена, даже если воркер убит по time_limit.
+    """
+    image_id = image_ref["image_id"]
+    if not crud.start_document_sync(db, image_id, page_count, run_id):
+        db.rollback()
+        logger.info(f"Документ поставлен в очередь заново, запуск {run_id} пропущен - image_id: {image_id}")
+        return {"image_id": image_id, "user_id": image_ref.get("user_id"), "status": "skipped"}
+    db.commit()
+
+    options = routing.route_page({**image_ref, "page_count": page_count})
+    group(
+        process_page_task.signature(
+            (image_ref, page_no, run_id),
+            link_error=page_task_failed.si(image_ref, page_no, run_id),
+            **options,
+        )
+        for page_no in range(page_count)
+    ).apply_async()
+    logger.info(f"Документ разбит на страницы - image_id: {image_id}, страниц: {page_count}, "
+                f"очередь: {options['queue']}")
+    return {
+        "image_id": image_id,
+        "user_id": image_ref.get("user_id"),
+        "status": "processing",
+        "page_count": page_count,
+    }
+
+
+def _finish_document(db, image_ref: Dict[str, Any]):
+    """Собирает текст документа из результатов страниц и завершает запись."""
+    image_id = image_ref["image_id"]
+    pages = crud.get_image_pages_sync(db, image_id)
+    texts = [page.text for page in pages if page.status == "completed" and page.text]
+    failed = [str(page.page_no + 1) for page in pages if page.status == "failed"]
+
+    text = "\n\n".join(texts)
+    status = "failed" if failed and len(failed) == len(pages) else "completed"
+    crud.update_image_text_sync(
+        db,
+        image_id,
+        schemas.ImageTextUpdate(
+            text=text if status == "completed" else None,
+            status=status,
+            error_message=f"Failed pages: {', '.join(failed)}"[:500] if failed else None,
+            task_result={"page_count": len(pages), "failed_pages": len(failed), "text_length": len(text)},
+            finished_at=datetime.now(timezone.utc),
+        ),
+    )
+    db.commit()
+    logger.info(f"Документ обработан - image_id: {image_id}, страниц: {len(pages)}, с ошибками: {len(failed)}")
+
+    if not failed and image_ref.get("checksum") and settings.OCR_CACHE_ENABLED:
+        _save_to_cache(db, image_ref["checksum"], text, image_ref.get("profile"))
+
+
+@contextmanager
+def open_image(image_ref: Dict[str, Any], verify: bool = True):
+    """Отображает изображение из хранилища в память и проверяет размер и контрольную сумму.
+
+    Задачи страниц передают verify=False: документ уже проверен при разбиении на страницы.
+    Если файл перенесен миграцией хранилища после постановки задачи, актуальный
+    ключ берется из images.
+    """
+    with ExitStack() as stack:
+        try:
+            image_buffer = stack.enter_context(file_storage.open_buffer(image_ref["storage_key"]))
+        except FileNotFoundError:
+            storage_key = _current_storage_key(image_ref["image_id"])
+            if storage_key is None or storage_key == image_ref["storage_key"]:
+                raise
+            logger.info(f"Файл перенесен: {image_ref['storage_key']} -> {storage_key}")
+            image_buffer = stack.enter_context(file_storage.open_buffer(storage_key))
+
+        if not verify:
+            yield image_buffer
+            return
+
+        expected_size = image_ref.get("size")
+        if expected_size is not None and len(image_buffer) != expected_size:
+            raise ValueError(
+                f"Size mismatch for {image_ref['storage_key']}: {len(image_buffer)} != {expected_size}"
+            )
+
+        checksum = image_ref.get("checksum")
+        if checksum and OCRResultCache.hash_content(image_buffer) != checksum:
+            raise ValueError(f"Checksum mismatch for {image_ref['storage_key']}")
+
+        yield image_buffer
+
+
+def _current_storage_key(image_id: int):
+    """Читает текущий ключ файла изображения из images."""
+    db = get_sync_db()
+    try:
+        return crud.get_image_storage_key_sync(db, image_id)
+    finally:
+        db.close()
+
+
+def _save_to_cache(db, content_hash: str, text: str, profile: str = None):
+    """Сохраняет результат OCR в постоянный кэш; ошибки кэша не влияют на задачу."""
+    options = OCRProcessor.get_options(profile)
+    try:
+        crud.save_ocr_cache_sync(
+            db,
+            OCRResultCache.make_key(content_hash, settings.TESSERACT_LANG, options),
+            content_hash,
+            settings.TESSERACT_LANG,
+            json.dumps(options, sort_keys=True),
+            text,
+        )
+        db.commit()
+    except Exception as e:
+        logger.warning(f"Не удалось сохранить результат в кэш OCR: {e}")
+        db.rollback()
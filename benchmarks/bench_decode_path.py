@@ -0,0 +1,128 @@
+"""Сравнение старого пути декодирования (временные файлы) и нового (в памяти).
+
+Каждый режим запускается в отдельном процессе, чтобы пиковый RSS не смешивался:
+
+    python benchmarks/bench_decode_path.py --images ./samples --iterations 3
+    python benchmarks/bench_decode_path.py --no-ocr   # только декодирование, без tesseract
+
+Без --images используются синтетические сканы размером 2480x3508 (A4, 300 DPI).
+"""
+
+import argparse
+import io
+import json
+import mmap
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image, ImageDraw
+import pytesseract
+from app.config import settings
+from app.core.ocr_engines import SubprocessEngine
+
+MODES = ("legacy", "memory")
+
+
+def prepare_images(directory, count: int, work_dir: str):
+    """Возвращает пути к изображениям, при необходимости генерируя синтетические."""
+    if directory:
+        return sorted(str(p) for p in Path(directory).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+
+    paths = []
+    for i in range(count):
+        image = Image.new("RGB", (2480, 3508), color="white")
+        draw = ImageDraw.Draw(image)
+        for line in range(40):
+            draw.text((150, 150 + line * 80), f"Document {i} line {line}: lorem ipsum 0123456789", fill="black")
+        path = os.path.join(work_dir, f"synthetic_{i}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def legacy_path(path: str, ocr: bool):
+    """Повторяет прежний OCRProcessor: BytesIO -> read -> NamedTemporaryFile -> Image.open."""
+    with open(path, "rb") as f:
+        image_data = io.BytesIO(f.read()).read()
+    with tempfile.NamedTemporaryFile(suffix=Path(path).suffix, delete=False) as tmp_file:
+        tmp_file.write(image_data)
+        tmp_path = tmp_file.name
+    try:
+        image = Image.open(tmp_path)
+        if ocr:
+            pytesseract.image_to_string(image, lang=settings.TESSERACT_LANG)
+        else:
+            image.load()
+    finally:
+        os.unlink(tmp_path)
+
+
+def memory_path(path: str, ocr: bool):
+    """Новый путь: mmap файла -> Image.open из буфера -> tesseract через stdin."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with Image.open(mm) as image:
+            if ocr:
+                SubprocessEngine().recognize(image, lang=settings.TESSERACT_LANG)
+            else:
+                image.load()
+
+
+def run_mode(mode: str, paths, iterations: int, ocr: bool) -> dict:
+    """Прогоняет изображения через выбранный путь и собирает метрики."""
+    func = legacy_path if mode == "legacy" else memory_path
+    latencies = []
+    for _ in range(iterations):
+        for path in paths:
+            t0 = time.perf_counter()
+            func(path, ocr)
+            latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    return {
+        "mode": mode,
+        "images": len(latencies),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Директория с изображениями")
+    parser.add_argument("--count", type=int, default=5, help="Число синтетических изображений")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--no-ocr", action="store_true", help="Измерять только декодирование")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--paths", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        result = run_mode(args.mode, json.loads(args.paths), args.iterations, not args.no_ocr)
+        print(json.dumps(result))
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = prepare_images(args.images, args.count, work_dir)
+        print(f"{'mode':<10}{'images':>8}{'p50 ms':>10}{'p99 ms':>10}{'peak RSS MB':>14}")
+        for mode in MODES:
+            cmd = [sys.executable, __file__, "--mode", mode, "--paths", json.dumps(paths),
+                   "--iterations", str(args.iterations)]
+            if args.no_ocr:
+                cmd.append("--no-ocr")
+            output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{result['mode']:<10}{result['images']:>8}{result['p50_ms']:>10.1f}"
+                f"{result['p99_ms']:>10.1f}{result['peak_rss_mb']:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
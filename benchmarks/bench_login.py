@@ -0,0 +1,86 @@
+"""Пропускная способность входа и задержка цикла событий при хешировании паролей.
+
+Сравнивает прежний синхронный вызов bcrypt в обработчике и PasswordHasher:
+
+    python benchmarks/bench_login.py --logins 50 --concurrency 20 --rounds 12
+
+Параллельно с входами работает «пинг» цикла событий: его максимальная
+задержка показывает, насколько остальные запросы воркера ждали bcrypt.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bcrypt
+from app.core.security import PasswordHasher, PasswordHasherBusy, verify_password
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Возвращает максимальную задержку пробуждения корутины за время прогона."""
+    worst = 0.0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - t0 - interval)
+    return worst
+
+
+async def run(mode: str, hashed: str, logins: int, concurrency: int, workers: int, queue_size: int) -> dict:
+    """Выполняет logins проверок пароля с заданной параллельностью."""
+    hasher = PasswordHasher(workers, queue_size)
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        async with semaphore:
+            if mode == "sync":
+                verify_password("password", hashed)
+                return
+            try:
+                await hasher.verify("password", hashed)
+            except PasswordHasherBusy:
+                rejected += 1
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    lag = await lag_task
+    hasher.shutdown()
+    return {
+        "mode": mode,
+        "logins_per_s": (logins - rejected) / elapsed,
+        "rejected": rejected,
+        "max_loop_lag_ms": lag * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=32)
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(b"password", bcrypt.gensalt(rounds=args.rounds)).decode()
+    print(f"{'mode':<10}{'logins/s':>10}{'rejected':>10}{'max loop lag ms':>18}")
+    for mode in ("sync", "executor"):
+        result = asyncio.run(run(mode, hashed, args.logins, args.concurrency, args.workers, args.queue_size))
+        print(
+            f"{result['mode']:<10}{result['logins_per_s']:>10.1f}{result['rejected']:>10}"
+            f"{result['max_loop_lag_ms']:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
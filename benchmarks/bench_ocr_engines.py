@@ -0,0 +1,101 @@
+"""Сравнение движков OCR: изображений в секунду и задержки p50/p99.
+
+Запуск в контейнере воркера (нужны tesseract и, для второго движка, tesserocr):
+
+    python benchmarks/bench_ocr_engines.py --images ./samples --iterations 3
+
+Без --images используется набор синтетических изображений с текстом.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image, ImageDraw
+from app.config import settings
+from app.core.ocr_engines import SubprocessEngine, TesserocrEngine
+
+
+def synthetic_images(count: int):
+    """Генерирует изображения с несколькими строками текста."""
+    images = []
+    for i in range(count):
+        image = Image.new("L", (1240, 400), color=255)
+        draw = ImageDraw.Draw(image)
+        for line in range(6):
+            draw.text((40, 40 + line * 55), f"Invoice {i:04d} line {line}: total 1234.56 RUB", fill=0)
+        images.append(image)
+    return images
+
+
+def load_images(directory: str):
+    """Загружает изображения из директории."""
+    paths = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+    images = []
+    for path in paths:
+        with Image.open(path) as image:
+            image.load()
+            images.append(image)
+    return images
+
+
+def percentile(values, q: float) -> float:
+    """Возвращает перцентиль q (0..100)."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(engine, images, iterations: int, lang: str):
+    """Прогоняет все изображения через движок и собирает задержки."""
+    engine.recognize(images[0], lang=lang)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for image in images:
+            t0 = time.perf_counter()
+            engine.recognize(image, lang=lang)
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "images_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Директория с изображениями")
+    parser.add_argument("--count", type=int, default=20, help="Число синтетических изображений")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--lang", default=settings.TESSERACT_LANG)
+    args = parser.parse_args()
+
+    images = load_images(args.images) if args.images else synthetic_images(args.count)
+    engines = [SubprocessEngine()]
+    try:
+        engines.append(TesserocrEngine())
+    except RuntimeError as e:
+        print(f"tesserocr пропущен: {e}")
+
+    print(f"{'engine':<12}{'img/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for engine in engines:
+        result = run(engine, images, args.iterations, args.lang)
+        print(
+            f"{engine.name:<12}{result['images_per_sec']:>10.2f}{result['p50_ms']:>10.1f}"
+            f"{result['p99_ms']:>10.1f}{result['mean_ms']:>10.1f}"
+        )
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
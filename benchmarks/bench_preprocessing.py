@@ -0,0 +1,101 @@
+"""Скорость и точность OCR для профилей предобработки.
+
+Корпус — директория с изображениями и эталонным текстом рядом (scan1.jpg + scan1.txt):
+
+    python benchmarks/bench_preprocessing.py --corpus ./corpus --profiles none,scan,photo,fast
+
+Без --corpus генерируются синтетические «фото» 4000x3000 с известным текстом.
+Точность — доля совпадающих символов (difflib.SequenceMatcher) с эталоном.
+"""
+
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+from app.config import settings
+from app.core.ocr_engines import get_engine
+from app.core.preprocessing import resolve_profile, preprocess
+
+
+def synthetic_corpus(count: int):
+    """Генерирует цветные изображения с крупным текстом, тенью и шумом."""
+    rng = random.Random(42)
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 72)
+    except OSError:
+        font = ImageFont.load_default()
+
+    corpus = []
+    for i in range(count):
+        lines = [f"Invoice {rng.randint(1000, 9999)} total {rng.randint(10, 999)}.{rng.randint(10, 99)}"
+                 for _ in range(8)]
+        image = Image.new("RGB", (4000, 3000), color=(235, 225, 205))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([0, 0, 1200, 3000], fill=(200, 190, 170))
+        for n, line in enumerate(lines):
+            draw.text((600, 400 + n * 250), line, fill=(30, 30, 40), font=font)
+        corpus.append((image.filter(ImageFilter.GaussianBlur(1)), "\n".join(lines)))
+    return corpus
+
+
+def load_corpus(directory: str):
+    """Загружает пары изображение + эталонный текст."""
+    corpus = []
+    for path in sorted(Path(directory).iterdir()):
+        truth = path.with_suffix(".txt")
+        if path.suffix.lower() in {".jpg", ".jpeg", ".png"} and truth.exists():
+            with Image.open(path) as image:
+                image.load()
+                corpus.append((image, truth.read_text(encoding="utf-8")))
+    return corpus
+
+
+def accuracy(text: str, truth: str) -> float:
+    """Доля совпадающих символов без учета пробельных различий."""
+    normalize = lambda value: " ".join(value.split())
+    return difflib.SequenceMatcher(None, normalize(text), normalize(truth)).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Директория с изображениями и .txt эталонами")
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--profiles", default="none,scan,photo,fast")
+    parser.add_argument("--lang", default=settings.TESSERACT_LANG)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.count)
+    engine = get_engine()
+
+    print(f"engine: {engine.name}, images: {len(corpus)}")
+    print(f"{'profile':<10}{'prep ms':>10}{'ocr ms':>10}{'total ms':>10}{'accuracy':>10}")
+    for profile in args.profiles.split(","):
+        options = resolve_profile(profile)
+        prep_time = ocr_time = 0.0
+        scores = []
+        for image, truth in corpus:
+            t0 = time.perf_counter()
+            prepared = preprocess(image, options) if options else image
+            t1 = time.perf_counter()
+            text = engine.recognize(prepared, lang=args.lang)
+            t2 = time.perf_counter()
+            prep_time += t1 - t0
+            ocr_time += t2 - t1
+            scores.append(accuracy(text, truth))
+
+        n = len(corpus)
+        print(
+            f"{profile:<10}{prep_time / n * 1000:>10.1f}{ocr_time / n * 1000:>10.1f}"
+            f"{(prep_time + ocr_time) / n * 1000:>10.1f}{sum(scores) / n:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
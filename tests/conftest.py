@@ -13,4 +13,15 @@ def mock_file_system():
     """Мокаем файловые операции для всех тестов."""
     with patch('pathlib.Path.mkdir'), \
          patch('app.core.file_storage.FileStorage._ensure_upload_dir'):
-        yield
\ No newline at end of file
+        yield
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Очищаем кэши пользователей и изображений, чтобы тесты не влияли друг на друга."""
+    from app.core.user_cache import user_cache
+    from app.core.image_cache import image_cache
+    user_cache.clear()
+    image_cache.clear()
+    yield
+    user_cache.clear()
+    image_cache.clear()
@@ -0,0 +1,76 @@
+"""Тесты для сервиса запуска OCR анализа."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+with patch('app.core.file_storage.FileStorage._ensure_upload_dir'):
+    from app.services.analyse_service import AnalyseService
+from app.core import routing
+
+
+def _image(image_id: int, user_id: int = 1, width: int = 1000, height: int = 1000) -> Mock:
+    """Создает мок метаданных изображения."""
+    return Mock(
+        image_id=image_id,
+        user_id=user_id,
+        storage_key=f"{user_id}/{image_id}.png",
+        size=100,
+        content_hash=f"hash{image_id}",
+        width=width,
+        height=height,
+        page_count=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_analyse_batch():
+    """Тест пакетного запуска: проверка владения, upsert и публикация группы задач."""
+    # Setup
+    mock_db = AsyncMock()
+    rows = [(_image(1), None), (_image(2, width=8000, height=5000), 1), (_image(3, user_id=2), None), (_image(4), None)]
+
+    with patch('app.services.analyse_service.crud.get_images_for_analyse', new_callable=AsyncMock) as mock_get, \
+         patch('app.services.analyse_service.crud.upsert_image_texts', new_callable=AsyncMock) as mock_upsert, \
+         patch('app.services.analyse_service.ocr_cache.get_many', new_callable=AsyncMock) as mock_cache, \
+         patch('app.services.analyse_service.OCRResultCache.make_key', side_effect=lambda h, *a: h), \
+         patch('app.services.analyse_service.group') as mock_group:
+        mock_get.return_value = rows
+        mock_cache.return_value = {"hash4": "cached text"}
+
+        # Execute
+        result = await AnalyseService().process_analyse_batch([1, 2, 3, 4, 5, 1], 1, mock_db)
+
+    # Assert
+    statuses = {item["image_id"]: item["status"] for item in result["items"]}
+    assert statuses == {1: "processing", 2: "processing", 3: "forbidden", 4: "completed", 5: "not_found"}
+    assert result["submitted"] == 2
+    assert result["cached"] == 1
+
+    mock_get.assert_called_once_with(mock_db, [1, 2, 3, 4, 5])
+    upserted = mock_upsert.call_args[0][1]
+    assert {row["image_id"]: row["status"] for row in upserted} == {1: "pending", 2: "pending", 4: "completed"}
+    assert all(row["batch_id"] == result["batch_id"] for row in upserted)
+    task_ids = {item["image_id"]: item["task_id"] for item in result["items"]}
+    assert {row["image_id"]: row["task_id"] for row in upserted} == {1: task_ids[1], 2: task_ids[2], 4: None}
+
+    signatures = mock_group.call_args[0][0]
+    assert len(signatures) == 2
+    assert [sig.options["queue"] for sig in signatures] == ["ocr.bulk", "ocr.heavy"]
+    assert signatures[1].options["time_limit"] > signatures[0].options["time_limit"]
+    mock_group.return_value.apply_async.assert_called_once()
+
+
+def test_image_ref_carries_page_count():
+    """Тест: ссылка на документ без размеров содержит число страниц для оценки стоимости страницы."""
+    image = _image(1, width=None, height=None)
+    image.page_count = 40
+    image.size = 20_000_000
+
+    image_ref = AnalyseService._build_image_ref(image)
+
+    assert image_ref["page_count"] == 40
+    assert routing.route_page(image_ref)["queue"] == "ocr.bulk"
@@ -3,42 +3,45 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock, ANY
 from PIL import Image
+import io
+import mmap
+import tempfile
+from datetime import datetime, timezone
 import sys
 import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from app.config import settings
 from app.core.business_logic import OCRProcessor, TaskManager
+from app.core.documents import BufferReader
+from app.core.ocr_engines import create_engine, SubprocessEngine, TesserocrEngine
 
 
 class TestOCRProcessor:
     """Тесты для класса OCRProcessor."""
 
-    @patch('app.core.business_logic.tempfile.NamedTemporaryFile')
-    @patch('app.core.business_logic.Image.open')
-    @patch('app.core.business_logic.pytesseract.image_to_string')
-    @patch('app.core.business_logic.os.unlink')
+    @pytest.fixture(autouse=True)
+    def no_tiling(self):
+        """Изображения-заглушки не имеют размеров: распознаем их целиком."""
+        with patch('app.core.business_logic.tiling.should_tile', return_value=False):
+            yield
+
+    @patch('app.core.documents.Image.open')
+    @patch('app.core.business_logic.get_engine')
     @patch('app.core.business_logic.settings')
-    def test_process_image_success(self, mock_settings, mock_unlink, mock_image_to_string,
-                                   mock_image_open, mock_tempfile):
+    def test_process_image_success(self, mock_settings, mock_get_engine, mock_image_open):
         """Тест успешной обработки изображения."""
         # Setup
         mock_settings.TESSERACT_LANG = 'rus'
 
-        # Создаем мок для временного файла
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/test.jpg'
-        mock_tempfile.return_value.__enter__.return_value = mock_temp
-
-        # Создаем мок для изображения
         mock_image = MagicMock(spec=Image.Image)
-
-        # Настраиваем мок для open, чтобы он возвращал контекстный менеджер с изображением
         mock_context_manager = MagicMock()
         mock_context_manager.__enter__.return_value = mock_image
         mock_image_open.return_value = mock_context_manager
 
-        mock_image_to_string.return_value = "Extracted text"
+        mock_engine = mock_get_engine.return_value
+        mock_engine.recognize.return_value = "Extracted text\n"
 
         image_data = b"fake_image_data"
 
@@ -47,229 +50,203 @@ class TestOCRProcessor:
 
         # Assert
         assert result == "Extracted text"
-        mock_temp.write.assert_called_once_with(image_data)
-        mock_image_open.assert_called_once_with('/tmp/test.jpg')
+        assert isinstance(mock_image_open.call_args[0][0], BufferReader)
 
-        # Проверяем, что image_to_string был вызван с любым изображением и правильным lang
-        mock_image_to_string.assert_called_once()
-        args, kwargs = mock_image_to_string.call_args
+        mock_engine.recognize.assert_called_once()
+        args, kwargs = mock_engine.recognize.call_args
+        assert args[0] is mock_image
         assert kwargs.get('lang') == 'rus'
-        # Не проверяем конкретный объект изображения, так как это мок
-        assert args[0] is not None
 
-        mock_unlink.assert_called_once_with('/tmp/test.jpg')
-
-    @patch('app.core.business_logic.tempfile.NamedTemporaryFile')
-    @patch('app.core.business_logic.Image.open')
-    @patch('app.core.business_logic.pytesseract.image_to_string')
-    @patch('app.core.business_logic.os.unlink')
+    @patch('app.core.documents.Image.open')
+    @patch('app.core.business_logic.get_engine')
     @patch('app.core.business_logic.settings')
-    def test_process_image_with_file_object(self, mock_settings, mock_unlink, mock_image_to_string,
-                                           mock_image_open, mock_tempfile):
-        """Тест обработки файлового объекта."""
+    def test_process_image_with_file_object(self, mock_settings, mock_get_engine, mock_image_open):
+        """Тест обработки файлового объекта без чтения его в память."""
         # Setup
         mock_settings.TESSERACT_LANG = 'rus'
 
         mock_file = Mock()
-        mock_file.read.return_value = b"file content"
-
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/test.jpg'
-        mock_tempfile.return_value.__enter__.return_value = mock_temp
-
-        mock_image = MagicMock(spec=Image.Image)
-        mock_context_manager = MagicMock()
-        mock_context_manager.__enter__.return_value = mock_image
-        mock_image_open.return_value = mock_context_manager
-
-        mock_image_to_string.return_value = "Extracted text"
+        mock_image_open.return_value = MagicMock()
+        mock_get_engine.return_value.recognize.return_value = "Extracted text"
 
         # Execute
         result = OCRProcessor.process_image(mock_file, "test.jpg")
 
         # Assert
         assert result == "Extracted text"
-        mock_file.read.assert_called_once()
-
-        # Проверяем, что image_to_string был вызван с правильными параметрами
-        mock_image_to_string.assert_called_once()
-        args, kwargs = mock_image_to_string.call_args
-        assert kwargs.get('lang') == 'rus'
-        assert args[0] is not None
+        mock_file.read.assert_not_called()
+        mock_image_open.assert_called_once_with(mock_file)
 
-    @patch('app.core.business_logic.tempfile.NamedTemporaryFile')
-    @patch('app.core.business_logic.Image.open')
-    @patch('app.core.business_logic.pytesseract.image_to_string')
-    @patch('app.core.business_logic.os.unlink')
+    @patch('app.core.documents.Image.open')
+    @patch('app.core.business_logic.get_engine')
     @patch('app.core.business_logic.settings')
-    def test_process_image_error(self, mock_settings, mock_unlink, mock_image_to_string,
-                                mock_image_open, mock_tempfile):
+    def test_process_image_error(self, mock_settings, mock_get_engine, mock_image_open):
         """Тест ошибки при обработке изображения."""
         # Setup
         mock_settings.TESSERACT_LANG = 'rus'
-
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/test.jpg'
-        mock_tempfile.return_value.__enter__.return_value = mock_temp
-
-        # Настраиваем исключение при открытии изображения
         mock_image_open.side_effect = Exception("Image error")
 
-        image_data = b"fake_image_data"
-
         # Execute & Assert
         with pytest.raises(Exception, match="Image error"):
-            OCRProcessor.process_image(image_data, "test.jpg")
+            OCRProcessor.process_image(b"fake_image_data", "test.jpg")
 
-        mock_unlink.assert_called_once_with('/tmp/test.jpg')
+        mock_get_engine.return_value.recognize.assert_not_called()
 
-    @patch('app.core.business_logic.tempfile.NamedTemporaryFile')
-    @patch('app.core.business_logic.Image.open')
-    @patch('app.core.business_logic.pytesseract.image_to_string')
-    @patch('app.core.business_logic.os.unlink')
+    @patch('app.core.ocr_engines.subprocess.run')
     @patch('app.core.business_logic.settings')
-    def test_process_image_unlink_error(self, mock_settings, mock_unlink, mock_image_to_string,
-                                       mock_image_open, mock_tempfile):
-        """Тест ошибки при удалении временного файла."""
+    def test_process_image_without_temp_files(self, mock_settings, mock_run):
+        """Тест декодирования в памяти и передачи пикселей tesseract через stdin."""
         # Setup
         mock_settings.TESSERACT_LANG = 'rus'
+        mock_settings.TESSERACT_CONFIG = ''
+        mock_run.return_value = Mock(returncode=0, stdout="Extracted text".encode())
 
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/test.jpg'
-        mock_tempfile.return_value.__enter__.return_value = mock_temp
+        buffer = io.BytesIO()
+        Image.new("RGBA", (8, 8), color=(255, 255, 255, 255)).save(buffer, format="PNG")
 
-        mock_image = MagicMock(spec=Image.Image)
-        mock_context_manager = MagicMock()
-        mock_context_manager.__enter__.return_value = mock_image
-        mock_image_open.return_value = mock_context_manager
-
-        mock_image_to_string.return_value = "Extracted text"
-        mock_unlink.side_effect = Exception("Unlink error")
-
-        image_data = b"fake_image_data"
-
-        # Execute - should not raise exception
-        result = OCRProcessor.process_image(image_data, "test.jpg")
+        # Execute
+        with patch('app.core.business_logic.get_engine', return_value=SubprocessEngine()), \
+             patch('tempfile.NamedTemporaryFile') as mock_tempfile:
+            result = OCRProcessor.process_image(buffer.getvalue(), "test.png")
 
         # Assert
         assert result == "Extracted text"
-        mock_unlink.assert_called_once_with('/tmp/test.jpg')
+        mock_tempfile.assert_not_called()
+        args, kwargs = mock_run.call_args
+        assert args[0][1:5] == ["stdin", "stdout", "-l", "rus"]
+        assert bytes(kwargs["input"]).startswith(b"P6")
 
-    @patch('app.core.business_logic.tempfile.NamedTemporaryFile')
-    @patch('app.core.business_logic.Image.open')
-    @patch('app.core.business_logic.pytesseract.image_to_string')
-    @patch('app.core.business_logic.os.unlink')
+    @patch('app.core.business_logic.get_engine')
     @patch('app.core.business_logic.settings')
-    def test_process_image_without_user_id(self, mock_settings, mock_unlink, mock_image_to_string,
-                                          mock_image_open, mock_tempfile):
-        """Тест обработки изображения без user_id."""
+    def test_process_image_from_mmap_without_copy(self, mock_settings, mock_get_engine):
+        """Тест декодирования изображения прямо из mmap без копирования в BytesIO."""
         # Setup
         mock_settings.TESSERACT_LANG = 'rus'
+        mock_get_engine.return_value.recognize.return_value = "Extracted text"
 
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/test.jpg'
-        mock_tempfile.return_value.__enter__.return_value = mock_temp
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 32), color=(255, 255, 255)).save(buffer, format="JPEG")
 
-        mock_image = MagicMock(spec=Image.Image)
-        mock_context_manager = MagicMock()
-        mock_context_manager.__enter__.return_value = mock_image
-        mock_image_open.return_value = mock_context_manager
+        # Execute
+        with tempfile.TemporaryFile() as f:
+            f.write(buffer.getvalue())
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                 patch('io.BytesIO', side_effect=AssertionError("image buffer copied")):
+                result = OCRProcessor.process_image(mm, "test.jpg")
 
-        mock_image_to_string.return_value = "Extracted text"
+        # Assert
+        assert result == "Extracted text"
+        assert mock_get_engine.return_value.recognize.call_args[0][0].size == (64, 32)
 
-        image_data = b"fake_image_data"
+    @patch('app.core.documents.Image.open')
+    @patch('app.core.business_logic.get_engine')
+    @patch('app.core.business_logic.settings')
+    def test_process_image_without_user_id(self, mock_settings, mock_get_engine, mock_image_open):
+        """Тест обработки изображения без user_id."""
+        # Setup
+        mock_settings.TESSERACT_LANG = 'rus'
+        mock_image_open.return_value = MagicMock()
+        mock_engine = mock_get_engine.return_value
+        mock_engine.recognize.return_value = "Extracted text"
 
         # Execute
-        result = OCRProcessor.process_image(image_data, "test.jpg")
+        result = OCRProcessor.process_image(b"fake_image_data", "test.jpg")
 
         # Assert
         assert result == "Extracted text"
-        mock_image_to_string.assert_called_once()
-        args, kwargs = mock_image_to_string.call_args
+        mock_engine.recognize.assert_called_once()
+        args, kwargs = mock_engine.recognize.call_args
         assert kwargs.get('lang') == 'rus'
 
 
 class TestTaskManager:
     """Тесты для класса TaskManager."""
 
-    @patch('app.core.business_logic.AsyncResult')
-    def test_get_task_status_success(self, mock_async_result):
+    @staticmethod
+    def _image_text(status, **fields):
+        """Создает мок записи ImageText, которую ведет воркер."""
+        values = {
+            "task_id": "task_123",
+            "image_id": 7,
+            "status": status,
+            "task_result": None,
+            "error_message": None,
+            "queued_at": None,
+            "started_at": None,
+            "finished_at": None,
+        }
+        values.update(fields)
+        return Mock(**values)
+
+    def test_get_task_status_success(self):
         """Тест получения статуса успешной задачи."""
-        # Setup
-        mock_task = MagicMock()
-        mock_task.state = "SUCCESS"
-        mock_task.ready.return_value = True
-        mock_task.result = {"text": "OCR result"}
-        mock_async_result.return_value = mock_task
+        finished_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        image_text = self._image_text("completed", task_result={"text_length": 10}, finished_at=finished_at)
 
         # Execute
-        result = TaskManager.get_task_status("task_123")
+        result = TaskManager.get_task_status(image_text)
 
         # Assert
         assert result == {
             "task_id": "task_123",
             "status": "SUCCESS",
             "ready": True,
-            "result": {"text": "OCR result"}
+            "image_id": 7,
+            "result": {"text_length": 10},
+            "queued_at": None,
+            "started_at": None,
+            "finished_at": finished_at.isoformat(),
         }
 
-    @patch('app.core.business_logic.AsyncResult')
-    def test_get_task_status_failure(self, mock_async_result):
+    def test_get_task_status_failure(self):
         """Тест получения статуса упавшей задачи."""
-        # Setup
-        mock_task = MagicMock()
-        mock_task.state = "FAILURE"
-        mock_task.ready.return_value = True
-        mock_task.info = "Error processing image"
-        mock_async_result.return_value = mock_task
+        result = TaskManager.get_task_status(self._image_text("failed", error_message="Error processing image"))
 
-        # Execute
-        result = TaskManager.get_task_status("task_123")
+        assert result["status"] == "FAILURE"
+        assert result["ready"] is True
+        assert result["error"] == "Error processing image"
 
-        # Assert
-        assert result == {
-            "task_id": "task_123",
-            "status": "FAILURE",
-            "ready": True,
-            "error": "Error processing image"
-        }
+    def test_get_task_status_pending(self):
+        """Тест получения статуса ожидающей и выполняющейся задачи."""
+        assert TaskManager.get_task_status(self._image_text("pending"))["status"] == "PENDING"
 
-    @patch('app.core.business_logic.AsyncResult')
-    def test_get_task_status_pending(self, mock_async_result):
-        """Тест получения статуса ожидающей задачи."""
-        # Setup
-        mock_task = MagicMock()
-        mock_task.state = "PENDING"
-        mock_task.ready.return_value = False
-        mock_async_result.return_value = mock_task
+        result = TaskManager.get_task_status(self._image_text("processing"))
+        assert result["status"] == "STARTED"
+        assert result["ready"] is False
+        assert "result" not in result
 
-        # Execute
-        result = TaskManager.get_task_status("task_123")
+    def test_get_task_status_no_info(self):
+        """Тест получения статуса упавшей задачи без сообщения об ошибке."""
+        result = TaskManager.get_task_status(self._image_text("failed"))
 
-        # Assert
-        assert result == {
-            "task_id": "task_123",
-            "status": "PENDING",
-            "ready": False
-        }
+        assert result["error"] == "Unknown error"
 
-    @patch('app.core.business_logic.AsyncResult')
-    def test_get_task_status_no_info(self, mock_async_result):
-        """Тест получения статуса упавшей задачи без info."""
-        # Setup
-        mock_task = MagicMock()
-        mock_task.state = "FAILURE"
-        mock_task.ready.return_value = True
-        mock_task.info = None
-        mock_async_result.return_value = mock_task
 
-        # Execute
-        result = TaskManager.get_task_status("task_123")
+class TestOCREngines:
+    """Тесты для движков OCR."""
 
-        # Assert
-        assert result == {
-            "task_id": "task_123",
-            "status": "FAILURE",
-            "ready": True,
-            "error": "Unknown error"
-        }
\ No newline at end of file
+    @patch('app.core.ocr_engines.tesserocr', None)
+    def test_create_engine_falls_back_to_subprocess(self):
+        """Тест отката на subprocess, если tesserocr не установлен."""
+        engine = create_engine("tesserocr")
+
+        assert isinstance(engine, SubprocessEngine)
+
+    @patch('app.core.ocr_engines.tesserocr', MagicMock())
+    def test_create_engine_pool_covers_tile_workers(self):
+        """Тест размера пула хендлов tesserocr, достаточного для распознавания полосами."""
+        with patch.object(settings, 'OCR_ENGINE_POOL_SIZE', 1), patch.object(settings, 'OCR_TILE_WORKERS', 4):
+            engine = create_engine("tesserocr")
+
+        assert isinstance(engine, TesserocrEngine)
+        assert engine.pool_size == 4
+
+    def test_apply_config(self):
+        """Тест применения параметров tesseract к хендлу."""
+        mock_api = MagicMock()
+
+        TesserocrEngine._apply_config(mock_api, "--psm 6 -c preserve_interword_spaces=1 --oem 1")
+
+        mock_api.SetPageSegMode.assert_called_once_with(6)
+        mock_api.SetVariable.assert_called_once_with("preserve_interword_spaces", "1")
@@ -0,0 +1,116 @@
+"""Тесты для CRUD операций."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import crud, schemas
+
+
+def _sql(stmt) -> str:
+    """Компилирует запрос в SQL Postgres."""
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_update_image_text_sync_single_statement():
+    """Тест обновления записи одним UPDATE ... RETURNING без COMMIT внутри."""
+    mock_db = MagicMock()
+
+    crud.update_image_text_sync(mock_db, 7, schemas.ImageTextUpdate(status="processing"))
+
+    mock_db.execute.assert_called_once()
+    sql = _sql(mock_db.execute.call_args.args[0])
+    assert sql.startswith("UPDATE image_text SET status=")
+    assert "RETURNING" in sql
+    mock_db.commit.assert_not_called()
+
+
+def test_bulk_update_groups_rows_by_fields():
+    """Тест пакетного обновления: один UPDATE на каждый набор полей."""
+    mock_db = MagicMock()
+
+    crud.update_image_texts_sync(mock_db, {
+        1: schemas.ImageTextUpdate(status="processing"),
+        2: schemas.ImageTextUpdate(status="processing"),
+        3: schemas.ImageTextUpdate(status="completed", text="done"),
+    })
+
+    assert mock_db.execute.call_count == 2
+    params = [call.args[1] for call in mock_db.execute.call_args_list]
+    assert params[0] == [
+        {"b_image_id": 1, "v_status": "processing"},
+        {"b_image_id": 2, "v_status": "processing"},
+    ]
+    assert params[1] == [{"b_image_id": 3, "v_status": "completed", "v_text": "done"}]
+
+
+def test_upsert_image_texts_on_conflict():
+    """Тест upsert записей по image_id."""
+    sql = _sql(crud._upsert_image_texts_stmt([{"image_id": 1, "user_id": 2, "status": "pending"}]))
+
+    assert "ON CONFLICT (image_id) DO UPDATE SET" in sql
+    assert "status = excluded.status" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_image_text_by_task_id_skips_text():
+    """Тест запроса статуса: колонка text не загружается."""
+    mock_db = AsyncMock()
+    mock_db.execute.return_value = MagicMock()
+
+    await crud.get_image_text_by_task_id(mock_db, "task_123")
+
+    sql = _sql(mock_db.execute.call_args.args[0])
+    assert "image_text.status" in sql
+    assert "image_text.text" not in sql
+
+
+@pytest.mark.asyncio
+async def test_release_image_last_reference_drops_blob():
+    """Тест освобождения последней ссылки: запись блоба удаляется, ключ возвращается для удаления файла."""
+    mock_db = AsyncMock()
+    mock_db.execute.side_effect = [
+        MagicMock(scalar_one_or_none=MagicMock(return_value="blobs/ab/cd/abcd.png")),
+        MagicMock(scalar_one_or_none=MagicMock(return_value=0)),
+        MagicMock(),
+    ]
+
+    deleted, orphan_key = await crud.release_image(mock_db, 7)
+
+    assert (deleted, orphan_key) == (True, "blobs/ab/cd/abcd.png")
+    statements = [_sql(call.args[0]) for call in mock_db.execute.call_args_list]
+    assert statements[1].startswith("UPDATE blobs SET ref_count=(blobs.ref_count -")
+    assert statements[2].startswith("DELETE FROM blobs")
+    mock_db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_claim_orphan_blob_locks_key_and_checks_references():
+    """Тест захвата освобожденного блоба: ключ блокируется, файл удаляется только без новой ссылки."""
+    mock_db = AsyncMock()
+    mock_db.execute.side_effect = [MagicMock(), MagicMock(scalar_one_or_none=MagicMock(return_value=None))]
+
+    assert await crud.claim_orphan_blob(mock_db, "blobs/ab/cd/abcd.png") is True
+
+    statements = [_sql(call.args[0]) for call in mock_db.execute.call_args_list]
+    assert "pg_advisory_xact_lock(hashtext(" in statements[0]
+    assert statements[1].startswith("SELECT blobs.storage_key")
+
+    mock_db.execute.side_effect = [MagicMock(), MagicMock(scalar_one_or_none=MagicMock(return_value="blobs/ab/cd/abcd.png"))]
+    assert await crud.claim_orphan_blob(mock_db, "blobs/ab/cd/abcd.png") is False
+
+
+@pytest.mark.asyncio
+async def test_release_image_shared_blob_kept():
+    """Тест освобождения ссылки на блоб, которым пользуются другие изображения."""
+    mock_db = AsyncMock()
+    mock_db.execute.side_effect = [
+        MagicMock(scalar_one_or_none=MagicMock(return_value="blobs/ab/cd/abcd.png")),
+        MagicMock(scalar_one_or_none=MagicMock(return_value=2)),
+    ]
+
+    assert await crud.release_image(mock_db, 7) == (True, None)
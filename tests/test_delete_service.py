@@ -0,0 +1,55 @@
+"""Тесты для сервиса удаления."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.delete_service import DeleteService
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_orphan_blob_after_commit():
+    """Тест удаления последней ссылки: файл блоба удаляется только после commit."""
+    mock_db = AsyncMock()
+    calls = []
+    mock_db.commit.side_effect = lambda: calls.append("commit")
+    image = Mock(user_id=1)
+
+    with patch('app.services.delete_service.crud') as mock_crud, \
+         patch('app.services.delete_service.image_cache') as mock_cache, \
+         patch('app.services.delete_service.file_storage') as mock_storage:
+        mock_crud.get_image_text = AsyncMock(return_value=None)
+        mock_crud.delete_image_text = AsyncMock(return_value=True)
+        mock_crud.release_image = AsyncMock(return_value=(True, "blobs/ab/cd/abcd.png"))
+        mock_crud.claim_orphan_blob = AsyncMock(side_effect=lambda db, key: calls.append("claim") or True)
+        mock_cache.get = AsyncMock(return_value=image)
+        mock_storage.delete_blob = MagicMock(side_effect=lambda key: calls.append("delete_blob") or True)
+
+        result = await DeleteService().process_delete(7, 1, mock_db)
+
+    assert calls == ["commit", "claim", "delete_blob", "commit"]
+    mock_storage.delete_blob.assert_called_once_with("blobs/ab/cd/abcd.png")
+    assert result["blob_deleted"] is True
+
+
+@pytest.mark.asyncio
+async def test_delete_keeps_blob_reacquired_by_upload():
+    """Тест гонки с загрузкой того же содержимого: файл нового блоба не удаляется."""
+    mock_db = AsyncMock()
+
+    with patch('app.services.delete_service.crud') as mock_crud, \
+         patch('app.services.delete_service.image_cache') as mock_cache, \
+         patch('app.services.delete_service.file_storage') as mock_storage:
+        mock_crud.get_image_text = AsyncMock(return_value=None)
+        mock_crud.delete_image_text = AsyncMock(return_value=True)
+        mock_crud.release_image = AsyncMock(return_value=(True, "blobs/ab/cd/abcd.png"))
+        mock_crud.claim_orphan_blob = AsyncMock(return_value=False)
+        mock_cache.get = AsyncMock(return_value=Mock(user_id=1))
+
+        result = await DeleteService().process_delete(7, 1, mock_db)
+
+    mock_storage.delete_blob.assert_not_called()
+    assert result["blob_deleted"] is False
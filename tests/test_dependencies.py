@@ -9,6 +9,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.core.dependencies import get_current_user
+from app.core.user_cache import user_cache
 
 
 @pytest.mark.asyncio
@@ -111,4 +112,34 @@ async def test_get_current_user_inactive():
             with pytest.raises(HTTPException) as exc_info:
                 await get_current_user(token=mock_token, db=mock_db)
 
-            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_cache():
+    """Тест повторной аутентификации без запроса пользователя из БД."""
+    mock_db = AsyncMock()
+    payload = {"user_id": 1, "email": "test@example.com"}
+
+    mock_user = Mock()
+    mock_user.is_active = True
+    mock_user.email = "test@example.com"
+
+    with patch('app.core.dependencies.decode_token', return_value=payload):
+        with patch('app.core.dependencies.get_user', new_callable=AsyncMock) as mock_get_user:
+            mock_get_user.return_value = mock_user
+
+            await get_current_user(token="valid_token", db=mock_db)
+            result = await get_current_user(token="valid_token", db=mock_db)
+
+            assert result["user_id"] == 1
+            mock_get_user.assert_awaited_once()
+
+            user_cache.on_notify("1")
+            mock_user.is_active = False
+
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(token="valid_token", db=mock_db)
+
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            assert mock_get_user.await_count == 2
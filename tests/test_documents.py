@@ -0,0 +1,73 @@
+"""Тесты для многостраничных документов."""
+
+import io
+import sys
+import os
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core import documents
+
+
+def _document(fmt: str, pages: int = 3) -> bytes:
+    """Создает многостраничный документ в памяти."""
+    frames = [Image.new("L", (200, 100), color=40 * n) for n in range(pages)]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format=fmt, save_all=True, append_images=frames[1:])
+    return buffer.getvalue()
+
+
+def test_count_pages_pdf_and_tiff():
+    """Тест подсчета страниц PDF и TIFF из буфера."""
+    assert documents.count_pages(_document("PDF"), "doc.pdf") == 3
+    assert documents.count_pages(io.BytesIO(_document("TIFF")), "doc.tiff") == 3
+    assert documents.count_pages(io.BytesIO(_document("TIFF")).getbuffer(), "doc.tiff") == 3
+    assert documents.count_pages(b"not parsed", "photo.jpg") == 1
+
+
+def test_open_page_renders_single_page():
+    """Тест растеризации только запрошенной страницы."""
+    with documents.open_page(_document("PDF"), "doc.pdf", page_no=1) as page:
+        assert page.mode == "L"
+        assert page.width > 200
+
+    with documents.open_page(io.BytesIO(_document("TIFF")), "doc.tif", page_no=2) as page:
+        assert page.getpixel((0, 0)) == 80
+
+
+def test_tiff_pages_from_s3_buffer():
+    """Тест многостраничного TIFF из буфера S3-бэкенда (memoryview поверх BytesIO)."""
+    pytest.importorskip("boto3")
+    from app.core.storage_backends import S3Backend
+    from tests.test_storage_backends import FakeS3Client
+
+    client = FakeS3Client()
+    client.objects[("ocr-uploads", "blobs/ab/cd/abcd.tiff")] = _document("TIFF")
+    backend = S3Backend("ocr-uploads", client=client)
+
+    with backend.open_buffer("blobs/ab/cd/abcd.tiff") as buffer:
+        assert documents.count_pages(buffer, "doc.tiff") == 3
+        with documents.open_page(buffer, "doc.tiff", page_no=2) as page:
+            assert page.getpixel((0, 0)) == 80
+
+
+def test_probe_reads_mime_and_size():
+    """Тест определения MIME-типа, размера и числа страниц по заголовку файла."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        png_path = os.path.join(tmp_dir, "scan.part")
+        Image.new("L", (300, 120)).save(png_path, format="PNG")
+        pdf_path = os.path.join(tmp_dir, "doc.part")
+        with open(pdf_path, "wb") as f:
+            f.write(_document("PDF"))
+        broken_path = os.path.join(tmp_dir, "broken.part")
+        with open(broken_path, "wb") as f:
+            f.write(b"not an image")
+
+        assert documents.probe(png_path, "scan.png") == ("image/png", 300, 120, 1)
+        mime, width, height, page_count = documents.probe(pdf_path, "doc.pdf")
+        assert mime == "application/pdf" and width > 200 and height > 100 and page_count == 3
+        assert documents.probe(broken_path, "photo.jpg") == ("image/jpeg", None, None, None)
@@ -0,0 +1,52 @@
+"""Тесты для сервиса списка документов."""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from sqlalchemy.dialects import postgresql
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import crud
+from app.services.documents_service import DocumentsService
+
+
+def _row(row_id: int, created_at: datetime) -> Mock:
+    """Создает мок строки списка документов."""
+    return Mock(id=row_id, image_id=row_id * 10, status="completed", batch_id=None,
+                page_count=None, pages_done=None, created_at=created_at, updated_at=None)
+
+
+@pytest.mark.asyncio
+async def test_list_documents_keyset_cursor():
+    """Тест передачи позиции последней строки в следующий запрос."""
+    mock_db = AsyncMock()
+    created_at = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+    with patch('app.services.documents_service.crud.list_image_texts', new_callable=AsyncMock) as mock_list:
+        mock_list.return_value = [_row(5, created_at), _row(4, created_at)]
+        first = await DocumentsService().list_documents(1, mock_db, limit=2, status="completed")
+
+        mock_list.return_value = [_row(3, created_at)]
+        second = await DocumentsService().list_documents(1, mock_db, limit=2, cursor=first["next_cursor"])
+
+    assert [item["image_id"] for item in first["items"]] == [50, 40]
+    assert mock_list.call_args.kwargs["after"] == (created_at, 4)
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_image_texts_uses_row_comparison():
+    """Тест запроса страницы: сводные колонки и сравнение (created_at, id)."""
+    mock_db = AsyncMock()
+    mock_db.execute.return_value = MagicMock()
+    created_at = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+    await crud.list_image_texts(mock_db, 1, 50, status="failed", after=(created_at, 4))
+
+    sql = str(mock_db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "image_text.text" not in sql
+    assert "(image_text.created_at, image_text.id) < (" in sql
+    assert "ORDER BY image_text.created_at DESC, image_text.id DESC" in sql
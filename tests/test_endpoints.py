@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 from fastapi import UploadFile
+from app import schemas
 import sys
 import os
 
@@ -10,7 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Мокаем FileStorage до импорта endpoints
 with patch('app.core.file_storage.FileStorage._ensure_upload_dir'):
-    from app.api.endpoints import upload_document, doc_analyse, delete_doc, get_text, get_status
+    from app.api.endpoints import upload_document, doc_analyse, doc_analyse_batch, delete_doc, get_text, get_status
 
 
 @pytest.mark.asyncio
@@ -53,13 +54,38 @@ async def test_doc_analyse():
         # Execute
         result = await doc_analyse(
             image_id=image_id,
+            profile="photo",
             db=mock_db,
             current_user=mock_current_user
         )
 
     # Assert
     assert result == {"task_id": "task_123"}
-    mock_service.process_analyse.assert_called_once_with(image_id, 1, mock_db)
+    mock_service.process_analyse.assert_called_once_with(image_id, 1, mock_db, profile="photo")
+
+
+@pytest.mark.asyncio
+async def test_doc_analyse_batch():
+    """Тест эндпоинта пакетного анализа документов."""
+    # Setup
+    mock_db = AsyncMock()
+    mock_current_user = {"user_id": 1}
+    request = schemas.BatchAnalyseRequest(image_ids=[1, 2, 3])
+
+    mock_service = AsyncMock()
+    mock_service.process_analyse_batch.return_value = {"batch_id": "batch_123"}
+
+    with patch('app.api.endpoints.AnalyseService', return_value=mock_service):
+        # Execute
+        result = await doc_analyse_batch(
+            request=request,
+            db=mock_db,
+            current_user=mock_current_user
+        )
+
+    # Assert
+    assert result == {"batch_id": "batch_123"}
+    mock_service.process_analyse_batch.assert_called_once_with([1, 2, 3], 1, mock_db, profile=None)
 
 
 @pytest.mark.asyncio
@@ -90,6 +116,7 @@ async def test_delete_doc():
 async def test_get_text():
     """Тест эндпоинта получения текста."""
     # Setup
+    mock_response = Mock()
     mock_db = AsyncMock()
     mock_current_user = {"user_id": 1}
     image_id = 123
@@ -101,19 +128,30 @@ async def test_get_text():
         # Execute
         result = await get_text(
             image_id=image_id,
+            response=mock_response,
+            wait=30,
+            offset=None,
+            limit=None,
+            page_from=None,
+            page_to=None,
+            if_none_match=None,
             db=mock_db,
             current_user=mock_current_user
         )
 
     # Assert
     assert result == {"text": "OCR result"}
-    mock_service.get_text.assert_called_once_with(image_id, 1, mock_db)
+    mock_service.get_text.assert_called_once_with(
+        image_id, 1, mock_db, wait=30, if_none_match=None, response=mock_response,
+        offset=None, limit=None, page_from=None, page_to=None,
+    )
 
 
 @pytest.mark.asyncio
 async def test_get_status():
     """Тест эндпоинта получения статуса."""
     # Setup
+    mock_db = AsyncMock()
     mock_current_user = {"user_id": 1}
     task_id = "task_123"
 
@@ -124,9 +162,10 @@ async def test_get_status():
         # Execute
         result = await get_status(
             task_id=task_id,
+            db=mock_db,
             current_user=mock_current_user
         )
 
     # Assert
     assert result == {"status": "SUCCESS", "task_id": task_id}
-    mock_service.get_status.assert_called_once_with(task_id, 1)
\ No newline at end of file
+    mock_service.get_status.assert_called_once_with(task_id, 1, mock_db)
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Тесты для файлового хранилища."""
+
+import pytest
+from unittest.mock import Mock, patch
+import hashlib
+import io
+import tempfile
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.file_storage import FileStorage, FileTooLargeError
+
+_real_mkdir = Path.mkdir
+
+
+class FakeUploadStream:
+    """Асинхронный поток, имитирующий UploadFile."""
+
+    def __init__(self, data: bytes):
+        self._buffer = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._buffer.read(size)
+
+
+@pytest.fixture
+def upload_dir():
+    """Временная директория загрузок."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield tmp_dir
+
+
+@pytest.fixture
+def storage(upload_dir):
+    """Хранилище во временной директории; создание каталогов внутри нее разрешено."""
+    with patch('app.core.file_storage.settings') as mock_settings, patch('pathlib.Path.mkdir', _real_mkdir):
+        mock_settings.UPLOAD_DIR = upload_dir
+        mock_settings.STORAGE_BACKEND = "local"
+        mock_settings.UPLOAD_CHUNK_SIZE = 4
+        yield FileStorage()
+
+
+@pytest.mark.asyncio
+async def test_save_stream_hashes_while_writing(storage, upload_dir):
+    """Тест потоковой записи с подсчетом размера и хеша."""
+    data = b"0123456789abcdef"
+
+    saved = await storage.save_stream(FakeUploadStream(data), "scan.png", 1, max_size=100)
+
+    assert saved["size"] == len(data)
+    content_hash = hashlib.sha256(data).hexdigest()
+    assert saved["content_hash"] == content_hash
+    assert saved["storage_key"] == f"blobs/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.png"
+
+    assert storage.commit_blob(saved["tmp_path"], saved["storage_key"]) is True
+    assert storage.read_file(saved["storage_key"]) == data
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_blob(storage, upload_dir):
+    """Тест дедупликации: повторная загрузка того же содержимого не создает второй файл."""
+    data = b"same bytes"
+    first = await storage.save_stream(FakeUploadStream(data), "a.png", 1)
+    second = await storage.save_stream(FakeUploadStream(data), "b.png", 2)
+
+    assert first["storage_key"] == second["storage_key"]
+    assert storage.commit_blob(first["tmp_path"], first["storage_key"]) is True
+    assert storage.commit_blob(second["tmp_path"], second["storage_key"]) is False
+    assert os.listdir(os.path.join(upload_dir, "tmp")) == []
+
+    assert storage.delete_blob(first["storage_key"]) is True
+    assert storage.delete_blob(first["storage_key"]) is False
+
+
+@pytest.mark.asyncio
+async def test_save_stream_enforces_max_size(storage, upload_dir):
+    """Тест прерывания загрузки при превышении лимита размера."""
+    with pytest.raises(FileTooLargeError):
+        await storage.save_stream(FakeUploadStream(b"x" * 32), "scan.png", 1, max_size=10)
+
+    assert os.listdir(os.path.join(upload_dir, "tmp")) == []
+
+
+def test_legacy_keys_read_from_upload_dir(storage, upload_dir):
+    """Тест чтения файлов старой раскладки с диска при блобах в другом бэкенде."""
+    storage.backend = Mock()
+    _real_mkdir(Path(upload_dir) / "1")
+    (Path(upload_dir) / "1" / "10.png").write_bytes(b"legacy")
+
+    with storage.open_buffer("1/10.png") as buffer:
+        assert bytes(buffer) == b"legacy"
+    assert storage.read_file("1/10.png") == b"legacy"
+
+    storage.open_buffer("blobs/ab/cd/abcd.png")
+    storage.backend.open_buffer.assert_called_once_with("blobs/ab/cd/abcd.png")
+    storage.backend.get_stream.assert_not_called()
+
+
+def test_delete_blob_removes_legacy_key_from_upload_dir(storage, upload_dir):
+    """Тест удаления файла старой раскладки, когда блобы хранятся в другом бэкенде."""
+    storage.backend = Mock()
+    _real_mkdir(Path(upload_dir) / "1")
+    (Path(upload_dir) / "1" / "10.png").write_bytes(b"legacy")
+
+    assert storage.delete_blob("1/10.png") is True
+    assert not (Path(upload_dir) / "1" / "10.png").exists()
+    storage.backend.delete.assert_not_called()
@@ -0,0 +1,52 @@
+"""Тесты для кэша метаданных изображений."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.image_cache import ImageCache
+
+
+def _image(image_id: int = 7) -> Mock:
+    """Создает мок строки images."""
+    return Mock(
+        image_id=image_id, user_id=1, storage_key="blobs/ab/cd/abcd.png", filename="scan.png",
+        size=100, content_hash="abcd", mime="image/png", width=300, height=120, page_count=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_caches_metadata():
+    """Тест: повторный запрос метаданных не обращается к БД."""
+    cache = ImageCache(max_size=10, ttl=60)
+
+    with patch('app.core.image_cache.crud.get_image', new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = _image()
+        first = await cache.get(AsyncMock(), 7)
+        second = await cache.get(AsyncMock(), 7)
+
+    mock_get.assert_awaited_once()
+    assert first is second
+    assert (first.width, first.height, first.mime) == (300, 120, "image/png")
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_image_not_cached_and_notify_invalidates():
+    """Тест: отсутствующие изображения не кэшируются, уведомление image_changed удаляет запись."""
+    cache = ImageCache(max_size=10, ttl=60)
+
+    with patch('app.core.image_cache.crud.get_image', new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = None
+        assert await cache.get(AsyncMock(), 7) is None
+        mock_get.return_value = _image()
+        await cache.get(AsyncMock(), 7)
+
+        cache.on_notify("7")
+        cache.on_notify("garbage")
+        await cache.get(AsyncMock(), 7)
+
+    assert mock_get.await_count == 3
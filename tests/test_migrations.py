@@ -0,0 +1,68 @@
+"""Тесты для перехода баз, созданных до появления миграций в репозитории."""
+
+import importlib.util
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.migration_utils import forget_unknown_revisions
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'alembic', 'versions')
+
+
+def _load_revision(filename: str):
+    """Загружает модуль ревизии Alembic по имени файла."""
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(VERSIONS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _create_baseline_schema(connection):
+    """Создает схему, которую оставлял старый запуск: таблицы и автосгенерированную ревизию."""
+    metadata = sa.MetaData()
+    sa.Table(
+        "users", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("email", sa.String(100), unique=True, nullable=False, index=True),
+        sa.Column("hashed_password", sa.String(200), nullable=False),
+        sa.Column("is_active", sa.Integer),
+    )
+    sa.Table(
+        "image_text", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("image_id", sa.Integer, nullable=False, index=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), nullable=False, index=True),
+        sa.Column("text", sa.Text),
+        sa.UniqueConstraint("image_id", name="uq_image_text_image_id"),
+    )
+    sa.Table("alembic_version", metadata, sa.Column("version_num", sa.String(32), primary_key=True))
+    metadata.create_all(connection)
+    connection.execute(sa.text("INSERT INTO alembic_version VALUES ('1a2b3c4d5e6f')"))
+    connection.execute(sa.text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@b.c', 'x')"))
+    connection.commit()
+
+
+def test_initial_revision_upgrades_baseline_database():
+    """Тест: автосгенерированная ревизия сбрасывается, 0001 не пересоздает существующие таблицы."""
+    engine = sa.create_engine("sqlite://")
+
+    with engine.connect() as connection:
+        _create_baseline_schema(connection)
+
+        forgotten = forget_unknown_revisions(connection, {"0001", "0002"})
+
+        assert forgotten == ["1a2b3c4d5e6f"]
+        assert connection.execute(sa.text("SELECT count(*) FROM alembic_version")).scalar() == 0
+
+        with Operations.context(MigrationContext.configure(connection)):
+            _load_revision("0001_initial_schema.py").upgrade()
+        connection.commit()
+
+        assert connection.execute(sa.text("SELECT email FROM users")).scalar() == "a@b.c"
+        assert forget_unknown_revisions(connection, {"0001"}) == []
+
@@ -0,0 +1,56 @@
+"""Тесты для кэша результатов OCR."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ocr_cache import OCRResultCache
+
+
+class TestOCRResultCache:
+    """Тесты для класса OCRResultCache."""
+
+    def test_make_key_depends_on_lang_and_options(self):
+        """Тест зависимости ключа от языка и параметров OCR."""
+        content_hash = OCRResultCache.hash_content(b"image")
+
+        key = OCRResultCache.make_key(content_hash, "rus+eng", {"config": ""})
+
+        assert key == OCRResultCache.make_key(content_hash, "rus+eng", {"config": ""})
+        assert key != OCRResultCache.make_key(content_hash, "eng", {"config": ""})
+        assert key != OCRResultCache.make_key(content_hash, "rus+eng", {"config": "--psm 6"})
+
+    def test_memory_lru_eviction(self):
+        """Тест вытеснения самой старой записи при переполнении."""
+        cache = OCRResultCache(max_size=2)
+        cache.put_memory("a", "text a")
+        cache.put_memory("b", "text b")
+        cache.get_memory("a")
+        cache.put_memory("c", "text c")
+
+        assert cache.get_memory("a") == "text a"
+        assert cache.get_memory("b") is None
+        assert cache.get_memory("c") == "text c"
+
+    @pytest.mark.asyncio
+    async def test_get_falls_back_to_db_and_counts(self):
+        """Тест обращения к Postgres при промахе в памяти и подсчета статистики."""
+        cache = OCRResultCache(max_size=10)
+        mock_db = AsyncMock()
+        entry = Mock(text="cached text")
+
+        with patch('app.core.ocr_cache.crud.get_ocr_cache', new_callable=AsyncMock) as mock_get:
+            mock_get.side_effect = [entry, None]
+
+            assert await cache.get(mock_db, "key") == "cached text"
+            assert await cache.get(mock_db, "key") == "cached text"
+            assert await cache.get(mock_db, "other") is None
+
+        stats = cache.stats()
+        assert stats["db_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert mock_get.call_count == 2
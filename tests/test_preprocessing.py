@@ -0,0 +1,70 @@
+"""Тесты для предобработки изображений."""
+
+import pytest
+import numpy as np
+from PIL import Image, ImageDraw
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.preprocessing import preprocess, resolve_profile, adaptive_threshold, estimate_text_height
+from app.schemas import PreprocessOptions
+
+
+def _page(width: int = 800, height: int = 600, line_height: int = 40) -> Image.Image:
+    """Создает цветную страницу с черными строками-«текстом» на белом поле."""
+    image = Image.new("RGB", (width, height), color=(250, 245, 240))
+    draw = ImageDraw.Draw(image)
+    for top in range(100, height - 100, line_height * 2):
+        draw.rectangle([150, top, width - 150, top + line_height - 1], fill=(10, 10, 10))
+    return image
+
+
+def test_resolve_profile():
+    """Тест выбора профиля предобработки."""
+    assert resolve_profile("none") is None
+    assert resolve_profile("photo").binarize is True
+
+    with pytest.raises(ValueError, match="Unknown preprocessing profile"):
+        resolve_profile("missing")
+
+
+def test_estimate_text_height():
+    """Тест оценки высоты строки по горизонтальной проекции."""
+    gray = np.asarray(_page(line_height=40).convert("L"))
+
+    assert estimate_text_height(gray) == 40
+
+
+def test_preprocess_downscales_to_target_text_height():
+    """Тест перевода в оттенки серого и уменьшения до целевой высоты строки."""
+    options = PreprocessOptions(target_text_height=20)
+
+    result = preprocess(_page(line_height=40), options)
+
+    assert result.mode == "L"
+    assert result.size == (400, 300)
+
+
+def test_preprocess_binarize_and_crop():
+    """Тест адаптивной бинаризации и обрезки полей."""
+    options = PreprocessOptions(binarize=True, binarize_window=15, crop_borders=True, crop_margin=0)
+
+    result = np.asarray(preprocess(_page(), options))
+
+    assert set(np.unique(result)) <= {0, 255}
+    assert result.shape[1] == 501
+    assert (result[:, 0] == 0).any()
+
+
+def test_adaptive_threshold_handles_uneven_lighting():
+    """Тест бинаризации при неравномерном освещении."""
+    gradient = np.tile(np.linspace(60, 250, 200, dtype=np.float32), (100, 1))
+    gray = gradient.astype(np.uint8)
+    gray[40:60, 20:180] = (gradient[40:60, 20:180] * 0.5).astype(np.uint8)
+
+    result = adaptive_threshold(gray, window=41, offset=0.15)
+
+    assert (result[45:55, 30:170] == 0).all()
+    assert (result[:20, :] == 255).all()
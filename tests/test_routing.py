@@ -0,0 +1,32 @@
+"""Тесты для выбора очереди задач OCR."""
+
+import sys
+import os
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core import routing
+
+
+def test_route_by_cost():
+    """Тест: крупные сканы и многостраничные документы уходят в ocr.heavy, мелкие — в ocr.fast."""
+    receipt = Mock(width=1200, height=2000, page_count=1, size=300_000)
+    scan = Mock(width=8000, height=5000, page_count=1, size=30_000_000)
+    report = Mock(width=2480, height=3508, page_count=40, size=5_000_000)
+
+    assert routing.route(receipt)["queue"] == "ocr.fast"
+    assert routing.route(receipt, bulk=True)["queue"] == "ocr.bulk"
+    assert routing.route(scan)["queue"] == "ocr.heavy"
+    assert routing.route(report)["queue"] == "ocr.heavy"
+    assert routing.route(scan)["time_limit"] > routing.route(receipt)["time_limit"]
+
+
+def test_route_page_and_unknown_dimensions():
+    """Тест: страницы документа идут в ocr.bulk; без размеров стоимость оценивается по размеру файла."""
+    report_ref = {"width": 2480, "height": 3508, "page_count": 40}
+    legacy_ref = {"size": 20_000_000}
+
+    assert routing.route_page(report_ref)["queue"] == "ocr.bulk"
+    assert routing.estimate_cost(legacy_ref) == 80.0
+    assert routing.route(legacy_ref)["queue"] == "ocr.heavy"
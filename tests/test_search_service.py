@@ -0,0 +1,41 @@
+"""Тесты для сервиса полнотекстового поиска."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import HTTPException
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.pagination import decode_cursor
+from app.core.text_search import ts_configs
+from app.services.search_service import SearchService
+
+
+def test_ts_configs_from_tesseract_lang():
+    """Тест выбора конфигураций текстового поиска по языкам tesseract."""
+    assert ts_configs("rus+eng") == ["russian", "english"]
+    assert ts_configs("eng+chi_sim") == ["english", "simple"]
+
+
+@pytest.mark.asyncio
+async def test_search_returns_next_cursor_for_full_page():
+    """Тест выдачи курсора по последней строке полной страницы."""
+    mock_db = AsyncMock()
+    rows = [Mock(id=9 - n, image_id=100 + n, status="completed", rank=0.5 - n / 10,
+                 snippet="<b>invoice</b>", created_at=None) for n in range(2)]
+
+    with patch('app.services.search_service.crud.search_image_texts', new_callable=AsyncMock) as mock_search:
+        mock_search.return_value = rows
+        result = await SearchService().search(1, mock_db, "invoice", limit=2)
+
+        assert [item["image_id"] for item in result["items"]] == [100, 101]
+        assert decode_cursor(result["next_cursor"]) == {"rank": 0.4, "id": 8}
+
+        await SearchService().search(1, mock_db, "invoice", limit=2, cursor=result["next_cursor"])
+        assert mock_search.call_args.args[-1] == (0.4, 8)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await SearchService().search(1, mock_db, "invoice", cursor="not-a-cursor")
+        assert exc_info.value.status_code == 400
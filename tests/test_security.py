@@ -0,0 +1,55 @@
+"""Тесты для хеширования паролей."""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.security import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_roundtrip():
+    """Тест хеширования и проверки пароля в пуле потоков."""
+    hasher = PasswordHasher(workers=1, queue_size=0)
+
+    with patch('app.core.security.settings.PASSWORD_HASH_ROUNDS', 4):
+        hashed = await hasher.hash("secret")
+
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert not hasher.needs_rehash(hashed)
+
+    with patch('app.core.security.settings.PASSWORD_HASH_ROUNDS', 12):
+        assert hasher.needs_rehash(hashed)
+
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_saturated():
+    """Тест отказа при переполненной очереди хеширования."""
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def blocking_verify(password, hashed_password):
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        return True
+
+    with patch('app.core.security.verify_password', side_effect=blocking_verify):
+        running = [asyncio.create_task(hasher.verify("secret", "hash")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.verify("secret", "hash")
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+
+    assert hasher.rejected == 1
+    assert hasher.pending == 0
+    hasher.shutdown()
@@ -0,0 +1,93 @@
+"""Тесты для рассылки изменений статуса OCR."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.status_events import StatusEventBroker, RESYNC
+from app.services.events_service import EventsService
+
+
+def _image_text(image_id: int, status: str, batch_id: str = None) -> Mock:
+    """Создает мок записи ImageText."""
+    return Mock(image_id=image_id, status=status, task_id=f"task{image_id}", batch_id=batch_id,
+                page_count=None, pages_done=None)
+
+
+@pytest.mark.asyncio
+async def test_broker_routes_events_by_user_and_filter():
+    """Тест доставки события только подходящим подпискам владельца."""
+    broker = StatusEventBroker(queue_size=2)
+    by_image = broker.subscribe(1, image_ids=[10])
+    by_batch = broker.subscribe(1, batch_id="b1")
+    other_user = broker.subscribe(2)
+
+    broker.on_notify(json.dumps({"image_id": 10, "user_id": 1, "status": "processing", "batch_id": None}))
+    broker.on_notify(json.dumps({"image_id": 11, "user_id": 1, "status": "completed", "batch_id": "b1"}))
+
+    assert by_image.queue.get_nowait()["image_id"] == 10
+    assert by_image.queue.empty()
+    assert by_batch.queue.get_nowait()["image_id"] == 11
+    assert other_user.queue.empty()
+
+    for status in ("pending", "processing", "completed"):
+        broker.publish({"image_id": 10, "user_id": 1, "status": status})
+    assert by_image.queue.get_nowait() is RESYNC
+
+    broker.unsubscribe(by_image)
+    broker.unsubscribe(by_batch)
+    broker.unsubscribe(other_user)
+    assert broker.stats() == {"users": 0, "subscriptions": 0, "waiters": 0}
+
+
+@pytest.mark.asyncio
+async def test_events_stream_snapshot_then_updates_until_terminal():
+    """Тест потока: текущее состояние, затем изменения до конечного статуса."""
+    mock_db = AsyncMock()
+    broker = StatusEventBroker(queue_size=10)
+
+    with patch('app.services.events_service.status_broker', broker), \
+         patch('app.services.events_service.crud.get_image_texts_for_user', new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = [_image_text(1, "completed"), _image_text(2, "pending")]
+
+        events = await EventsService().subscribe(1, mock_db, image_ids=[1, 2])
+        received = [await events.__anext__(), await events.__anext__()]
+
+        broker.publish({"image_id": 2, "user_id": 1, "status": "processing"})
+        broker.publish({"image_id": 2, "user_id": 1, "status": "completed"})
+        received += [event async for event in events]
+
+    assert [(e["image_id"], e["status"]) for e in received] == [
+        (1, "completed"), (2, "pending"), (2, "processing"), (2, "completed"),
+    ]
+    assert "user_id" not in received[-1]
+    assert broker.stats()["subscriptions"] == 0
+    mock_db.close.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_events_stream_resync_for_all_images():
+    """Тест потока всех изображений: после переполнения приходит RESYNC и состояние изображений в обработке."""
+    mock_db = AsyncMock()
+    broker = StatusEventBroker(queue_size=1)
+
+    with patch('app.services.events_service.status_broker', broker), \
+         patch('app.services.events_service.crud.get_image_texts_for_user', new_callable=AsyncMock) as mock_get, \
+         patch('app.services.events_service.crud.get_active_image_texts_for_user',
+               new_callable=AsyncMock) as mock_active:
+        mock_get.return_value = []
+        mock_active.return_value = [_image_text(3, "processing")]
+
+        events = await EventsService().subscribe(1, mock_db)
+        broker.publish({"image_id": 2, "user_id": 1, "status": "processing"})
+        broker.publish({"image_id": 3, "user_id": 1, "status": "processing"})
+        received = [await events.__anext__(), await events.__anext__()]
+        await events.aclose()
+
+    assert received[0] is RESYNC
+    assert (received[1]["image_id"], received[1]["status"]) == (3, "processing")
+    mock_active.assert_awaited_once_with(mock_db, 1)
@@ -0,0 +1,38 @@
+"""Тесты для сервиса статуса задач."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import HTTPException
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.status_service import StatusService
+
+
+@pytest.mark.asyncio
+async def test_get_status_from_image_text():
+    """Тест получения статуса из записи ImageText с проверкой владельца."""
+    mock_db = AsyncMock()
+    image_text = Mock(
+        task_id="task_123", image_id=7, user_id=1, status="processing", task_result=None,
+        error_message=None, queued_at=None, started_at=None, finished_at=None,
+    )
+
+    with patch('app.services.status_service.crud.get_image_text_by_task_id', new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = image_text
+
+        result = await StatusService().get_status("task_123", 1, mock_db)
+        assert result["status"] == "STARTED"
+        assert result["image_id"] == 7
+        mock_get.assert_called_once_with(mock_db, "task_123")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await StatusService().get_status("task_123", 2, mock_db)
+        assert exc_info.value.status_code == 403
+
+        mock_get.return_value = None
+        with pytest.raises(HTTPException) as exc_info:
+            await StatusService().get_status("unknown", 1, mock_db)
+        assert exc_info.value.status_code == 404
@@ -0,0 +1,75 @@
+"""Тесты для отложенной записи статусов в воркере."""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import schemas
+from app.core.status_writer import StatusWriteBuffer
+
+
+def test_write_behind_coalesces_and_waits_for_terminal_state():
+    """Тест слияния изменений записи и ожидания фиксации конечного статуса."""
+    session = MagicMock()
+    buffer = StatusWriteBuffer(lambda: session, interval=60, max_rows=3)
+    buffer.start()
+
+    with patch('app.core.status_writer.crud.update_image_texts_sync') as mock_update:
+        buffer.write(1, schemas.ImageTextUpdate(status="processing", task_id="t1"))
+        buffer.write(2, schemas.ImageTextUpdate(status="processing"))
+        mock_update.assert_not_called()
+
+        buffer.write(1, schemas.ImageTextUpdate(status="completed", text="done"))
+        done = threading.Event()
+        writer = threading.Thread(target=lambda: (
+            buffer.write(3, schemas.ImageTextUpdate(status="failed"), durable=True), done.set()
+        ))
+        writer.start()
+        writer.join(timeout=5)
+        buffer.stop()
+
+    assert done.is_set()
+    mock_update.assert_called_once()
+    updates = mock_update.call_args.args[1]
+    assert updates[1].model_dump(exclude_unset=True) == {"status": "completed", "task_id": "t1", "text": "done"}
+    assert set(updates) == {1, 2, 3}
+    session.commit.assert_called_once()
+    assert buffer.flushes == 1
+
+
+def test_durable_write_raises_when_flush_fails():
+    """Тест ошибки фиксации конечного статуса."""
+    session = MagicMock()
+    session.commit.side_effect = RuntimeError("db down")
+    buffer = StatusWriteBuffer(lambda: session, interval=0.01, max_rows=100)
+    buffer.start()
+
+    with patch('app.core.status_writer.crud.update_image_texts_sync'):
+        with pytest.raises(RuntimeError, match="db down"):
+            buffer.write(1, schemas.ImageTextUpdate(status="completed"), durable=True)
+        buffer.stop()
+
+    session.rollback.assert_called()
+
+
+def test_terminal_write_does_not_wait_for_interval():
+    """Тест: конечный статус фиксируется сразу, а не по истечении interval."""
+    session = MagicMock()
+    buffer = StatusWriteBuffer(lambda: session, interval=60, max_rows=100)
+    buffer.start()
+
+    with patch('app.core.status_writer.crud.update_image_texts_sync') as mock_update:
+        buffer.write(1, schemas.ImageTextUpdate(status="processing"))
+        started = time.monotonic()
+        buffer.write(1, schemas.ImageTextUpdate(status="completed", text="done"), durable=True)
+        elapsed = time.monotonic() - started
+        buffer.stop()
+
+    assert elapsed < 1
+    mock_update.assert_called_once()
+    assert mock_update.call_args.args[1][1].model_dump(exclude_unset=True) == {"status": "completed", "text": "done"}
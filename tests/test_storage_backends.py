@@ -0,0 +1,99 @@
+"""Тесты для бэкендов хранилища файлов."""
+
+import io
+import os
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.storage_backends import LocalBackend, S3Backend
+
+_real_mkdir = Path.mkdir
+
+
+def _exercise(backend):
+    """Общий сценарий: запись потоком и файлом, чтение целиком, диапазоном и буфером, удаление."""
+    backend.put_stream("blobs/ab/cd/abcd.png", io.BytesIO(b"0123456789"))
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(b"from file")
+    try:
+        backend.put_file("blobs/ef/01/ef01.png", f.name)
+    finally:
+        os.unlink(f.name)
+
+    assert backend.exists("blobs/ab/cd/abcd.png")
+    with backend.get_stream("blobs/ef/01/ef01.png") as stream:
+        assert stream.read() == b"from file"
+    assert backend.get_range("blobs/ab/cd/abcd.png", 2, 5) == b"234"
+    with backend.open_buffer("blobs/ab/cd/abcd.png") as buffer:
+        assert bytes(buffer) == b"0123456789"
+
+    with pytest.raises(FileNotFoundError):
+        with backend.open_buffer("blobs/00/00/missing.png"):
+            pass
+    assert backend.delete("blobs/ab/cd/abcd.png") is True
+    assert backend.delete("blobs/ab/cd/abcd.png") is False
+    assert not backend.exists("blobs/ab/cd/abcd.png")
+
+
+def test_local_backend():
+    """Тест локального бэкенда."""
+    with tempfile.TemporaryDirectory() as root, patch('pathlib.Path.mkdir', _real_mkdir):
+        backend = LocalBackend(Path(root))
+        _exercise(backend)
+
+        with pytest.raises(ValueError):
+            backend.exists("../outside.png")
+
+
+class FakeS3Client:
+    """Хранилище объектов в памяти с подмножеством API клиента S3 (замена MinIO в тестах)."""
+
+    def __init__(self):
+        self.objects = {}
+
+    @staticmethod
+    def _missing(operation: str):
+        from botocore.exceptions import ClientError
+        return ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, operation)
+
+    def upload_fileobj(self, stream, bucket, key, Config=None):
+        self.objects[(bucket, key)] = stream.read()
+
+    def upload_file(self, file_path, bucket, key, Config=None):
+        with open(file_path, "rb") as f:
+            self.upload_fileobj(f, bucket, key)
+
+    def get_object(self, Bucket, Key, Range=None):
+        if (Bucket, Key) not in self.objects:
+            raise self._missing("GetObject")
+        data = self.objects[(Bucket, Key)]
+        if Range:
+            start, end = Range.removeprefix("bytes=").split("-")
+            data = data[int(start):int(end) + 1]
+        return {"Body": io.BytesIO(data)}
+
+    def download_fileobj(self, bucket, key, fileobj, Config=None):
+        fileobj.write(self.get_object(Bucket=bucket, Key=key)["Body"].read())
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self._missing("HeadObject")
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+def test_s3_backend():
+    """Тест S3-бэкенда на хранилище в памяти: отсутствие объекта превращается в FileNotFoundError."""
+    pytest.importorskip("boto3")
+    client = FakeS3Client()
+
+    _exercise(S3Backend("ocr-uploads", client=client))
+
+    assert set(key for _, key in client.objects) == {"blobs/ef/01/ef01.png"}
@@ -0,0 +1,51 @@
+"""Тесты для переноса файлов старой раскладки в блобы."""
+
+import hashlib
+import os
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.file_storage import FileStorage
+from app.core.storage_migration import StorageMigrator
+
+_real_mkdir = Path.mkdir
+
+
+def test_migrator_moves_rows_and_adopts_files():
+    """Тест: файлы с метаданными и без них переносятся в блобы, старые файлы и каталоги удаляются."""
+    with tempfile.TemporaryDirectory() as upload_dir, \
+         patch('app.core.file_storage.settings') as mock_settings, \
+         patch('pathlib.Path.mkdir', _real_mkdir), \
+         patch('app.core.storage_migration.crud') as mock_crud:
+        mock_settings.UPLOAD_DIR = upload_dir
+        mock_settings.STORAGE_BACKEND = "local"
+        storage = FileStorage()
+        os.makedirs(os.path.join(upload_dir, "1"))
+        for name, data in (("10.png", b"known"), ("11.png", b"orphan"), ("12.png.part", b"partial")):
+            with open(os.path.join(upload_dir, "1", name), "wb") as f:
+                f.write(data)
+
+        known_hash = hashlib.sha256(b"known").hexdigest()
+        mock_crud.get_legacy_images_sync.side_effect = [
+            [(1, 10, "1/10.png", known_hash, 5)], [],
+        ]
+        mock_crud.get_existing_image_ids_sync.return_value = {10}
+        mock_crud.acquire_blob_sync.side_effect = lambda db, content_hash, key, size: key
+        mock_crud.move_image_to_blob_sync.return_value = True
+        mock_crud.create_image_sync.return_value = True
+        db = MagicMock()
+        db.__enter__.return_value = db
+
+        stats = StorageMigrator(storage, MagicMock(return_value=db), batch_size=10).run()
+
+        assert stats == {"moved": 1, "adopted": 1, "skipped": 0, "failed": 0}
+        assert storage.read_file(storage.get_blob_key(known_hash, "10.png")) == b"known"
+        orphan_key = mock_crud.create_image_sync.call_args.kwargs["storage_key"]
+        assert storage.read_file(orphan_key) == b"orphan"
+        assert mock_crud.create_image_sync.call_args.kwargs["user_id"] == 1
+        assert os.listdir(os.path.join(upload_dir, "1")) == ["12.png.part"]
+        assert db.commit.call_count == 2
@@ -0,0 +1,168 @@
+"""Тесты для задач Celery."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from contextlib import contextmanager
+import hashlib
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+with patch('app.core.file_storage.FileStorage._ensure_upload_dir'):
+    from app.tasks import open_image, page_task_failed, process_ocr_task, process_page_task
+
+
+def _image_ref(data: bytes, **overrides) -> dict:
+    """Формирует ссылку на изображение в хранилище."""
+    image_ref = {
+        "user_id": 1,
+        "image_id": 123,
+        "storage_key": "1/123.jpg",
+        "filename": "123.jpg",
+        "size": len(data),
+        "checksum": hashlib.sha256(data).hexdigest(),
+    }
+    image_ref.update(overrides)
+    return image_ref
+
+
+def _mapped(data: bytes):
+    """Имитирует FileStorage.open_buffer, отдающий буфер с содержимым файла."""
+    @contextmanager
+    def open_buffer(storage_key):
+        yield memoryview(data)
+    return open_buffer
+
+
+def test_open_image_verifies_checksum():
+    """Тест чтения изображения по ссылке с проверкой контрольной суммы."""
+    data = b"image bytes"
+
+    with patch('app.tasks.file_storage.open_buffer', side_effect=_mapped(data)) as mock_open_buffer:
+        with open_image(_image_ref(data)) as image_buffer:
+            assert bytes(image_buffer) == data
+
+    mock_open_buffer.assert_called_once_with("1/123.jpg")
+
+
+def test_open_image_checksum_mismatch():
+    """Тест ошибки при несовпадении контрольной суммы."""
+    with patch('app.tasks.file_storage.open_buffer', side_effect=_mapped(b"tampered bytes")):
+        with pytest.raises(ValueError, match="mismatch"):
+            with open_image(_image_ref(b"image bytes", size=None)):
+                pass
+
+
+def test_open_image_follows_migrated_file():
+    """Тест чтения файла, перенесенного миграцией хранилища после постановки задачи."""
+    data = b"image bytes"
+    blob_key = "blobs/ab/cd/abcd.jpg"
+
+    def open_buffer(storage_key):
+        if storage_key != blob_key:
+            raise FileNotFoundError(storage_key)
+        return _mapped(data)(storage_key)
+
+    with patch('app.tasks.file_storage.open_buffer', side_effect=open_buffer), \
+         patch('app.tasks._current_storage_key', return_value=blob_key) as mock_lookup:
+        with open_image(_image_ref(data)) as image_buffer:
+            assert bytes(image_buffer) == data
+
+    mock_lookup.assert_called_once_with(123)
+
+
+def test_last_page_task_finishes_document():
+    """Тест сборки текста документа задачей, обработавшей последнюю страницу."""
+    data = b"%PDF document"
+    pages = [
+        MagicMock(page_no=0, text="first", status="completed"),
+        MagicMock(page_no=1, text="second", status="completed"),
+    ]
+
+    with patch('app.tasks.get_sync_db') as mock_get_db, \
+         patch('app.tasks.file_storage.open_buffer', side_effect=_mapped(data)), \
+         patch('app.tasks.OCRProcessor.process_image', return_value="second") as mock_process, \
+         patch('app.tasks.crud') as mock_crud, \
+         patch('app.tasks._save_to_cache') as mock_save_to_cache:
+        mock_crud.increment_pages_done_sync.return_value = (2, 2)
+        mock_crud.get_image_pages_sync.return_value = pages
+
+        result = process_page_task.run(_image_ref(data, filename="123.pdf"), 1)
+
+    assert result["status"] == "completed"
+    assert mock_process.call_args.kwargs["page_no"] == 1
+    mock_crud.save_page_sync.assert_called_once_with(mock_get_db.return_value, 123, 1, "second", "completed", None)
+    update = mock_crud.update_image_text_sync.call_args.args[2]
+    assert update.text == "first\n\nsecond"
+    assert update.status == "completed"
+    mock_save_to_cache.assert_called_once()
+
+
+def test_stale_page_task_is_skipped():
+    """Тест отбрасывания результата страницы запуска, который уже заменен новым."""
+    data = b"%PDF document"
+
+    with patch('app.tasks.get_sync_db') as mock_get_db, \
+         patch('app.tasks.file_storage.open_buffer', side_effect=_mapped(data)), \
+         patch('app.tasks.OCRProcessor.process_image', return_value="stale"), \
+         patch('app.tasks.crud') as mock_crud:
+        mock_crud.increment_pages_done_sync.return_value = None
+
+        result = process_page_task.run(_image_ref(data, filename="123.pdf"), 0, "old-run")
+
+    assert result["status"] == "skipped"
+    mock_crud.increment_pages_done_sync.assert_called_once_with(mock_get_db.return_value, 123, "old-run")
+    mock_crud.save_page_sync.assert_not_called()
+    mock_get_db.return_value.commit.assert_not_called()
+
+
+def test_failed_page_task_finishes_document():
+    """Тест учета страницы, задача которой убита по time_limit, и завершения документа."""
+    pages = [
+        MagicMock(page_no=0, text="first", status="completed"),
+        MagicMock(page_no=1, text=None, status="failed"),
+    ]
+
+    with patch('app.tasks.get_sync_db') as mock_get_db, \
+         patch('app.tasks.crud') as mock_crud:
+        mock_crud.increment_pages_done_sync.return_value = (2, 2)
+        mock_crud.save_failed_page_sync.return_value = True
+        mock_crud.get_image_pages_sync.return_value = pages
+
+        page_task_failed.run(_image_ref(b"", filename="123.pdf", checksum=None), 1, "run-1")
+
+    mock_crud.save_failed_page_sync.assert_called_once_with(mock_get_db.return_value, 123, 1, "Page task failed")
+    update = mock_crud.update_image_text_sync.call_args.args[2]
+    assert update.status == "completed"
+    assert update.error_message == "Failed pages: 2"
+
+
+def test_failed_page_task_ignores_saved_page():
+    """Тест errback после сохранения результата страницы: страница не учитывается дважды."""
+    with patch('app.tasks.get_sync_db') as mock_get_db, \
+         patch('app.tasks.crud') as mock_crud:
+        mock_crud.increment_pages_done_sync.return_value = (2, 2)
+        mock_crud.save_failed_page_sync.return_value = False
+
+        page_task_failed.run(_image_ref(b"", filename="123.pdf"), 1, "run-1")
+
+    mock_get_db.return_value.rollback.assert_called_once()
+    mock_get_db.return_value.commit.assert_not_called()
+    mock_crud.update_image_text_sync.assert_not_called()
+
+
+def test_legacy_task_message_reads_file_from_storage():
+    """Тест задачи старого формата с содержимым изображения в аргументах."""
+    data = b"image bytes"
+
+    with patch('app.tasks.get_sync_db'), \
+         patch('app.tasks.file_storage.open_buffer', side_effect=_mapped(data)) as mock_open_buffer, \
+         patch('app.tasks.OCRProcessor.process_image', return_value="text") as mock_process, \
+         patch('app.tasks.crud') as mock_crud:
+        result = process_ocr_task.run(123, b"inline bytes", "123.jpg", 1)
+
+    assert result["status"] == "completed"
+    mock_open_buffer.assert_called_once_with("1/123.jpg")
+    assert bytes(mock_process.call_args.args[0]) == data
+    assert mock_crud.update_image_text_sync.call_args.args[2].text == "text"
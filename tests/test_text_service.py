@@ -0,0 +1,171 @@
+"""Тесты для сервиса получения текста."""
+
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from unittest.mock import AsyncMock, Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.status_events import StatusEventBroker
+from app.services.text_service import TextService
+
+
+def _image_text(status: str, text: str = None) -> Mock:
+    """Создает мок записи ImageText."""
+    return Mock(image_id=5, user_id=1, status=status, text=text, error_message=None,
+                page_count=None, pages_done=0, created_at=None, updated_at=datetime(2026, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_get_text_waits_for_notification():
+    """Тест long-poll: запрос ждет уведомления и перечитывает запись один раз."""
+    mock_db = AsyncMock()
+    broker = StatusEventBroker(queue_size=10)
+
+    with patch('app.services.text_service.status_broker', broker), \
+         patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = [_image_text("processing"), _image_text("completed", "done")]
+
+        request = asyncio.create_task(TextService().get_text(5, 1, mock_db, wait=5))
+        await asyncio.sleep(0.01)
+        assert broker.stats()["waiters"] == 1
+        assert mock_get.await_count == 1
+
+        broker.publish({"image_id": 5, "user_id": 1, "status": "completed"})
+        result = await request
+
+    assert result["status"] == "completed"
+    assert result["text"] == "done"
+    assert mock_get.await_count == 2
+    assert broker.stats()["waiters"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_text_wait_timeout():
+    """Тест long-poll: по истечении таймаута возвращается текущее состояние."""
+    broker = StatusEventBroker(queue_size=10)
+
+    with patch('app.services.text_service.status_broker', broker), \
+         patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = _image_text("pending")
+
+        result = await TextService().get_text(5, 1, AsyncMock(), wait=0.05)
+
+    assert result["status"] == "pending"
+    mock_get.assert_awaited_once()
+    assert broker.stats()["waiters"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_text_wait_is_capped():
+    """Тест long-poll: wait больше GET_TEXT_MAX_WAIT ограничивается, а не отклоняется."""
+    broker = StatusEventBroker(queue_size=10)
+
+    with patch('app.services.text_service.status_broker', broker), \
+         patch('app.services.text_service.settings') as mock_settings, \
+         patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get:
+        mock_settings.GET_TEXT_MAX_WAIT = 0.05
+        mock_get.return_value = _image_text("pending")
+
+        result = await asyncio.wait_for(TextService().get_text(5, 1, AsyncMock(), wait=3600), timeout=1)
+
+    assert result["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_get_text_not_modified():
+    """Тест conditional GET: при совпадении ETag возвращается 304 без загрузки текста."""
+    record = _image_text("completed")
+    etag = TextService.make_etag(record)
+
+    with patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get, \
+         patch('app.services.text_service.crud.get_image_text_content', new_callable=AsyncMock) as mock_content:
+        mock_get.return_value = record
+
+        result = await TextService().get_text(5, 1, AsyncMock(), if_none_match=f'"other", W/{etag}')
+
+    assert result.status_code == 304
+    assert result.headers["etag"] == etag
+    assert "max-age" in result.headers["cache-control"]
+    mock_get.assert_awaited_once_with(mock_get.await_args.args[0], 5, with_text=False)
+    mock_content.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_text_etag_changes_with_status():
+    """Тест conditional GET: устаревший ETag приводит к полному ответу с новым ETag."""
+    stale = TextService.make_etag(_image_text("processing"))
+    response = Mock(headers={})
+
+    with patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get, \
+         patch('app.services.text_service.crud.get_image_text_content', new_callable=AsyncMock) as mock_content:
+        mock_get.return_value = _image_text("completed")
+        mock_content.return_value = "done"
+
+        result = await TextService().get_text(5, 1, AsyncMock(), if_none_match=stale, response=response)
+
+    assert result["text"] == "done"
+    assert response.headers["ETag"] != stale
+    mock_content.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_text_slice():
+    """Тест фрагмента текста: вырезается в БД, has_more определяется по лишнему символу."""
+    with patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get, \
+         patch('app.services.text_service.crud.get_image_text_slice', new_callable=AsyncMock) as mock_slice:
+        mock_get.return_value = _image_text("completed")
+        mock_slice.return_value = "abcde"
+
+        result = await TextService().get_text(5, 1, AsyncMock(), offset=10, limit=4)
+
+    mock_slice.assert_awaited_once_with(mock_slice.await_args.args[0], 5, 10, 5)
+    assert result["text"] == "abcd"
+    assert result["has_more"] is True
+    assert result["offset"] == 10
+
+
+@pytest.mark.asyncio
+async def test_get_text_page_range_requires_multipage():
+    """Тест диапазона страниц: для одностраничного изображения возвращается 400."""
+    with patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = _image_text("completed")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await TextService().get_text(5, 1, AsyncMock(), page_from=1, page_to=2)
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_text_page_range_reversed():
+    """Тест диапазона страниц: page_from больше page_to отклоняется с 400."""
+    with patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get:
+        with pytest.raises(HTTPException) as exc_info:
+            await TextService().get_text(5, 1, AsyncMock(), page_from=3, page_to=2)
+
+    assert exc_info.value.status_code == 400
+    mock_get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stream_text_chunks():
+    """Тест потоковой выдачи: текст читается фрагментами до короткого остатка, сессия закрывается."""
+    mock_db = AsyncMock()
+
+    with patch('app.services.text_service.crud.get_image_text', new_callable=AsyncMock) as mock_get, \
+         patch('app.services.text_service.crud.get_image_text_slice', new_callable=AsyncMock) as mock_slice, \
+         patch('app.services.text_service.settings.OCR_TEXT_STREAM_CHUNK', 3):
+        mock_get.return_value = _image_text("completed")
+        mock_slice.side_effect = ["abc", "def", "g"]
+
+        chunks = await TextService().stream_text(5, 1, mock_db)
+        result = [chunk async for chunk in chunks]
+
+    assert result == ["abc", "def", "g"]
+    assert [call.args[2] for call in mock_slice.await_args_list] == [0, 3, 6]
+    mock_db.close.assert_awaited_once()
@@ -0,0 +1,97 @@
+"""Тесты для распознавания больших изображений полосами."""
+
+import io
+import threading
+from unittest.mock import patch
+import numpy as np
+from PIL import Image, ImageDraw
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.tiling import split_strips, merge_texts, recognize_tiled, should_tile
+
+
+def test_split_strips_overlap_and_cover_image():
+    """Тест покрытия всей высоты перекрывающимися полосами."""
+    image = Image.new("L", (100, 1000), color=255)
+
+    strips = split_strips(image, strip_height=300, overlap=50)
+
+    assert strips[0][0] == 0
+    assert strips[-1][1] == 1000
+    for (_, prev_bottom), (next_top, _) in zip(strips, strips[1:]):
+        assert next_top < prev_bottom
+
+
+def test_split_strips_cuts_between_text_lines():
+    """Тест сдвига границы полосы на пустую строку пикселей."""
+    image = Image.new("L", (100, 1000), color=255)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 260, 99, 299], fill=0)
+
+    strips = split_strips(image, strip_height=300, overlap=50)
+
+    assert not 260 <= strips[1][0] + 50 < 300
+
+
+def test_merge_texts_removes_overlap_duplicates():
+    """Тест удаления строк, распознанных в двух соседних полосах."""
+    texts = ["line one\nline two\nline three", "line tree\n\nline four", "line four\nline five"]
+
+    assert merge_texts(texts) == "line one\nline two\nline three\nline four\nline five"
+
+
+def test_recognize_tiled_keeps_reading_order():
+    """Тест параллельного распознавания полос с сохранением порядка чтения."""
+    class FakeEngine:
+        pool_size = 4
+        threads = set()
+
+        def recognize(self, image, lang, config=""):
+            self.threads.add(threading.get_ident())
+            top = image.getpixel((0, 0))
+            return f"strip {top}"
+
+    image = Image.new("L", (10, 600))
+    for y in range(600):
+        image.putpixel((0, y), y // 100 * 10)
+
+    with patch('app.core.tiling.settings') as mock_settings:
+        mock_settings.OCR_TILE_HEIGHT = 100
+        mock_settings.OCR_TILE_OVERLAP = 0
+        mock_settings.OCR_TILE_WORKERS = 3
+        mock_settings.OCR_TILE_THRESHOLD_PIXELS = 1000
+
+        assert should_tile(image)
+        text = recognize_tiled(image, FakeEngine(), lang="eng")
+
+    assert text.splitlines() == [f"strip {n * 10}" for n in range(6)]
+
+
+def test_recognize_tiled_lazily_opened_rgb_image():
+    """Тест распознавания полосами RGB-изображения, открытого лениво из файла."""
+    class FakeEngine:
+        pool_size = 8
+
+        def recognize(self, image, lang, config=""):
+            return f"strip {np.asarray(image).mean():.3f}"
+
+    pixels = np.random.default_rng(0).integers(0, 255, (2000, 2000, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG")
+
+    with patch('app.core.tiling.settings') as mock_settings:
+        mock_settings.OCR_TILE_HEIGHT = 250
+        mock_settings.OCR_TILE_OVERLAP = 0
+        mock_settings.OCR_TILE_WORKERS = 8
+
+        with Image.open(io.BytesIO(buffer.getvalue())) as image:
+            text = recognize_tiled(image, FakeEngine(), lang="eng")
+        with Image.open(io.BytesIO(buffer.getvalue())) as image:
+            image.load()
+            strips = [image.crop((0, top, 2000, top + 250)) for top in range(0, 2000, 250)]
+            expected = [FakeEngine().recognize(strip, "eng") for strip in strips]
+
+    assert text.splitlines() == expected
@@ -0,0 +1,39 @@
+"""Тесты для LRU-кэша с TTL."""
+
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ttl_cache import TTLCache
+
+
+def test_lru_eviction_and_ttl_expiry():
+    """Тест вытеснения самой старой записи и истечения TTL."""
+    cache = TTLCache(max_size=2, ttl=10)
+
+    with patch('app.core.ttl_cache.time.monotonic', return_value=100.0) as mock_time:
+        cache._put(1, "a")
+        cache._put(2, "b")
+        assert cache._get(1) == "a"
+        cache._put(3, "c")
+
+        assert cache._get(2) is None
+        assert cache._get(1) == "a"
+
+        mock_time.return_value = 111.0
+        assert cache._get(3) is None
+        assert cache.stats()["entries"] == 1
+
+
+def test_on_notify_invalidates_by_int_key():
+    """Тест инвалидации по уведомлению: payload приводится к int, мусор игнорируется."""
+    cache = TTLCache(max_size=10, ttl=60)
+    cache._put(7, "meta")
+
+    cache.on_notify("garbage")
+    assert cache._get(7) == "meta"
+
+    cache.on_notify("7")
+    assert cache._get(7) is None
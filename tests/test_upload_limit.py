@@ -0,0 +1,75 @@
+"""Тесты для ограничения размера загрузки до разбора тела запроса."""
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.upload_limit import UploadSizeLimitMiddleware, MULTIPART_OVERHEAD
+
+
+def _client(calls: list) -> TestClient:
+    """Приложение с эндпоинтом загрузки за middleware с лимитом 1000 байт."""
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, path="/upload", max_size=1000)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        return {"size": len(await file.read())}
+
+    return TestClient(app)
+
+
+def test_small_upload_passes():
+    """Тест: загрузка в пределах лимита доходит до эндпоинта."""
+    calls = []
+
+    response = _client(calls).post("/upload", files={"file": ("scan.png", b"x" * 1000)})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 1000}
+    assert calls == ["scan.png"]
+
+
+def test_oversized_upload_rejected_by_content_length():
+    """Тест: по Content-Length ответ 413 отправляется до чтения тела."""
+    calls = []
+
+    response = _client(calls).post("/upload", files={"file": ("scan.png", b"x" * (MULTIPART_OVERHEAD + 2000))})
+
+    assert response.status_code == 413
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_stops_at_limit():
+    """Тест: тело без Content-Length перестает читаться, как только превышен лимит."""
+    calls = []
+    app = _client(calls).app
+    chunks = []
+    messages = []
+
+    async def receive():
+        chunks.append(1)
+        body = b"x" * 16384
+        if len(chunks) == 1:
+            body = b'--b\r\nContent-Disposition: form-data; name="file"; filename="scan.png"\r\n\r\n' + body
+        return {"type": "http.request", "body": body, "more_body": len(chunks) < 100}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/upload", "raw_path": b"/upload", "root_path": "",
+        "query_string": b"", "headers": [(b"content-type", b"multipart/form-data; boundary=b")],
+        "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("test", 1),
+    }
+    await app(scope, receive, send)
+
+    assert messages[0]["status"] == 413
+    assert calls == []
+    assert len(chunks) < 100